@@ -0,0 +1,191 @@
+# Książka otwarć.
+#
+# Książka to plik binarny z nagłówkiem MAGIC
+# i posortowanymi rekordami (hasz pozycji, ruch,
+# waga). Plik jest odczytywany przez mmap, a
+# pozycje są wyszukiwane binarnie, więc ruch
+# z książki kosztuje kilka odczytów, a wiele
+# procesów korzysta z tej samej kopii pliku
+# w pamięci.
+#
+# Książkę buduje się z partii, które boty
+# rozgrywają same ze sobą (funkcja build_book,
+# skrypt halma-book.py).
+#
+# Autor: Antoni Przybylik
+
+from halma.engine import Engine
+
+from bots.control import SearchControl
+
+import mmap
+import random
+import struct
+
+# Nagłówek pliku książki.
+MAGIC = b'HALMABK1'
+
+# Rekord: hasz pozycji, ruch, waga.
+RECORD = struct.Struct('<QHH')
+
+# Największa waga ruchu.
+MAX_WEIGHT = 0xffff
+
+
+def write_book(filename, entries):
+    """! Zapisuje książkę do pliku.
+
+    @param filename Nazwa pliku.
+    @param entries Słownik {(hasz pozycji, ruch): waga}.
+    """
+
+    with open(filename, 'wb') as fp:
+        fp.write(MAGIC)
+        for (key, move), weight in sorted(entries.items()):
+            fp.write(RECORD.pack(key, move, min(weight, MAX_WEIGHT)))
+
+
+def build_book(bot_factory, games, plies, noise=0.2, width=4,
+               time_limit=None, node_limit=None, seed=None, entries=None):
+    """! Buduje książkę z partii rozegranych przez bota z samym sobą.
+
+    Każda partia zaczyna się od ustawienia
+    klasycznego. W każdej pozycji bot szuka
+    najlepszego ruchu, a ruch ten jest zapisywany
+    w książce (waga to liczba partii, w których
+    bot go wybrał). Żeby partie się różniły, z
+    prawdopodobieństwem noise wykonywany jest
+    losowy ruch spośród width najlepszych.
+
+    @param bot_factory Funkcja (gracz, silnik) tworząca bota
+                       klasy SearchBot.
+    @param games Liczba partii.
+    @param plies Liczba półruchów z każdej partii.
+    @param noise Prawdopodobieństwo wykonania innego ruchu.
+    @param width Spośród ilu najlepszych ruchów losować.
+    @param time_limit Czas na ruch w sekundach (lub None).
+    @param node_limit Limit węzłów na ruch (lub None).
+    @param seed Ziarno generatora liczb losowych.
+    @param entries Słownik, do którego dopisać ruchy
+                   (None - nowy słownik).
+
+    @return Słownik {(hasz pozycji, ruch): waga}.
+    """
+
+    if (time_limit is None and node_limit is None):
+        raise ValueError('No search limit.')
+
+    if (entries is None):
+        entries = {}
+
+    rng = random.Random(seed)
+
+    for _ in range(games):
+        engine = Engine()
+        engine.setup('classic')
+
+        for _ in range(plies):
+            bot = bot_factory(engine.moving_player, engine)
+            control = SearchControl(time_limit, node_limit)
+            move, _ = bot._iterative_search(engine, control=control)
+            if (move is None):
+                break
+
+            key = (engine.get_hash(), move)
+            entries[key] = entries.get(key, 0) + 1
+
+            # Po przeszukiwaniu ruchy z korzenia
+            # są posortowane od najlepszego.
+            if (rng.random() < noise):
+                move = rng.choice(bot._root_moves[:width])
+
+            engine.make_move(move)
+
+    return entries
+
+
+class OpeningBook:
+    """! Książka otwarć odczytywana z pliku przez mmap. """
+
+    def __init__(self, filename):
+        """! Konstruktor klasy OpeningBook.
+
+        @param filename Nazwa pliku książki.
+        """
+
+        with open(filename, 'rb') as fp:
+            self._map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        size = len(self._map) - len(MAGIC)
+        if (self._map[:len(MAGIC)] != MAGIC or size % RECORD.size):
+            self._map.close()
+            raise ValueError('Corrupted data.')
+
+        self._count = size // RECORD.size
+
+    def __len__(self):
+        """! Liczba rekordów w książce. """
+        return self._count
+
+    def close(self):
+        """! Zamyka plik książki. """
+        self._map.close()
+
+    def _record(self, i):
+        """! Odczytuje rekord.
+
+        @param i Numer rekordu.
+
+        @return Krotka (hasz pozycji, ruch, waga).
+        """
+        return RECORD.unpack_from(self._map, len(MAGIC) + i * RECORD.size)
+
+    def records(self):
+        """! Przechodzi po wszystkich rekordach książki.
+
+        @return Generator krotek (hasz pozycji, ruch, waga).
+        """
+        for i in range(self._count):
+            yield self._record(i)
+
+    def moves(self, key):
+        """! Szuka ruchów dla pozycji.
+
+        @param key Hasz pozycji.
+
+        @return Lista krotek (ruch, waga).
+        """
+
+        # Szukamy pierwszego rekordu
+        # z haszem nie mniejszym niż key.
+        low = 0
+        high = self._count
+        while (low < high):
+            middle = (low + high) // 2
+            if (self._record(middle)[0] < key):
+                low = middle + 1
+            else:
+                high = middle
+
+        result = []
+        while (low < self._count):
+            record_key, move, weight = self._record(low)
+            if (record_key != key):
+                break
+            result.append((move, weight))
+            low += 1
+
+        return result
+
+    def best_move(self, key):
+        """! Zwraca ruch z największą wagą.
+
+        @param key Hasz pozycji.
+
+        @return Ruch lub None, jeśli pozycji nie ma w książce.
+        """
+
+        moves = self.moves(key)
+        if (not moves):
+            return None
+        return max(moves, key=lambda m: m[1])[0]
@@ -0,0 +1,89 @@
+# Kontrola przeszukiwania drzewa gry.
+#
+# Obiekt klasy SearchControl jest przekazywany
+# do przeszukiwania i co pewną liczbę węzłów
+# jest pytany, czy należy przerwać. Przeszukiwanie
+# może zostać przerwane z powodu upływu czasu,
+# wyczerpania limitu węzłów albo na żądanie
+# (np. z innego wątku).
+#
+# Autor: Antoni Przybylik
+
+import threading
+import time
+
+
+class SearchAborted(Exception):
+    """! Wyjątek rzucany gdy przeszukiwanie zostało przerwane. """
+
+    def __init__(self):
+        super().__init__('Search aborted.')
+
+
+class SearchControl:
+    """! Limity przeszukiwania: czas, liczba węzłów, przerwanie. """
+
+    def __init__(self, time_limit=None, node_limit=None, check_every=1024):
+        """! Konstruktor klasy SearchControl.
+
+        Odliczanie czasu zaczyna się w chwili
+        utworzenia obiektu.
+
+        @param time_limit Czas na przeszukiwanie w sekundach
+                          (None - bez limitu).
+        @param node_limit Maksymalna liczba węzłów
+                          (None - bez limitu).
+        @param check_every Co ile węzłów sprawdzać limity.
+        """
+
+        if (check_every <= 0):
+            raise ValueError('Invalid check interval.')
+
+        if (time_limit is None):
+            self.deadline = None
+        else:
+            self.deadline = time.monotonic() + time_limit
+
+        self.node_limit = node_limit
+        self.check_every = check_every
+
+        # Najlepsza ocena w korzeniu znana spoza
+        # przeszukiwania (np. z innych procesów,
+        # patrz bots.parallel). Przeszukiwanie
+        # czyta ją przy sprawdzaniu limitów.
+        self.root_alpha = None
+
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """! Przerywa przeszukiwanie.
+
+        Można wywołać z innego wątku.
+        """
+        self._cancelled.set()
+
+    def cancelled(self):
+        """! Sprawdza, czy przeszukiwanie przerwano na żądanie.
+
+        @return Czy wywołano cancel.
+        """
+        return self._cancelled.is_set()
+
+    def should_stop(self, nodes):
+        """! Sprawdza, czy należy przerwać przeszukiwanie.
+
+        @param nodes Liczba odwiedzonych dotąd węzłów.
+
+        @return Czy należy przerwać.
+        """
+
+        if (self._cancelled.is_set()):
+            return True
+
+        if (self.node_limit is not None and nodes >= self.node_limit):
+            return True
+
+        if (self.deadline is not None and time.monotonic() >= self.deadline):
+            return True
+
+        return False
@@ -3,47 +3,49 @@
 #
 # Autor: Antoni Przybylik
 
-from halma.defs import STATE
 from halma.defs import PLAYER
 from halma.defs import CAMP
 
+from halma.geometry import SIZE
+from halma.geometry import index
+from halma.geometry import field
+from halma.geometry import move_to_fields
+
 from bots.generic import GameBot
 
 
-class ForwardBot(GameBot):
-    """! Bot przesuwający kamienie w stronę obozu przeciwnika. """
+def _frontier_dist(points):
+    """! Buduje tablicę odległości pól od brzegu obozu.
 
-    def _dist(self, field1, field2):
-        """! Odległość dwóch pól.
+    @param points Pola na brzegu obozu.
 
-        Odległość jest mierzona jako
-        liczba ruchów które należy
-        wykonać żeby przejść między
-        danymi polami.
+    @return Krotka odległości dla wszystkich pól.
+    """
+    return tuple(min(max(abs(y - py), abs(x - px)) for py, px in points)
+                 for y, x in map(field, range(SIZE * SIZE)))
 
-        @param field1 Pole na planszy.
-        @param field2 Pole na planszy.
-        """
-        return max(abs(field1[0]-field2[0]),
-                   abs(field1[1]-field2[1]))
+
+# Odległości pól od brzegu obozów
+# (patrz ForwardBot._dist_to_camp).
+_FRONTIER_DIST = {
+        CAMP.WHITE: _frontier_dist(((1, 4), (2, 3), (3, 2), (4, 1))),
+        CAMP.BLACK: _frontier_dist(((14, 11), (13, 12), (12, 13), (11, 14))),
+}
+
+
+class ForwardBot(GameBot):
+    """! Bot przesuwający kamienie w stronę obozu przeciwnika. """
 
     def _dist_to_camp(self, field, camp):
         """! Mierzy odległość do obozu.
 
+        Odległości są zapisane w tablicy
+        _FRONTIER_DIST.
+
         @param field Pole na planszy.
         @param camp Obóz do którego mierzymy odległość.
         """
-        if (camp == CAMP.WHITE):
-            return min(self._dist(field, (1, 4)),
-                       self._dist(field, (2, 3)),
-                       self._dist(field, (3, 2)),
-                       self._dist(field, (4, 1)))
-
-        if (camp == CAMP.BLACK):
-            return min(self._dist(field, (14, 11)),
-                       self._dist(field, (13, 12)),
-                       self._dist(field, (12, 13)),
-                       self._dist(field, (11, 14)))
+        return _FRONTIER_DIST[camp][index(*field)]
 
     def _lin_dist_to_corner(self, field, camp):
         """! Mierzy odległość od rogu we wskazanym obozie.
@@ -121,30 +123,19 @@ class ForwardBot(GameBot):
     def make_move(self):
         """! Wykonuje ruch.
 
-        @return Wykonany ruch.
+        @return Wykonany ruch lub None, jeśli
+                gracz nie ma żadnego ruchu.
         """
 
-        board = self._engine.get_board()
         moving_player = self._engine.moving_player
 
-        my_positions = []
-        moves_to_consider = []
-
-        for i in range(0, 16):
-            for j in range(0, 16):
-                field = board[i][j]
-
-                if ((field == STATE.BLACK and
-                     moving_player == PLAYER.BLACK) or
-                    (field == STATE.WHITE and
-                     moving_player == PLAYER.WHITE)):
-                    my_positions.append((i, j))
-
-        for pos_from in my_positions:
-            for pos_to in self._engine.moves(pos_from[0], pos_from[1]):
-                moves_to_consider.append((pos_from, pos_to))
+        # Ruchy zostają zakodowane, na pary pól
+        # zamieniamy je tylko do oceny.
+        moves = self._engine.all_moves(moving_player)
+        if (not moves):
+            return None
 
-        moves_to_consider.sort(reverse=True,
-                               key=lambda m: self._move_quality(*m))
-        self._apply_move(*moves_to_consider[0])
-        return moves_to_consider[0]
+        move = max(moves,
+                   key=lambda m: self._move_quality(*move_to_fields(m)))
+        self._engine.make_move(move)
+        return move_to_fields(move)
@@ -3,12 +3,16 @@
 #
 # Autor: Antoni Przybylik
 
-from halma.defs import STATE
 from halma.defs import PLAYER
-from halma.defs import CAMP
+
+from halma.geometry import index
+from halma.geometry import fields_to_move
+from halma.geometry import CAMP_TABLE
 
 from halma.player import Player
 
+from bots.race import RaceSolver
+
 
 class GameBot(Player):
     """! Bazowa klasa bota. """
@@ -21,6 +25,16 @@ class GameBot(Player):
         """
         super().__init__(plr, engine)
 
+        # Książka otwarć (obiekt klasy
+        # bots.book.OpeningBook) lub None.
+        self.book = None
+
+        # Plan wyścigu po minięciu się armii i
+        # pozycja pionków bota, od której plan
+        # jest aktualny.
+        self._race_plan = []
+        self._race_mine = None
+
     def _apply_move(self, field1, field2):
         """! Wykonuje ruch.
 
@@ -28,19 +42,7 @@ class GameBot(Player):
         @param field2 Pole na które chcemy się ruszyć.
         """
 
-        on_field1 = self._engine.read_field(*field1)
-        self._engine.set_field(*field1, STATE.EMPTY)
-        self._engine.set_field(*field2, on_field1)
-
-        if (self._engine.moving_player == PLAYER.WHITE):
-            # Jeżeli teraz ruszał się biały, to
-            # teraz jest kolej na czarnego.
-            self._engine.moving_player = PLAYER.BLACK
-        else:
-            # Jeżeli w danym ruchu ruszył się czarny,
-            # przechodzimy do następnego ruchu.
-            self._engine.moving_player = PLAYER.WHITE
-            self._engine.move += 1
+        self._engine.make_move(fields_to_move(field1, field2))
 
     def _in_camp(self, y, x):
         """! Sprawdza w jakim obozie znajduje się pole.
@@ -51,17 +53,62 @@ class GameBot(Player):
         @return W jakim obozie znajduje się pole.
         """
 
-        # Sprawdzamy, czy jest w obozie Czarnego.
-        if (x in range(0, 5) and
-                y in range(0, [5, 5, 4, 3, 2][x])):
-            return CAMP.BLACK
+        return CAMP_TABLE[index(y, x)]
+
+    def _book_move(self):
+        """! Szuka ruchu w książce otwarć.
+
+        Ruch z książki jest sprawdzany, bo
+        różne pozycje mogą mieć ten sam hasz.
+
+        @return Zakodowany ruch lub None.
+        """
+
+        if (self.book is None):
+            return None
+
+        move = self.book.best_move(self._engine.get_hash())
+        if (move is None or move not in
+                self._engine.all_moves(self._engine.moving_player)):
+            return None
+
+        return move
+
+    def _race_move(self):
+        """! Wybiera ruch w wyścigu po minięciu się armii.
+
+        Plan z bots.race.RaceSolver jest liczony raz
+        i wykonywany ruch po ruchu, dopóki pozycja
+        pionków bota zgadza się z planem.
+
+        @return Zakodowany ruch lub None, jeśli armie
+                się nie minęły.
+        """
+
+        engine = self._engine
+        if (not engine.is_disengaged()):
+            return None
+
+        plr = engine.moving_player
+        if (plr == PLAYER.WHITE):
+            enemy = PLAYER.BLACK
+        else:
+            enemy = PLAYER.WHITE
+
+        mine = engine.get_bitboard(plr)
+        legal = engine.all_moves(plr)
+
+        if (not self._race_plan or self._race_mine != mine or
+                self._race_plan[0] not in legal):
+            solver = RaceSolver(plr)
+            self._race_plan = solver.solve(mine, engine.get_bitboard(enemy))
 
-        # Sprawdzamy, czy jest w obozie Białego.
-        if (x in range(11, 16) and
-                15-y in range(0, [5, 5, 4, 3, 2][15-x])):
-            return CAMP.WHITE
+        if (not self._race_plan or self._race_plan[0] not in legal):
+            return None
 
-        return None
+        move = self._race_plan.pop(0)
+        self._race_mine = mine ^ (1 << (move >> 8)) ^ (1 << (move & 255))
+        return move
 
     def make_move(self):
         """! Wykonuje ruch.
@@ -0,0 +1,534 @@
+# Bot przeszukujący drzewo gry metodą
+# Monte Carlo (UCT).
+#
+# Zamiast sprawdzać wszystkie ruchy do
+# ustalonej głębokości, bot rozgrywa wiele
+# szybkich partii próbnych (rozgrywek) i
+# rozwija drzewo tam, gdzie wyniki są
+# najlepsze. Rozgrywki działają bezpośrednio
+# na bitboardach, a ruchy wybiera w nich
+# zachłanna strategia podobna do ForwardBot.
+# Drzewo jest zachowywane między kolejnymi
+# ruchami bota, dopóki nie jest za duże
+# (patrz MAX_TREE_VISITS).
+#
+# Autor: Antoni Przybylik
+
+from halma.defs import PLAYER
+
+from halma.geometry import BIT
+from halma.geometry import SIZE
+from halma.geometry import field
+from halma.geometry import iter_bits
+from halma.geometry import decode_move
+from halma.geometry import move_to_fields
+from halma.geometry import BLACK_CAMP_MASK
+from halma.geometry import WHITE_CAMP_MASK
+
+from halma.movegen import side_moves
+
+from bots.generic import GameBot
+from bots.control import SearchControl
+
+import math
+import random
+import time
+
+# Największa liczba rozgrywek w zachowanym
+# drzewie, gdy bot nie ma limitu rozgrywek.
+# Każda rozgrywka dodaje najwyżej jeden węzeł,
+# więc liczba rozgrywek ogranicza też
+# liczbę węzłów (i zajętą pamięć).
+MAX_TREE_VISITS = 200000
+
+# Zachowane drzewo może mieć najwyżej tyle
+# razy więcej rozgrywek niż limit na ruch.
+TREE_REUSE_FACTOR = 4
+
+
+def _field_values(camp_mask):
+    """! Buduje tablicę wartości pól dla gracza idącego do obozu.
+
+    Wartość pola jest tym większa, im bliżej
+    obozu i rogu planszy w tym obozie leży
+    pole (tak jak w ocenie ruchu ForwardBot).
+
+    @param camp_mask Bitboard obozu docelowego.
+
+    @return Krotka wartości dla wszystkich pól.
+    """
+
+    camp = [field(i) for i in iter_bits(camp_mask)]
+
+    # Róg planszy w obozie docelowym.
+    if (camp_mask == BLACK_CAMP_MASK):
+        corner = (0, 0)
+    else:
+        corner = (SIZE - 1, SIZE - 1)
+
+    result = []
+    for i in range(SIZE * SIZE):
+        y, x = field(i)
+        dist = min(max(abs(y - cy), abs(x - cx)) for cy, cx in camp)
+        result.append(-(dist * 10 +
+                        (abs(y - corner[0]) + abs(x - corner[1])) * 5 +
+                        abs(x - corner[1])))
+
+    return tuple(result)
+
+
+# Wartości pól dla białego (idzie do
+# obozu czarnego) i dla czarnego.
+_WHITE_VALUES = _field_values(BLACK_CAMP_MASK)
+_BLACK_VALUES = _field_values(WHITE_CAMP_MASK)
+
+
+def _winner(white, black):
+    """! Sprawdza, czy partia się skończyła.
+
+    Warunek jest taki sam jak w GameInterface.get_winner.
+
+    @param white Bitboard białych pionków.
+    @param black Bitboard czarnych pionków.
+
+    @return Zwycięzca lub None.
+    """
+
+    occupied = white | black
+    if ((occupied & BLACK_CAMP_MASK) == BLACK_CAMP_MASK and
+            white & BLACK_CAMP_MASK):
+        return PLAYER.WHITE
+    if ((occupied & WHITE_CAMP_MASK) == WHITE_CAMP_MASK and
+            black & WHITE_CAMP_MASK):
+        return PLAYER.BLACK
+    return None
+
+
+class _Node:
+    """! Węzeł drzewa przeszukiwania. """
+
+    __slots__ = ('move', 'parent', 'children', 'untried',
+                 'visits', 'wins', 'plr')
+
+    def __init__(self, move, parent, plr):
+        """! Konstruktor klasy _Node.
+
+        @param move Ruch prowadzący do węzła (None w korzeniu).
+        @param parent Węzeł nadrzędny.
+        @param plr Gracz, który ma ruch w węźle.
+        """
+
+        self.move = move
+        self.parent = parent
+        self.plr = plr
+
+        self.children = []
+
+        # Ruchy jeszcze nierozwinięte (None - nie
+        # wygenerowano jeszcze ruchów węzła).
+        self.untried = None
+
+        # Liczba rozgrywek i suma wyników z punktu
+        # widzenia gracza, który wykonał ruch move.
+        self.visits = 0
+        self.wins = 0.0
+
+
+class MctsBot(GameBot):
+    """! Bot przeszukujący drzewo gry metodą Monte Carlo. """
+
+    def __init__(self, plr, engine, playouts=2000, time_limit=5,
+                 rollout_depth=16, exploration=1.4, epsilon=0.1,
+                 seed=None, parallel=None):
+        """! Konstruktor klasy MctsBot.
+
+        @param plr Gracz (biały/czarny).
+        @param engine Referencja na obiekt Engine.
+        @param playouts Maksymalna liczba rozgrywek na ruch
+                        (None - bez limitu).
+        @param time_limit Czas na ruch w sekundach
+                          (None - bez limitu).
+        @param rollout_depth Liczba półruchów jednej rozgrywki.
+        @param exploration Stała eksploracji we wzorze UCT.
+        @param epsilon Prawdopodobieństwo losowego ruchu
+                       w rozgrywce.
+        @param seed Ziarno generatora liczb losowych.
+        @param parallel Obiekt klasy bots.parallel_mcts.ParallelMcts
+                        (None - przeszukiwanie w jednym procesie).
+        """
+        super().__init__(plr, engine)
+
+        if (playouts is None and time_limit is None):
+            raise ValueError('No search limit.')
+
+        self.playouts_limit = playouts
+        self.time_limit = time_limit
+        self.rollout_depth = rollout_depth
+        self.exploration = exploration
+        self.epsilon = epsilon
+
+        self._random = random.Random(seed)
+        self._parallel = parallel
+
+        # Drzewo z poprzedniego ruchu i
+        # pozycja w jego korzeniu.
+        self._root = None
+        self._root_position = None
+
+        # Większe drzewo nie jest zachowywane.
+        if (playouts is None):
+            self.max_tree_visits = MAX_TREE_VISITS
+        else:
+            self.max_tree_visits = min(MAX_TREE_VISITS,
+                                       TREE_REUSE_FACTOR * playouts)
+
+        # Statystyki ostatniego przeszukiwania.
+        self.playouts = 0
+        self.elapsed = 0.0
+        self.reused_visits = 0
+
+    def _move_quality(self, move, plr):
+        """! Ocenia ruch w rozgrywce.
+
+        Działa jak ForwardBot._move_quality, ale
+        korzysta z tablic wartości pól.
+
+        @param move Zakodowany ruch.
+        @param plr Gracz, który wykonuje ruch.
+
+        @return Ocena ruchu.
+        """
+
+        src, dst = decode_move(move)
+
+        if (plr == PLAYER.WHITE):
+            values = _WHITE_VALUES
+            camp = BLACK_CAMP_MASK
+        else:
+            values = _BLACK_VALUES
+            camp = WHITE_CAMP_MASK
+
+        quality = values[dst] - values[src]
+
+        # Pionków w obozie przeciwnika nie
+        # ruszamy, a wejście do obozu jest
+        # lepsze od pozostałych ruchów.
+        if (camp & BIT[src]):
+            quality -= 1000
+        elif (camp & BIT[dst]):
+            quality += 1000
+
+        return quality
+
+    def _rollout_move(self, plr, white, black):
+        """! Wybiera ruch w rozgrywce.
+
+        @param plr Gracz, który ma ruch.
+        @param white Bitboard białych pionków.
+        @param black Bitboard czarnych pionków.
+
+        @return Zakodowany ruch lub None, jeśli nie ma ruchów.
+        """
+
+        if (plr == PLAYER.WHITE):
+            moves = side_moves(white, white | black)
+        else:
+            moves = side_moves(black, white | black)
+
+        if (not moves):
+            return None
+
+        if (self._random.random() < self.epsilon):
+            return self._random.choice(moves)
+
+        return max(moves,
+                   key=lambda m: self._move_quality(m, plr))
+
+    def _score(self, white, black):
+        """! Ocenia pozycję na końcu rozgrywki bez zwycięzcy.
+
+        @param white Bitboard białych pionków.
+        @param black Bitboard czarnych pionków.
+
+        @return Wynik białego z przedziału (0, 1).
+        """
+
+        diff = (sum(_WHITE_VALUES[i] for i in iter_bits(white)) -
+                sum(_BLACK_VALUES[i] for i in iter_bits(black)))
+
+        return 1 / (1 + math.exp(-diff / 200))
+
+    def _rollout(self, plr, white, black):
+        """! Rozgrywa partię próbną.
+
+        @param plr Gracz, który ma ruch.
+        @param white Bitboard białych pionków.
+        @param black Bitboard czarnych pionków.
+
+        @return Wynik białego z przedziału [0, 1].
+        """
+
+        for _ in range(self.rollout_depth):
+            winner = _winner(white, black)
+            if (winner is not None):
+                return 1.0 if winner == PLAYER.WHITE else 0.0
+
+            move = self._rollout_move(plr, white, black)
+            if (move is not None):
+                swap = BIT[move >> 8] | BIT[move & 255]
+                if (plr == PLAYER.WHITE):
+                    white ^= swap
+                else:
+                    black ^= swap
+
+            plr = PLAYER.BLACK if plr == PLAYER.WHITE else PLAYER.WHITE
+
+        winner = _winner(white, black)
+        if (winner is not None):
+            return 1.0 if winner == PLAYER.WHITE else 0.0
+        return self._score(white, black)
+
+    def _select(self, node):
+        """! Wybiera dziecko węzła według wzoru UCT.
+
+        @param node Węzeł z dziećmi.
+
+        @return Wybrane dziecko.
+        """
+
+        log_visits = math.log(node.visits)
+        c = self.exploration
+
+        return max(node.children,
+                   key=lambda n: (n.wins / n.visits +
+                                  c * math.sqrt(log_visits / n.visits)))
+
+    def _playout(self, root, position):
+        """! Wykonuje jedną iterację MCTS.
+
+        Schodzi w dół drzewa, rozwija jeden
+        węzeł, rozgrywa z niego partię próbną
+        i uaktualnia statystyki na ścieżce.
+
+        @param root Korzeń drzewa.
+        @param position Pozycja w korzeniu.
+
+        @return Wynik rozgrywki z punktu widzenia białego.
+        """
+
+        node = root
+        white, black = position.white, position.black
+
+        # Selekcja.
+        while (node.untried is not None and not node.untried and
+               node.children):
+            node = self._select(node)
+            swap = BIT[node.move >> 8] | BIT[node.move & 255]
+            if (node.plr == PLAYER.BLACK):
+                white ^= swap
+            else:
+                black ^= swap
+
+        winner = _winner(white, black)
+        if (winner is None):
+            # Rozwinięcie. Ruchy są sortowane
+            # rosnąco, więc najlepsze według
+            # strategii rozgrywek są rozwijane
+            # jako pierwsze.
+            if (node.untried is None):
+                if (node.plr == PLAYER.WHITE):
+                    moves = side_moves(white, white | black)
+                else:
+                    moves = side_moves(black, white | black)
+                plr = node.plr
+                moves.sort(key=lambda m: self._move_quality(m, plr))
+                node.untried = moves
+
+            if (node.untried):
+                move = node.untried.pop()
+                swap = BIT[move >> 8] | BIT[move & 255]
+                if (node.plr == PLAYER.WHITE):
+                    white ^= swap
+                    child = _Node(move, node, PLAYER.BLACK)
+                else:
+                    black ^= swap
+                    child = _Node(move, node, PLAYER.WHITE)
+                node.children.append(child)
+                node = child
+
+            result = self._rollout(node.plr, white, black)
+        else:
+            result = 1.0 if winner == PLAYER.WHITE else 0.0
+
+        # Propagacja wyniku w górę drzewa.
+        while (node is not None):
+            node.visits += 1
+            if (node.plr == PLAYER.BLACK):
+                # Ruch do węzła wykonał biały.
+                node.wins += result
+            else:
+                node.wins += 1 - result
+            node = node.parent
+
+        return result
+
+    def _find_root(self, position):
+        """! Szuka pozycji w drzewie z poprzedniego ruchu.
+
+        Sprawdza korzeń i dwa kolejne poziomy
+        (ruch bota i odpowiedź przeciwnika).
+
+        @param position Obecna pozycja.
+
+        @return Węzeł z tą pozycją lub None.
+        """
+
+        if (self._root is None):
+            return None
+
+        if (self._root_position == position):
+            return self._root
+
+        for child in self._root.children:
+            after = self._root_position.play(child.move)
+            if (after == position):
+                return child
+
+            for grandchild in child.children:
+                if (after.play(grandchild.move) == position):
+                    return grandchild
+
+        return None
+
+    def search(self, control=None):
+        """! Przeszukuje drzewo z obecnej pozycji silnika.
+
+        @param control Obiekt klasy SearchControl
+                       (domyślnie z limitów bota).
+
+        @return Najlepszy ruch (zakodowany) lub None,
+                jeśli nie ma ruchów.
+        """
+
+        position = self._engine.get_position()
+
+        if (control is None):
+            control = SearchControl(self.time_limit, self.playouts_limit)
+
+        if (self._parallel is not None):
+            return self._parallel_search(position, control)
+
+        root = self._find_root(position)
+
+        # Za duże drzewo budujemy od nowa,
+        # żeby pamięć nie rosła przez całą partię.
+        if (root is not None and root.visits > self.max_tree_visits):
+            root = None
+        self._root = None
+
+        if (root is None):
+            root = _Node(None, None, position.moving_player)
+        root.parent = None
+
+        self.reused_visits = root.visits
+
+        start = time.monotonic()
+        self.playouts = 0
+        while (not control.should_stop(self.playouts)):
+            self._playout(root, position)
+            self.playouts += 1
+
+            # Jedyny ruch nie wymaga przeszukiwania.
+            if (not root.untried and len(root.children) <= 1):
+                break
+        self.elapsed = time.monotonic() - start
+
+        self._root = root
+        self._root_position = position
+
+        if (not root.children):
+            return None
+
+        best = max(root.children, key=lambda n: n.visits)
+        return best.move
+
+    def _parallel_search(self, position, control):
+        """! Przeszukuje drzewo w wielu procesach.
+
+        Drzewo nie jest zachowywane między
+        ruchami - każdy proces ma własne
+        poddrzewa ruchów z korzenia.
+
+        @param position Pozycja w korzeniu.
+        @param control Obiekt klasy SearchControl.
+
+        @return Najlepszy ruch (zakodowany) lub None,
+                jeśli nie ma ruchów.
+        """
+
+        plr = position.moving_player
+        moves = side_moves(position.get_bitboard(plr),
+                           position.get_occupied())
+
+        self._root = None
+        self._root_position = None
+        self.reused_visits = 0
+        self.playouts = 0
+        self.elapsed = 0.0
+
+        if (len(moves) <= 1):
+            return moves[0] if moves else None
+
+        # Najpierw sprawdzane są ruchy najlepsze
+        # według strategii rozgrywek.
+        moves.sort(key=lambda m: self._move_quality(m, plr), reverse=True)
+
+        if (control.deadline is None):
+            time_limit = None
+        else:
+            time_limit = max(0.0, control.deadline - time.monotonic())
+
+        start = time.monotonic()
+        results = self._parallel.search(position, moves, time_limit,
+                                        control.node_limit, control)
+        self.elapsed = time.monotonic() - start
+
+        self.playouts = sum(visits for _, visits, _ in results)
+
+        return max(results, key=lambda r: r[1])[0]
+
+    def search_stats(self):
+        """! Zwraca statystyki ostatniego przeszukiwania.
+
+        @return Słownik ze statystykami.
+        """
+
+        if (self.elapsed > 0):
+            rate = self.playouts / self.elapsed
+        else:
+            rate = 0.0
+
+        return {
+                'playouts': self.playouts,
+                'elapsed': self.elapsed,
+                'playouts_per_second': rate,
+                'reused_visits': self.reused_visits,
+        }
+
+    def make_move(self):
+        """! Wykonuje ruch.
+
+        @return Wykonany ruch lub None, jeśli
+                gracz nie ma żadnego ruchu.
+        """
+
+        move = self._book_move()
+        if (move is None):
+            move = self._race_move()
+        if (move is None):
+            move = self.search()
+        if (move is None):
+            return None
+
+        self._engine.make_move(move)
+        return move_to_fields(move)
@@ -0,0 +1,374 @@
+# Równoległe przeszukiwanie korzenia drzewa gry.
+#
+# Ruchy z korzenia są rozdzielane między procesy
+# z puli ProcessPoolExecutor. Procesy dostają pozycję
+# w postaci binarnej (Position.to_bytes) i ruch do
+# sprawdzenia. Najlepsza dotąd ocena w korzeniu
+# (alfa) jest współdzielona przez wszystkie procesy
+# w zmiennej multiprocessing.Value i odczytywana
+# w trakcie przeszukiwania, dzięki czemu każdy
+# proces korzysta z odcięć znalezionych przez
+# pozostałe.
+#
+# Wszystkie zadania dostają ten sam termin
+# zakończenia (czas bezwzględny), a proces
+# główny może je przerwać wspólną flagą.
+# Procesy na bieżąco dodają odwiedzone węzły
+# do wspólnego licznika, żeby proces główny
+# mógł pilnować limitu węzłów całego
+# przeszukiwania.
+#
+# Autor: Antoni Przybylik
+
+from halma.engine import Engine
+from halma.position import Position
+
+# Import tablic geometrii przy starcie procesu,
+# żeby nie budować ich przy pierwszym zadaniu.
+import halma.geometry  # noqa: F401
+
+from bots.control import SearchControl
+from bots.control import SearchAborted
+
+from bots.search import INFINITY
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+
+import multiprocessing
+import os
+import time
+
+# Co ile sekund proces główny sprawdza,
+# czy przerwać zadania.
+POLL_INTERVAL = 0.02
+
+# Stan procesu roboczego (ustawiany w _init_worker).
+_worker_bot = None
+_worker_engine = None
+_shared_alpha = None
+_stop = None
+_nodes = None
+
+
+class _WorkerControl(SearchControl):
+    """! Kontrola przeszukiwania w procesie roboczym.
+
+    Przy każdym sprawdzeniu limitów odczytuje
+    wspólną flagę przerwania i wspólną alfę
+    oraz dodaje nowe węzły do wspólnego licznika.
+    """
+
+    def __init__(self, time_limit=None, node_limit=None):
+        """! Konstruktor klasy _WorkerControl.
+
+        Przy małym limicie węzłów limity są
+        sprawdzane częściej, żeby zadanie nie
+        przekroczyło go o cały odstęp sprawdzeń.
+
+        @param time_limit Czas w sekundach (lub None).
+        @param node_limit Limit węzłów zadania (lub None).
+        """
+
+        if (node_limit is None):
+            super().__init__(time_limit, node_limit)
+        else:
+            super().__init__(time_limit, node_limit,
+                             max(1, min(1024, node_limit)))
+
+        # Węzły już dodane do wspólnego licznika.
+        self.reported = 0
+
+    def report(self, nodes):
+        """! Dodaje nowe węzły do wspólnego licznika.
+
+        @param nodes Liczba odwiedzonych dotąd węzłów.
+        """
+
+        if (nodes > self.reported):
+            with _nodes.get_lock():
+                _nodes.value += nodes - self.reported
+            self.reported = nodes
+
+    def should_stop(self, nodes):
+        """! Sprawdza, czy należy przerwać przeszukiwanie.
+
+        Przy okazji odświeża root_alpha i
+        wspólny licznik węzłów.
+
+        @param nodes Liczba odwiedzonych dotąd węzłów.
+
+        @return Czy należy przerwać.
+        """
+
+        self.report(nodes)
+
+        if (_stop.value):
+            return True
+
+        alpha = _shared_alpha.value
+        if (alpha > self.root_alpha):
+            self.root_alpha = alpha
+
+        return super().should_stop(nodes)
+
+
+def _init_worker(bot_class, shared_alpha, stop, nodes, tt_factory,
+                 bot_args):
+    """! Inicjalizuje proces roboczy.
+
+    @param bot_class Klasa bota (podklasa SearchBot).
+    @param shared_alpha Współdzielona alfa korzenia.
+    @param stop Współdzielona flaga przerwania zadań.
+    @param nodes Współdzielony licznik odwiedzonych węzłów.
+    @param tt_factory Funkcja tworząca tablicę transpozycji
+                      procesu (lub None).
+    @param bot_args Słownik z dodatkowymi argumentami bota.
+    """
+    global _worker_bot, _worker_engine, _shared_alpha, _stop, _nodes
+
+    _worker_engine = Engine()
+
+    tt = tt_factory() if tt_factory is not None else None
+    _worker_bot = bot_class(None, _worker_engine, tt, **bot_args)
+    _shared_alpha = shared_alpha
+    _stop = stop
+    _nodes = nodes
+
+
+def _warm_up():
+    """! Zadanie rozgrzewające proces roboczy.
+
+    @return Pid procesu.
+    """
+    return os.getpid()
+
+
+def _search_move(data, move, depth, deadline, node_limit):
+    """! Przeszukuje jeden ruch z korzenia w procesie roboczym.
+
+    @param data Pozycja w postaci binarnej.
+    @param move Ruch do sprawdzenia.
+    @param depth Głębokość przeszukiwania (licząc korzeń).
+    @param deadline Termin zakończenia (wynik time.time(),
+                    wspólny dla wszystkich zadań) lub None.
+    @param node_limit Limit węzłów dla tego ruchu (lub None).
+
+    @return Krotka (ruch, ocena, główny wariant, liczba węzłów,
+            alfa, pid procesu, statystyki tablicy transpozycji
+            procesu). Ocena jest None, jeśli przeszukiwanie
+            przerwano. Ocena nie większa od alfy (największej,
+            z jaką ruch był przeszukiwany) jest tylko
+            ograniczeniem od góry.
+    """
+
+    bot = _worker_bot
+    engine = _worker_engine
+
+    position = Position.from_bytes(data)
+    engine.set_position(position)
+
+    # Ocena musi być taka sama jak w procesie,
+    # który przeszukuje korzeń, więc tablice
+    # odległości liczymy przed ruchem.
+    bot._set_dist_tables(engine)
+    engine.make_move(move)
+
+    bot.nodes = 0
+    bot._pv = [[], []]
+    bot._prev_pv = []
+    bot._follow_pv = False
+    time_limit = None
+    if (deadline is not None):
+        time_limit = max(0, deadline - time.time())
+
+    control = _WorkerControl(time_limit, node_limit)
+    control.root_alpha = _shared_alpha.value
+    bot._control = control
+    bot._root_alpha = control.root_alpha
+
+    tt_stats = None
+    try:
+        if (control.should_stop(0)):
+            raise SearchAborted()
+        score = -bot._alphabeta(engine, depth - 1, -INFINITY,
+                                -control.root_alpha, 1)[1]
+    except SearchAborted:
+        score = None
+    finally:
+        bot._control = None
+        control.report(bot.nodes)
+        if (bot._tt is not None):
+            tt_stats = bot._tt.stats()
+
+    alpha = bot._root_alpha
+    bot._root_alpha = None
+
+    if (score is None):
+        return (move, None, [], bot.nodes, alpha, os.getpid(), tt_stats)
+
+    # Podnosimy wspólną alfę, jeśli ocena ruchu
+    # jest dokładna i lepsza od dotąd znalezionych.
+    if (score > alpha):
+        with _shared_alpha.get_lock():
+            if (score > _shared_alpha.value):
+                _shared_alpha.value = score
+
+    return (move, score, [move] + bot._pv[1], bot.nodes, alpha,
+            os.getpid(), tt_stats)
+
+
+class ParallelRootSearch:
+    """! Pula procesów przeszukujących ruchy z korzenia. """
+
+    def __init__(self, bot_class, workers=None, tt_factory=None,
+                 **bot_args):
+        """! Konstruktor klasy ParallelRootSearch.
+
+        Procesy są tworzone od razu (patrz start)
+        i żyją do wywołania close.
+
+        @param bot_class Klasa bota (podklasa SearchBot).
+        @param workers Liczba procesów (domyślnie liczba rdzeni).
+        @param tt_factory Funkcja bez argumentów tworząca
+                          tablicę transpozycji dla procesu. Żeby
+                          procesy dzieliły jedną tablicę, można
+                          podać functools.partial(
+                          SharedTranspositionTable.attach, nazwa).
+        @param bot_args Dodatkowe argumenty konstruktora bota
+                        w procesach (np. jump_aware). Muszą być
+                        takie same jak dla bota w korzeniu.
+        """
+
+        if (workers is None):
+            workers = os.cpu_count() or 1
+        if (workers <= 0):
+            raise ValueError('Invalid number of workers.')
+
+        self.workers = workers
+
+        self._bot_class = bot_class
+        self._tt_factory = tt_factory
+        self._bot_args = bot_args
+        self._shared_alpha = multiprocessing.Value('q', 0)
+        self._stop = multiprocessing.Value('b', 0, lock=False)
+        self._nodes = multiprocessing.Value('q', 0)
+        self._pool = None
+
+        # Liczba węzłów odwiedzonych przez
+        # każdy proces (kluczem jest pid).
+        self.worker_nodes = {}
+
+        # Ostatnie statystyki tablic
+        # transpozycji procesów.
+        self.worker_tt_stats = {}
+
+        self.start()
+
+    def start(self):
+        """! Uruchamia procesy robocze.
+
+        Każdy proces importuje moduły (w tym tablice
+        geometrii) i tworzy bota, zanim zacznie się
+        pierwsze przeszukiwanie z limitem czasu.
+        Wywoływane w konstruktorze i po close.
+        """
+
+        if (self._pool is not None):
+            return
+
+        self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self._bot_class,
+                          self._shared_alpha,
+                          self._stop,
+                          self._nodes,
+                          self._tt_factory,
+                          self._bot_args))
+
+        # Pula tworzy nowy proces dla każdego zadania,
+        # dopóki żaden nie jest wolny, więc tyle
+        # zadań naraz uruchamia wszystkie procesy.
+        warm_up = [self._pool.submit(_warm_up)
+                   for _ in range(self.workers)]
+        for future in warm_up:
+            future.result()
+
+    def search(self, position, moves, depth, alpha,
+               time_limit=None, node_limit=None, control=None, nodes=0):
+        """! Przeszukuje ruchy z korzenia równolegle.
+
+        @param position Pozycja w korzeniu (obiekt klasy Position).
+        @param moves Ruchy do sprawdzenia.
+        @param depth Głębokość przeszukiwania (licząc korzeń).
+        @param alpha Najlepsza znana ocena w korzeniu.
+        @param time_limit Pozostały czas w sekundach (lub None).
+                          Dotyczy wszystkich zadań razem.
+        @param node_limit Limit węzłów na jeden ruch (lub None).
+        @param control Obiekt klasy SearchControl procesu głównego
+                       (opcjonalnie). Gdy każe przerwać, zadania
+                       są przerywane. Jego limit węzłów dotyczy
+                       sumy nodes i węzłów wszystkich zadań.
+        @param nodes Liczba węzłów odwiedzonych przed wywołaniem.
+
+        @return Lista krotek (ruch, ocena, główny wariant, liczba
+                węzłów, alfa) w kolejności ruchów. Ocena jest None
+                dla ruchów, których nie zdążono sprawdzić, a ocena
+                nie większa od alfy jest tylko ograniczeniem od góry.
+        """
+
+        self.start()
+        data = position.to_bytes()
+
+        deadline = None
+        if (time_limit is not None):
+            deadline = time.time() + time_limit
+
+        self._shared_alpha.value = alpha
+        self._stop.value = 0
+        self._nodes.value = 0
+
+        futures = [self._pool.submit(_search_move, data, move, depth,
+                                     deadline, node_limit)
+                   for move in moves]
+
+        # Czekamy na zadania, sprawdzając, czy
+        # nie minął czas lub nie przerwano
+        # przeszukiwania w procesie głównym.
+        pending = futures
+        while (pending):
+            _, pending = wait(pending, timeout=POLL_INTERVAL)
+            if (not pending):
+                break
+
+            if ((control is not None and
+                    control.should_stop(nodes + self._nodes.value)) or
+                    (deadline is not None and time.time() >= deadline)):
+                self._stop.value = 1
+                for future in pending:
+                    future.cancel()
+                wait(pending)
+                break
+
+        results = []
+        for move, future in zip(moves, futures):
+            if (future.cancelled()):
+                results.append((move, None, [], 0, alpha))
+                continue
+
+            move, score, pv, nodes, task_alpha, pid, tt_stats = \
+                future.result()
+            self.worker_nodes[pid] = self.worker_nodes.get(pid, 0) + nodes
+            if (tt_stats is not None):
+                self.worker_tt_stats[pid] = tt_stats
+            results.append((move, score, pv, nodes, task_alpha))
+
+        return results
+
+    def close(self):
+        """! Kończy procesy robocze. """
+
+        if (self._pool is not None):
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,320 @@
+# Równoległe przeszukiwanie Monte Carlo.
+#
+# Każdy proces z puli ProcessPoolExecutor buduje
+# własne poddrzewa dla ruchów z korzenia, ale
+# statystyki korzenia (liczba rozgrywek i suma
+# wyników każdego ruchu) są trzymane we wspólnej
+# pamięci. Dzięki temu wszystkie procesy wybierają
+# ruch z korzenia na podstawie połączonych wyników.
+#
+# Żeby procesy nie sprawdzały jednocześnie tego
+# samego ruchu, stosujemy wirtualne porażki: ruch,
+# dla którego trwa rozgrywka, jest liczony tak,
+# jakby tę rozgrywkę już przegrał. Po jej końcu
+# wirtualna porażka jest zastępowana prawdziwym
+# wynikiem.
+#
+# Tak jak w bots.parallel, wszystkie procesy
+# dostają ten sam termin zakończenia (czas
+# bezwzględny), a proces główny może je
+# przerwać wspólną flagą.
+#
+# Autor: Antoni Przybylik
+
+from halma.defs import PLAYER
+
+from halma.engine import Engine
+from halma.position import Position
+
+from bots.control import SearchControl
+from bots.mcts_bot import _Node
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+
+import multiprocessing
+import math
+import os
+import time
+
+# Maksymalna liczba ruchów w korzeniu
+# (19 pionków po najwyżej 256 pól).
+MAX_ROOT_MOVES = 19 * 256
+
+# Co ile sekund proces główny sprawdza,
+# czy przerwać rozgrywki.
+POLL_INTERVAL = 0.02
+
+# Stan procesu roboczego (ustawiany w _init_worker).
+_worker_bot = None
+_lock = None
+_visits = None
+_wins = None
+_virtual = None
+_total = None
+_stop = None
+
+
+def _init_worker(bot_class, bot_args, lock, visits, wins, virtual, total,
+                 stop):
+    """! Inicjalizuje proces roboczy.
+
+    @param bot_class Klasa bota (podklasa MctsBot).
+    @param bot_args Słownik z dodatkowymi argumentami bota.
+    @param lock Blokada chroniąca wspólne statystyki.
+    @param visits Liczby rozgrywek ruchów z korzenia.
+    @param wins Sumy wyników ruchów z korzenia.
+    @param virtual Liczby trwających rozgrywek ruchów z korzenia.
+    @param total Liczba rozpoczętych rozgrywek.
+    @param stop Współdzielona flaga przerwania rozgrywek.
+    """
+    global _worker_bot, _lock, _visits, _wins, _virtual, _total, _stop
+
+    _worker_bot = bot_class(None, Engine(), **bot_args)
+    _lock = lock
+    _visits = visits
+    _wins = wins
+    _virtual = virtual
+    _total = total
+    _stop = stop
+
+
+def _warm_up():
+    """! Zadanie rozgrzewające proces roboczy.
+
+    @return Pid procesu.
+    """
+    return os.getpid()
+
+
+def _select(n, exploration):
+    """! Wybiera ruch z korzenia (wywoływane pod blokadą).
+
+    @param n Liczba ruchów w korzeniu.
+    @param exploration Stała eksploracji we wzorze UCT.
+
+    @return Numer ruchu.
+    """
+
+    log_total = math.log(max(1, _total.value))
+
+    best = 0
+    best_value = -1.0
+    for i in range(n):
+        visits = _visits[i] + _virtual[i]
+        if (not visits):
+            return i
+
+        value = (_wins[i] / visits +
+                 exploration * math.sqrt(log_total / visits))
+        if (value > best_value):
+            best = i
+            best_value = value
+
+    return best
+
+
+def _search_root(data, moves, deadline, playouts, seed):
+    """! Wykonuje rozgrywki w procesie roboczym.
+
+    @param data Pozycja w korzeniu w postaci binarnej.
+    @param moves Ruchy z korzenia.
+    @param deadline Termin zakończenia (wynik time.time(),
+                    wspólny dla wszystkich procesów) lub None.
+    @param playouts Limit rozgrywek wszystkich procesów (lub None).
+    @param seed Ziarno generatora liczb losowych procesu.
+
+    @return Krotka (liczba rozgrywek procesu, pid procesu).
+    """
+
+    bot = _worker_bot
+    bot._random.seed(seed)
+
+    position = Position.from_bytes(data)
+    mover = position.moving_player
+    if (mover == PLAYER.WHITE):
+        enemy = PLAYER.BLACK
+    else:
+        enemy = PLAYER.WHITE
+
+    # Poddrzewa ruchów z korzenia (własne dla procesu).
+    children = [_Node(move, None, enemy) for move in moves]
+    after = [position.play(move) for move in moves]
+
+    time_limit = None
+    if (deadline is not None):
+        time_limit = max(0, deadline - time.time())
+
+    control = SearchControl(time_limit)
+    done = 0
+
+    while (not _stop.value and not control.should_stop(done)):
+        with _lock:
+            if (playouts is not None and _total.value >= playouts):
+                break
+            _total.value += 1
+
+            i = _select(len(moves), bot.exploration)
+            _virtual[i] += 1
+
+        result = bot._playout(children[i], after[i])
+        if (mover == PLAYER.BLACK):
+            result = 1 - result
+
+        with _lock:
+            _virtual[i] -= 1
+            _visits[i] += 1
+            _wins[i] += result
+
+        done += 1
+
+    return (done, os.getpid())
+
+
+class ParallelMcts:
+    """! Pula procesów wykonujących rozgrywki Monte Carlo. """
+
+    def __init__(self, bot_class, workers=None, **bot_args):
+        """! Konstruktor klasy ParallelMcts.
+
+        Procesy są tworzone od razu (patrz start)
+        i żyją do wywołania close.
+
+        @param bot_class Klasa bota (podklasa MctsBot).
+        @param workers Liczba procesów (domyślnie liczba rdzeni).
+        @param bot_args Dodatkowe argumenty konstruktora bota
+                        w procesach (np. rollout_depth).
+        """
+
+        if (workers is None):
+            workers = os.cpu_count() or 1
+        if (workers <= 0):
+            raise ValueError('Invalid number of workers.')
+
+        self.workers = workers
+
+        self._bot_class = bot_class
+        self._bot_args = dict(bot_args)
+        self._bot_args.setdefault('playouts', 1)
+
+        # Statystyki korzenia wspólne dla procesów. Dostęp
+        # do nich chroni jedna blokada, więc tablice
+        # mogą być bez własnych blokad.
+        self._lock = multiprocessing.Lock()
+        self._visits = multiprocessing.Array('q', MAX_ROOT_MOVES, lock=False)
+        self._wins = multiprocessing.Array('d', MAX_ROOT_MOVES, lock=False)
+        self._virtual = multiprocessing.Array('q', MAX_ROOT_MOVES, lock=False)
+        self._total = multiprocessing.Value('q', 0, lock=False)
+        self._stop = multiprocessing.Value('b', 0, lock=False)
+
+        self._pool = None
+        self._seed = 0
+
+        # Liczba rozgrywek wykonanych przez
+        # każdy proces (kluczem jest pid).
+        self.worker_playouts = {}
+
+        self.start()
+
+    def start(self):
+        """! Uruchamia procesy robocze.
+
+        Każdy proces importuje moduły i tworzy
+        bota, zanim zacznie się pierwsze
+        przeszukiwanie z limitem czasu.
+        Wywoływane w konstruktorze i po close.
+        """
+
+        if (self._pool is not None):
+            return
+
+        self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self._bot_class, self._bot_args,
+                          self._lock, self._visits, self._wins,
+                          self._virtual, self._total, self._stop))
+
+        # Tyle zadań naraz uruchamia wszystkie
+        # procesy (patrz ParallelRootSearch.start).
+        warm_up = [self._pool.submit(_warm_up)
+                   for _ in range(self.workers)]
+        for future in warm_up:
+            future.result()
+
+    def search(self, position, moves, time_limit=None, playouts=None,
+               control=None):
+        """! Wykonuje rozgrywki we wszystkich procesach.
+
+        @param position Pozycja w korzeniu (obiekt klasy Position).
+        @param moves Ruchy z korzenia.
+        @param time_limit Czas w sekundach (lub None). Dotyczy
+                          wszystkich procesów razem.
+        @param playouts Limit rozgrywek wszystkich procesów
+                        (lub None).
+        @param control Obiekt klasy SearchControl procesu głównego
+                       (opcjonalnie). Gdy każe przerwać, rozgrywki
+                       są przerywane.
+
+        @return Lista krotek (ruch, liczba rozgrywek, suma wyników)
+                w kolejności ruchów. Wyniki są z punktu widzenia
+                gracza, który ma ruch w korzeniu.
+        """
+
+        if (time_limit is None and playouts is None and control is None):
+            raise ValueError('No search limit.')
+        if (len(moves) > MAX_ROOT_MOVES):
+            raise ValueError('Too many moves.')
+
+        self.start()
+        data = position.to_bytes()
+
+        deadline = None
+        if (time_limit is not None):
+            deadline = time.time() + time_limit
+
+        with self._lock:
+            for i in range(len(moves)):
+                self._visits[i] = 0
+                self._wins[i] = 0.0
+                self._virtual[i] = 0
+            self._total.value = 0
+        self._stop.value = 0
+
+        futures = []
+        for _ in range(self.workers):
+            self._seed += 1
+            futures.append(self._pool.submit(_search_root, data, moves,
+                                             deadline, playouts,
+                                             self._seed))
+
+        # Czekamy na procesy, sprawdzając, czy nie
+        # przerwano przeszukiwania w procesie głównym.
+        pending = futures
+        while (pending):
+            _, pending = wait(pending, timeout=POLL_INTERVAL)
+            if (pending and control is not None and control.should_stop(0)):
+                self._stop.value = 1
+                for future in pending:
+                    future.cancel()
+                wait(pending)
+                break
+
+        for future in futures:
+            if (future.cancelled()):
+                continue
+
+            done, pid = future.result()
+            self.worker_playouts[pid] = \
+                self.worker_playouts.get(pid, 0) + done
+
+        with self._lock:
+            return [(move, self._visits[i], self._wins[i])
+                    for i, move in enumerate(moves)]
+
+    def close(self):
+        """! Kończy procesy robocze. """
+
+        if (self._pool is not None):
+            self._pool.shutdown()
+            self._pool = None
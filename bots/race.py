@@ -0,0 +1,287 @@
+# Rozwiązywanie wyścigu po minięciu się armii.
+#
+# Gdy armie się minęły (halma.geometry.disengaged),
+# każdy gracz rozwiązuje osobne zadanie: jak
+# najmniejszą liczbą ruchów zapełnić obóz
+# przeciwnika swoimi pionkami. Pionki przeciwnika
+# są traktowane jak nieruchome przeszkody.
+#
+# Najpierw próbujemy algorytmu IDA* z dopuszczalną
+# heurystyką (liczba wolnych pól obozu - każdy
+# ruch zajmuje najwyżej jedno pole), który daje najkrótszy
+# plan, ale jest wykonalny tylko blisko końca gry.
+# Jeśli nie zmieści się w limicie węzłów, szukamy
+# algorytmem A* z heurystyką liczącą, o ile
+# pionki są jeszcze daleko od rogu planszy w
+# obozie. Heurystyka ta nie jest dopuszczalna
+# (skoki skracają drogę), więc plan może nie
+# być najkrótszy.
+#
+# Autor: Antoni Przybylik
+
+from halma.defs import PLAYER
+
+from halma.geometry import SIZE
+from halma.geometry import field
+from halma.geometry import iter_bits
+from halma.geometry import BLACK_CAMP_MASK
+from halma.geometry import WHITE_CAMP_MASK
+
+from halma.movegen import side_moves
+
+import heapq
+
+
+# Przekątna pola licząc od rogu planszy w
+# obozie docelowym białego i czarnego. Suma
+# przekątnych pionków maleje, gdy pionki idą
+# w stronę obozu i w głąb obozu.
+_WHITE_DEPTH = tuple(y + x for y, x in map(field, range(SIZE * SIZE)))
+_BLACK_DEPTH = tuple(2 * SIZE - 2 - d for d in _WHITE_DEPTH)
+
+
+def target_camp(plr):
+    """! Zwraca obóz, do którego idzie gracz.
+
+    @param plr Gracz (biały/czarny).
+
+    @return Bitboard obozu.
+    """
+
+    if (plr == PLAYER.WHITE):
+        return BLACK_CAMP_MASK
+    return WHITE_CAMP_MASK
+
+
+class RaceSolver:
+    """! Szuka najkrótszego planu zapełnienia obozu. """
+
+    def __init__(self, plr, node_limit=5000, exact_share=0.1, weight=1):
+        """! Konstruktor klasy RaceSolver.
+
+        @param plr Gracz (biały/czarny).
+        @param node_limit Limit rozwiniętych pozycji.
+        @param exact_share Część limitu przeznaczona na IDA*.
+        @param weight Waga heurystyki w A* (im większa, tym
+                      szybciej znajdowany jest dłuższy plan).
+        """
+
+        self.plr = plr
+        self.node_limit = node_limit
+        self.exact_share = exact_share
+        self.weight = weight
+
+        self._camp = target_camp(plr)
+        if (plr == PLAYER.WHITE):
+            self._depth = _WHITE_DEPTH
+        else:
+            self._depth = _BLACK_DEPTH
+
+        # Suma przekątnych pionków zapełniających obóz.
+        self._final_depth = sum(self._depth[i] for i in iter_bits(self._camp))
+
+        self.nodes = 0
+
+        # Czy ostatni plan jest na pewno najkrótszy.
+        self.optimal = False
+
+    def _holes(self, mine, obstacles):
+        """! Dopuszczalna heurystyka: liczba wolnych pól obozu.
+
+        Każdy ruch zajmuje najwyżej jedno pole obozu.
+
+        @param mine Bitboard pionków gracza.
+        @param obstacles Bitboard pionków przeciwnika.
+
+        @return Dolne ograniczenie liczby ruchów.
+        """
+        return (self._camp & ~(mine | obstacles)).bit_count()
+
+    def _is_goal(self, mine, obstacles):
+        """! Sprawdza, czy gracz wygrał.
+
+        Warunek jest taki sam jak w GameInterface.get_winner.
+
+        @param mine Bitboard pionków gracza.
+        @param obstacles Bitboard pionków przeciwnika.
+
+        @return Czy obóz jest zapełniony.
+        """
+
+        camp = self._camp
+        return ((mine | obstacles) & camp) == camp and bool(mine & camp)
+
+    def _estimate(self, mine):
+        """! Heurystyka A*.
+
+        O ile suma przekątnych pionków jest
+        większa niż po zapełnieniu obozu. Ruch o
+        jedno pole zmniejsza ją najwyżej o dwa,
+        ale skok może ją zmniejszyć dowolnie.
+
+        @param mine Bitboard pionków gracza.
+
+        @return Szacowana odległość od celu.
+        """
+
+        depth = self._depth
+        return sum(depth[i] for i in iter_bits(mine)) - self._final_depth
+
+    def _play(self, mine, move):
+        """! Wykonuje ruch na bitboardzie.
+
+        @param mine Bitboard pionków gracza.
+        @param move Zakodowany ruch.
+
+        @return Nowy bitboard.
+        """
+        return mine ^ (1 << (move >> 8)) ^ (1 << (move & 255))
+
+    def _ordered_moves(self, mine, obstacles):
+        """! Ruchy posortowane od najbardziej obiecujących.
+
+        @param mine Bitboard pionków gracza.
+        @param obstacles Bitboard pionków przeciwnika.
+
+        @return Lista ruchów.
+        """
+
+        depth = self._depth
+        camp = self._camp
+
+        def key(m):
+            src, dst = m >> 8, m & 255
+            return (((camp >> dst) & 1) - ((camp >> src) & 1)) * 64 + \
+                depth[src] - depth[dst]
+
+        moves = side_moves(mine, mine | obstacles)
+        moves.sort(key=key, reverse=True)
+        return moves
+
+    def _ida(self, mine, obstacles, limit):
+        """! Szuka najkrótszego planu algorytmem IDA*.
+
+        @param mine Bitboard pionków gracza.
+        @param obstacles Bitboard pionków przeciwnika.
+        @param limit Limit rozwiniętych pozycji.
+
+        @return Lista ruchów lub None, jeśli nie
+                zmieszczono się w limicie.
+        """
+
+        path = []
+        start = self.nodes
+
+        def dfs(mine, g, bound, seen):
+            h = self._holes(mine, obstacles)
+            if (g + h > bound):
+                return g + h
+            if (self._is_goal(mine, obstacles)):
+                return -1
+
+            # Tę pozycję sprawdziliśmy już
+            # z nie większą liczbą ruchów.
+            if (seen.get(mine, bound + 1) <= g):
+                return bound + 1
+            seen[mine] = g
+
+            self.nodes += 1
+            if (self.nodes - start > limit):
+                return None
+
+            result = bound + 1
+            for move in self._ordered_moves(mine, obstacles):
+                path.append(move)
+                t = dfs(self._play(mine, move), g + 1, bound, seen)
+                if (t is None or t < 0):
+                    return t
+                path.pop()
+                result = min(result, t)
+
+            return result
+
+        bound = self._holes(mine, obstacles)
+        while True:
+            t = dfs(mine, 0, bound, {})
+            if (t is None):
+                return None
+            if (t < 0):
+                return path
+            bound = t
+
+    def _astar(self, mine, obstacles, limit):
+        """! Szuka planu algorytmem A*.
+
+        @param mine Bitboard pionków gracza.
+        @param obstacles Bitboard pionków przeciwnika.
+        @param limit Limit rozwiniętych pozycji.
+
+        @return Lista ruchów. Jeśli nie znaleziono planu
+                w limicie, plan prowadzi do najbliższej
+                celu znalezionej pozycji.
+        """
+
+        depth = self._depth
+        weight = self.weight
+        start = self.nodes
+
+        est = self._estimate(mine)
+        queue = [(est * weight, est, mine)]
+        parent = {mine: None}
+        cost = {mine: 0}
+        best = (est, mine)
+
+        while (queue and self.nodes - start < limit):
+            _, est, current = heapq.heappop(queue)
+            if (self._is_goal(current, obstacles)):
+                best = (0, current)
+                break
+
+            g = cost[current]
+            self.nodes += 1
+            if (est < best[0]):
+                best = (est, current)
+
+            for move in side_moves(current, current | obstacles):
+                src, dst = move >> 8, move & 255
+                after = current ^ (1 << src) ^ (1 << dst)
+                if (cost.get(after, g + 2) <= g + 1):
+                    continue
+
+                cost[after] = g + 1
+                parent[after] = (current, move)
+
+                # Heurystykę liczymy przyrostowo.
+                after_est = est - depth[src] + depth[dst]
+                heapq.heappush(queue, (g + 1 + after_est * weight,
+                                       after_est, after))
+
+        plan = []
+        state = best[1]
+        while (parent[state] is not None):
+            state, move = parent[state]
+            plan.append(move)
+        plan.reverse()
+
+        return plan
+
+    def solve(self, mine, obstacles):
+        """! Szuka planu zapełnienia obozu.
+
+        @param mine Bitboard pionków gracza.
+        @param obstacles Bitboard pionków przeciwnika.
+
+        @return Lista ruchów (pusta, jeśli obóz już jest pełny).
+                Atrybut optimal mówi, czy plan jest najkrótszy.
+        """
+
+        self.nodes = 0
+
+        exact_limit = int(self.node_limit * self.exact_share)
+        plan = self._ida(mine, obstacles, exact_limit)
+        if (plan is not None):
+            self.optimal = True
+            return plan
+
+        self.optimal = False
+        return self._astar(mine, obstacles, self.node_limit - self.nodes)
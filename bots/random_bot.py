@@ -2,8 +2,7 @@
 #
 # Autor: Antoni Przybylik
 
-from halma.defs import STATE
-from halma.defs import PLAYER
+from halma.geometry import move_to_fields
 
 from bots.generic import GameBot
 
@@ -16,30 +15,17 @@ class RandomBot(GameBot):
     def make_move(self):
         """! Wykonuje ruch.
 
-        @return Wykonany ruch.
+        @return Wykonany ruch lub None, jeśli
+                gracz nie ma żadnego ruchu.
         """
 
-        board = self._engine.get_board()
         moving_player = self._engine.moving_player
 
-        my_positions = []
-        moves_to_consider = []
+        moves = self._engine.all_moves(moving_player)
+        if (not moves):
+            return None
 
-        for i in range(0, 16):
-            for j in range(0, 16):
-                field = board[i][j]
+        move = random.choice(moves)
+        self._engine.make_move(move)
 
-                if ((field == STATE.BLACK and
-                     moving_player == PLAYER.BLACK) or
-                    (field == STATE.WHITE and
-                     moving_player == PLAYER.WHITE)):
-                    my_positions.append((i, j))
-
-        for pos_from in my_positions:
-            for pos_to in self._engine.moves(pos_from[0], pos_from[1]):
-                moves_to_consider.append((pos_from, pos_to))
-
-        move = random.choice(moves_to_consider)
-        self._apply_move(*move)
-
-        return move
+        return move_to_fields(move)
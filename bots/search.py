@@ -0,0 +1,850 @@
+# Implementuje bazową klasę botów
+# przeszukujących drzewo gry.
+#
+# Przeszukiwanie jest w wariancie negamax:
+# ocena pozycji jest zawsze liczona z punktu
+# widzenia gracza, który ma ruch (im większa
+# tym lepsza), a ocena ruchu to zanegowana
+# ocena pozycji po ruchu.
+#
+# Autor: Antoni Przybylik
+
+from halma.defs import PLAYER
+
+from halma.geometry import move_to_fields
+from halma.geometry import DIST_TO_BLACK_CORNER
+from halma.geometry import DIST_TO_WHITE_CORNER
+from halma.geometry import DIST_TO_BLACK_CAMP
+from halma.geometry import DIST_TO_WHITE_CAMP
+from halma.geometry import BLACK_CAMP_MASK
+from halma.geometry import WHITE_CAMP_MASK
+
+from halma.movegen import jump_distances
+
+from bots.generic import GameBot
+
+from bots.transposition import EXACT
+from bots.transposition import LOWER
+from bots.transposition import UPPER
+
+from bots.control import SearchControl
+from bots.control import SearchAborted
+
+import time
+
+# Wartość większa od każdej oceny pozycji.
+INFINITY = 10**9
+
+# Ocena wygranej pozycji (bez premii za
+# szybkość, patrz SearchBot._terminal_score).
+# Większa od każdej oceny z _evaluate.
+WIN_SCORE = 10**6
+
+# Największa głębokość pogłębiania iteracyjnego.
+MAX_DEPTH = 64
+
+
+class SearchBot(GameBot):
+    """! Bazowa klasa botów przeszukujących drzewo gry. """
+
+    def __init__(self, plr, engine, tt=None,
+                 time_limit=5, node_limit=None, parallel=None,
+                 jump_aware=False):
+        """! Konstruktor klasy SearchBot.
+
+        @param plr Gracz (biały/czarny).
+        @param engine Referencja na obiekt Engine.
+        @param tt Tablica transpozycji (opcjonalnie). Oceny
+                  zależą od bota, więc tablica nie powinna
+                  być współdzielona przez boty różnych klas.
+        @param time_limit Czas na ruch w sekundach (None - bez limitu).
+        @param node_limit Limit węzłów na ruch (None - bez limitu).
+                          Sam limit węzłów daje powtarzalne ruchy.
+        @param parallel Obiekt klasy bots.parallel.ParallelRootSearch
+                        (opcjonalnie). Jeśli jest podany, ruchy z
+                        korzenia są przeszukiwane w wielu procesach.
+        @param jump_aware Czy ocena ma uwzględniać skoki (odległości
+                          pól liczone są w korzeniu funkcją
+                          halma.movegen.jump_distances).
+        """
+        super().__init__(plr, engine)
+
+        self._tt = tt
+        self._parallel = parallel
+
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+
+        self.jump_aware = jump_aware
+
+        # Kontrola obecnego przeszukiwania.
+        self._control = None
+
+        # Ocena w korzeniu znana z innych procesów
+        # (SearchControl.root_alpha) lub None.
+        self._root_alpha = None
+
+        # Liczba odwiedzonych węzłów
+        # w ostatnim przeszukiwaniu.
+        self.nodes = 0
+
+        # Stan pogłębiania iteracyjnego: ruchy w
+        # korzeniu, główny wariant obecnej i
+        # poprzedniej iteracji, najlepszy ruch.
+        self._root_moves = []
+        self._pv = [[]]
+        self._prev_pv = []
+        self._follow_pv = False
+        self._best_move = None
+        self._best_score = -INFINITY
+
+        # Porządkowanie ruchów: ruchy-zabójcy (po dwa
+        # na poziom drzewa) i tablica historii
+        # indeksowana zakodowanym ruchem (from, to).
+        self._killers = []
+        self._history = [0] * 65536
+
+        # Statystyki ostatniego przeszukiwania.
+        self.stats = self._empty_stats()
+
+    def _empty_stats(self):
+        """! Tworzy wyzerowane statystyki przeszukiwania.
+
+        @return Słownik z licznikami.
+        """
+
+        return {
+                'cutoffs': 0,        # Wszystkie odcięcia.
+                'first_cutoffs': 0,  # Odcięcia na pierwszym ruchu.
+                'hash_cutoffs': 0,   # Odcięcia na ruchu z PV lub TT.
+                'killer_cutoffs': 0,  # Odcięcia na ruchu-zabójcy.
+        }
+
+    def search_stats(self):
+        """! Zwraca statystyki ostatniego przeszukiwania.
+
+        Oprócz liczników zawiera części odcięć
+        uzyskanych na pierwszym ruchu, ruchu z
+        tablicy transpozycji (lub głównego wariantu)
+        i ruchu-zabójcy.
+
+        @return Słownik ze statystykami.
+        """
+
+        result = dict(self.stats)
+        result['nodes'] = self.nodes
+
+        cutoffs = max(1, self.stats['cutoffs'])
+        result['first_cutoff_rate'] = self.stats['first_cutoffs'] / cutoffs
+        result['hash_cutoff_rate'] = self.stats['hash_cutoffs'] / cutoffs
+        result['killer_cutoff_rate'] = \
+            self.stats['killer_cutoffs'] / cutoffs
+
+        return result
+
+    def _progress(self, move, plr):
+        """! Statyczna ocena postępu ruchu.
+
+        Mierzy o ile ruch przybliża pionek do
+        rogu planszy w obozie przeciwnika (pola
+        stykające się rogiem są odległe o dwa).
+
+        @param move Zakodowany ruch.
+        @param plr Gracz, który wykonuje ruch.
+
+        @return Postęp (im większy tym lepszy ruch).
+        """
+
+        progress = ((move >> 12) + ((move >> 8) & 15) -
+                    ((move >> 4) & 15) - (move & 15))
+
+        if (plr == PLAYER.WHITE):
+            return progress
+        return -progress
+
+    def _order_moves(self, moves, ply, plr):
+        """! Ustala kolejność sprawdzania ruchów.
+
+        Najpierw ruchy-zabójcy z danego poziomu,
+        a potem pozostałe według tablicy historii
+        i statycznej oceny postępu.
+
+        @param moves Ruchy.
+        @param ply Odległość od korzenia drzewa.
+        @param plr Gracz, który ma ruch.
+
+        @return Lista ruchów.
+        """
+
+        head = []
+        if (ply < len(self._killers)):
+            for killer in self._killers[ply]:
+                if (killer is not None and killer not in head and
+                        killer in moves):
+                    head.append(killer)
+
+        history = self._history
+        if (plr == PLAYER.WHITE):
+            def key(m):
+                return ((history[m] << 6) + (m >> 12) + ((m >> 8) & 15) -
+                        ((m >> 4) & 15) - (m & 15))
+        else:
+            def key(m):
+                return ((history[m] << 6) - (m >> 12) - ((m >> 8) & 15) +
+                        ((m >> 4) & 15) + (m & 15))
+
+        if (head):
+            rest = [m for m in moves if m not in head]
+        else:
+            rest = list(moves)
+        rest.sort(key=key, reverse=True)
+
+        return head + rest
+
+    def _staged_moves(self, engine, ply, first):
+        """! Generuje ruchy węzła etapami.
+
+        Najpierw ruchy z listy first, potem skoki,
+        a na końcu ruchy o jedno pole (patrz
+        Engine.staged_moves). Każdy etap jest
+        generowany dopiero, gdy poprzednie nie
+        dadzą odcięcia, i porządkowany przez
+        _order_moves.
+
+        @param engine Silnik z pozycją węzła.
+        @param ply Odległość od korzenia drzewa.
+        @param first Poprawne ruchy, które mają być pierwsze.
+
+        @return Generator zakodowanych ruchów.
+        """
+
+        plr = engine.moving_player
+        return engine.staged_moves(
+                first, lambda moves: self._order_moves(moves, ply, plr))
+
+    def _store_cutoff(self, move, depth, ply):
+        """! Zapamiętuje ruch, który dał odcięcie.
+
+        @param move Zakodowany ruch.
+        @param depth Pozostała głębokość.
+        @param ply Odległość od korzenia drzewa.
+        """
+
+        while (len(self._killers) <= ply):
+            self._killers.append([None, None])
+
+        killers = self._killers[ply]
+        if (killers[0] != move):
+            killers[1] = killers[0]
+            killers[0] = move
+
+        self._history[move] += depth * depth
+
+    def _set_dist_tables(self, engine):
+        """! Ustala tablice odległości dla przeszukiwania.
+
+        Tablice są ustawiane w silniku, który
+        aktualizuje sumę odległości po każdym ruchu
+        (Engine.dist_sum). Odległość z uwzględnieniem
+        skoków to liczba ruchów do obozu razy 16 plus
+        odległość od rogu, żeby pionki w obozie
+        szły w jego głąb.
+
+        @param engine Silnik z pozycją w korzeniu.
+        """
+
+        if (not self.jump_aware):
+            # Przywracamy tablice domyślne, gdyby
+            # silnik był wcześniej używany przez
+            # bota uwzględniającego skoki.
+            engine.set_dist_tables()
+            return
+
+        occupied = engine.get_occupied()
+        white = jump_distances(BLACK_CAMP_MASK, occupied,
+                               DIST_TO_BLACK_CAMP)
+        black = jump_distances(WHITE_CAMP_MASK, occupied,
+                               DIST_TO_WHITE_CAMP)
+
+        engine.set_dist_tables(
+                [d * 16 + c for d, c in zip(white, DIST_TO_BLACK_CORNER)],
+                [d * 16 + c for d, c in zip(black, DIST_TO_WHITE_CORNER)])
+
+    def _enemy(self, plr):
+        """! Zwraca przeciwnika danego gracza.
+
+        @plr Gracz (biały/czarny)
+
+        @return Przeciwnik.
+        """
+
+        if (plr == PLAYER.WHITE):
+            return PLAYER.BLACK
+        else:
+            return PLAYER.WHITE
+
+    def _evaluate(self, engine):
+        """! Ocenia pozycję.
+
+        Domyślnie ocena to różnica sum odległości
+        pionków od celu (przeciwnika minus gracza
+        na ruchu). Podklasy mogą ją zmienić.
+
+        @param engine Silnik z pozycją do oceny.
+
+        @return Ocena z punktu widzenia gracza,
+                który ma ruch (im większa tym lepsza).
+        """
+
+        plr = engine.moving_player
+        return engine.dist_sum(self._enemy(plr)) - engine.dist_sum(plr)
+
+    def _terminal_score(self, engine, depth):
+        """! Ocenia pozycję, w której gra się skończyła.
+
+        Wygrana jest tym lepsza, im wcześniej
+        nastąpi, czyli im więcej zostało do
+        przeszukania. Premia zależy od pozostałej
+        głębokości, a nie od odległości od korzenia,
+        więc ta sama pozycja na tej samej głębokości
+        ma zawsze tę samą ocenę (ważne dla tablicy
+        transpozycji).
+
+        @param engine Silnik z pozycją do oceny.
+        @param depth Pozostała głębokość przeszukiwania.
+
+        @return Ocena z punktu widzenia gracza, który
+                ma ruch, lub None, jeśli gra trwa.
+        """
+
+        winner = engine.get_winner()
+        if (winner is None):
+            return None
+
+        if (winner == engine.moving_player):
+            return WIN_SCORE + depth
+        return -WIN_SCORE - depth
+
+    def _minimax(self, engine, depth):
+        """! Algorytm MiniMax (negamax) bez odcięć.
+
+        Przegląda wszystkie ruchy na wszystkich
+        głębokościach. Służy do sprawdzania
+        poprawności metody _alphabeta.
+
+        Ruchy są wykonywane i cofane na
+        przekazanym silniku, po zakończeniu
+        pozycja jest taka sama jak na początku.
+
+        @param engine Silnik z pozycją do przeszukania.
+        @param depth Głębokość rekursji.
+
+        @return Krotka (Wybrany ruch, Ocena pozycji)
+        """
+
+        self.nodes += 1
+
+        score = self._terminal_score(engine, depth)
+        if (score is not None):
+            return (None, score)
+
+        moves = engine.all_moves(engine.moving_player) if depth else ()
+        if (not moves):
+            # Doszliśmy do ostatniego poziomu
+            # rekurencji.
+            return (None, self._evaluate(engine))
+
+        best_move = None
+        best_score = -INFINITY
+
+        for move in moves:
+            engine.make_move(move)
+            score = -self._minimax(engine, depth - 1)[1]
+            engine.unmake_move()
+
+            if (score > best_score):
+                best_move = move
+                best_score = score
+
+        return (best_move, best_score)
+
+    def _alphabeta(self, engine, depth, alpha, beta, ply=0):
+        """! Algorytm alfa-beta (negamax, fail-soft).
+
+        Zwraca ten sam ruch i tę samą ocenę co
+        _minimax, o ile ocena mieści się w
+        przedziale (alpha, beta). W przeciwnym
+        razie ocena jest ograniczeniem od góry
+        (gdy <= alpha) lub od dołu (gdy >= beta).
+
+        Główny wariant (najlepsza linia gry)
+        jest zapisywany w self._pv[ply].
+
+        @param engine Silnik z pozycją do przeszukania.
+        @param depth Głębokość rekursji.
+        @param alpha Dolne ograniczenie oceny.
+        @param beta Górne ograniczenie oceny.
+        @param ply Odległość od korzenia drzewa.
+
+        @return Krotka (Wybrany ruch, Ocena pozycji)
+        """
+
+        self.nodes += 1
+
+        control = self._control
+        if (control is not None and
+                not self.nodes % control.check_every):
+            if (control.should_stop(self.nodes)):
+                raise SearchAborted()
+            self._root_alpha = control.root_alpha
+
+        pv = self._pv
+        if (len(pv) <= ply):
+            pv.append([])
+        pv[ply] = []
+
+        # Po wygranej nie ma już czego szukać.
+        score = self._terminal_score(engine, depth)
+        if (score is not None):
+            return (None, score)
+
+        if (not depth):
+            return (None, self._evaluate(engine))
+
+        tt = self._tt
+        tt_move = None
+
+        if (tt is not None):
+            key = engine.get_hash()
+            entry = tt.probe(key)
+
+            if (entry is not None):
+                tt_depth, bound, score, tt_move = entry
+
+                if (tt_depth >= depth and tt_move is not None and
+                        not self._follow_pv):
+                    if (bound == EXACT or
+                            (bound == LOWER and score >= beta) or
+                            (bound == UPPER and score <= alpha)):
+                        pv[ply] = [tt_move]
+                        return (tt_move, score)
+
+            alpha_orig = alpha
+
+        # Najpierw sprawdzamy ruch z głównego wariantu
+        # poprzedniej iteracji, potem ruch z tablicy.
+        # Najpewniej dadzą szybkie odcięcie, a wtedy
+        # pozostałych ruchów nie trzeba generować.
+        first = []
+        if (self._follow_pv):
+            if (ply < len(self._prev_pv) and
+                    engine.is_legal(self._prev_pv[ply])):
+                first.append(self._prev_pv[ply])
+            else:
+                self._follow_pv = False
+        if (tt_move is not None and engine.is_legal(tt_move)):
+            first.append(tt_move)
+
+        first = list(dict.fromkeys(first))
+        n_first = len(first)
+
+        best_move = None
+        best_score = -INFINITY
+
+        for i, move in enumerate(self._staged_moves(engine, ply, first)):
+            # Na nieparzystych poziomach ruch ma przeciwnik
+            # gracza z korzenia, więc ocena lepsza od
+            # -(alfy korzenia) nie ma znaczenia. Alfa
+            # korzenia mogła wzrosnąć w innym procesie.
+            root_alpha = self._root_alpha
+            if (root_alpha is not None and ply & 1):
+                beta = min(beta, max(alpha + 1, -root_alpha))
+
+            engine.make_move(move)
+            score = -self._alphabeta(engine, depth - 1,
+                                     -beta, -alpha, ply + 1)[1]
+            engine.unmake_move()
+
+            # Tylko pierwszy ruch w węźle
+            # może leżeć na głównym wariancie.
+            self._follow_pv = False
+
+            if (score > best_score):
+                best_move = move
+                best_score = score
+
+                if (score > alpha):
+                    alpha = score
+                    pv[ply] = [move] + pv[ply + 1]
+
+                    if (alpha >= beta):
+                        # Przeciwnik nie dopuści
+                        # do tej pozycji.
+                        self._count_cutoff(i, n_first, move, ply)
+                        self._store_cutoff(move, depth, ply)
+                        break
+
+        if (best_move is None):
+            # Gracz nie ma żadnego ruchu.
+            return (None, self._evaluate(engine))
+
+        if (tt is not None):
+            if (best_score >= beta):
+                bound = LOWER
+            elif (best_score <= alpha_orig):
+                bound = UPPER
+            else:
+                bound = EXACT
+
+            tt.store(key, depth, bound, best_score, best_move)
+
+        return (best_move, best_score)
+
+    def _count_cutoff(self, i, n_first, move, ply):
+        """! Aktualizuje statystyki odcięć.
+
+        @param i Numer ruchu, który dał odcięcie.
+        @param n_first Liczba ruchów z PV i tablicy transpozycji.
+        @param move Ruch, który dał odcięcie.
+        @param ply Odległość od korzenia drzewa.
+        """
+
+        stats = self.stats
+        stats['cutoffs'] += 1
+        if (i == 0):
+            stats['first_cutoffs'] += 1
+        if (i < n_first):
+            stats['hash_cutoffs'] += 1
+        elif (ply < len(self._killers) and move in self._killers[ply]):
+            stats['killer_cutoffs'] += 1
+
+    def _search_root(self, engine, depth):
+        """! Przeszukuje korzeń drzewa gry.
+
+        Ruchy są sprawdzane w kolejności z
+        self._root_moves, a pierwsze ruchy na
+        każdym poziomie są brane z głównego
+        wariantu self._prev_pv. Najlepszy jak
+        dotąd ruch jest zapisywany w
+        self._best_move, żeby można go było
+        użyć po przerwaniu przeszukiwania.
+
+        Po zakończeniu self._root_moves jest
+        posortowane od najlepszego ruchu,
+        a główny wariant jest w self._pv[0].
+
+        @param engine Silnik z pozycją do przeszukania.
+        @param depth Głębokość przeszukiwania.
+
+        @return Krotka (Wybrany ruch, Ocena pozycji)
+        """
+
+        self._pv = [[]]
+        self._follow_pv = bool(self._prev_pv)
+
+        alpha = -INFINITY
+        beta = INFINITY
+        scores = {}
+
+        best_move = None
+        best_score = -INFINITY
+
+        for move in self._root_moves:
+            engine.make_move(move)
+            score = -self._alphabeta(engine, depth - 1,
+                                     -beta, -alpha, 1)[1]
+            engine.unmake_move()
+
+            self._follow_pv = False
+            scores[move] = score
+
+            if (score > best_score):
+                best_move = move
+                best_score = score
+                alpha = score
+
+                self._pv[0] = [move] + self._pv[1]
+                self._best_move = move
+                self._best_score = score
+
+        if (self._tt is not None):
+            self._tt.store(engine.get_hash(), depth, EXACT,
+                           best_score, best_move)
+
+        # Ruchy z gorszą oceną są sprawdzane później.
+        # Ruchy, których nie zdążyliśmy sprawdzić zostają
+        # na końcu.
+        self._root_moves.sort(key=lambda m: scores.get(m, -INFINITY),
+                              reverse=True)
+
+        return (best_move, best_score)
+
+    def _parallel_search_root(self, engine, depth):
+        """! Przeszukuje korzeń drzewa gry w wielu procesach.
+
+        Pierwszy (najlepszy w poprzedniej iteracji)
+        ruch jest sprawdzany w tym procesie, żeby
+        ustalić alfę. Pozostałe ruchy są rozdzielane
+        między procesy robocze.
+
+        Działa tak jak _search_root, ale w przypadku
+        przerwania przeszukiwania najlepszy ruch jest
+        znany dopiero po zakończeniu wszystkich zadań.
+
+        @param engine Silnik z pozycją do przeszukania.
+        @param depth Głębokość przeszukiwania.
+
+        @return Krotka (Wybrany ruch, Ocena pozycji)
+        """
+
+        self._pv = [[]]
+        self._follow_pv = bool(self._prev_pv)
+
+        first = self._root_moves[0]
+        engine.make_move(first)
+        best_score = -self._alphabeta(engine, depth - 1,
+                                      -INFINITY, INFINITY, 1)[1]
+        engine.unmake_move()
+
+        best_move = first
+        self._pv[0] = [first] + self._pv[1]
+        self._best_move = best_move
+        self._best_score = best_score
+        self._follow_pv = False
+
+        scores = {first: best_score}
+        exact = {first}
+
+        control = self._control
+        time_limit = None
+        node_limit = None
+        if (control is not None):
+            if (control.deadline is not None):
+                time_limit = max(0, control.deadline - time.monotonic())
+            if (control.node_limit is not None):
+                # Pozostały limit dzielimy równo między ruchy.
+                node_limit = max(1, (control.node_limit - self.nodes) //
+                                 max(1, len(self._root_moves) - 1))
+
+        results = self._parallel.search(engine.get_position(),
+                                        self._root_moves[1:],
+                                        depth, best_score,
+                                        time_limit, node_limit, control,
+                                        self.nodes)
+
+        # Ocena nie większa od alfy, z którą ruch był
+        # przeszukiwany, to tylko ograniczenie od góry
+        # (fail-soft). Takie ruchy rozpatrujemy dopiero
+        # po ruchach z dokładną oceną.
+        aborted = False
+        bounded = []
+        for move, score, pv, nodes, alpha in results:
+            self.nodes += nodes
+
+            if (score is None):
+                aborted = True
+                continue
+
+            scores[move] = score
+            if (score <= alpha):
+                bounded.append(move)
+                continue
+            exact.add(move)
+
+            if (score > best_score):
+                best_move = move
+                best_score = score
+
+                self._pv[0] = pv
+                self._best_move = move
+                self._best_score = score
+
+        # Ruch z ograniczeniem większym od najlepszej
+        # oceny może być lepszy, więc przeszukujemy go
+        # jeszcze raz z pełnym oknem.
+        for move in bounded:
+            if (scores[move] <= best_score):
+                continue
+
+            engine.make_move(move)
+            score = -self._alphabeta(engine, depth - 1,
+                                     -INFINITY, INFINITY, 1)[1]
+            engine.unmake_move()
+
+            scores[move] = score
+            exact.add(move)
+            if (score > best_score):
+                best_move = move
+                best_score = score
+
+                self._pv[0] = [move] + self._pv[1]
+                self._best_move = move
+                self._best_score = score
+
+        # Przy równych ocenach ruchy z dokładną
+        # oceną są sprawdzane wcześniej.
+        self._root_moves.sort(key=lambda m: (scores.get(m, -INFINITY),
+                                             m in exact),
+                              reverse=True)
+
+        if (aborted):
+            raise SearchAborted()
+
+        if (self._tt is not None):
+            self._tt.store(engine.get_hash(), depth, EXACT,
+                           best_score, best_move)
+
+        return (best_move, best_score)
+
+    def _start_search(self, engine):
+        """! Przygotowuje bota do nowego przeszukiwania.
+
+        @param engine Silnik z pozycją do przeszukania.
+        """
+
+        self.nodes = 0
+        self._root_moves = list(engine.all_moves(engine.moving_player))
+        self._set_dist_tables(engine)
+        self._prev_pv = []
+        self._pv = [[]]
+        self._follow_pv = False
+        self._best_move = None
+
+        self.stats = self._empty_stats()
+        self._killers = []
+
+        # Historia z poprzednich ruchów jest
+        # nadal przydatna, ale mniej ważna.
+        self._history = [h >> 1 for h in self._history]
+
+        # Ruchy w korzeniu zaczynamy od
+        # tych, które najbardziej posuwają
+        # pionek do przodu.
+        plr = engine.moving_player
+        self._root_moves.sort(key=lambda m: self._progress(m, plr),
+                              reverse=True)
+
+        # Ruch z tablicy transpozycji (np. z
+        # poprzedniego przeszukiwania) sprawdzamy
+        # jako pierwszy.
+        if (self._tt is not None):
+            entry = self._tt.probe(engine.get_hash())
+            if (entry is not None and entry[3] in self._root_moves):
+                self._root_moves.remove(entry[3])
+                self._root_moves.insert(0, entry[3])
+
+    def _search(self, engine, depth):
+        """! Szuka najlepszego ruchu na danej głębokości.
+
+        @param engine Silnik z pozycją do przeszukania.
+        @param depth Głębokość przeszukiwania.
+
+        @return Krotka (Wybrany ruch, Ocena pozycji)
+        """
+
+        self._start_search(engine)
+        return self._search_root(engine, depth)
+
+    def _iterative_search(self, engine, max_depth=MAX_DEPTH, control=None):
+        """! Pogłębianie iteracyjne.
+
+        Każda iteracja zaczyna od najlepszych ruchów
+        i głównego wariantu poprzedniej iteracji.
+
+        Jeśli przeszukiwanie zostanie przerwane,
+        wynikiem jest najlepszy ruch przerwanej
+        iteracji (pierwszy sprawdzany ruch to
+        najlepszy ruch poprzedniej iteracji, więc
+        nie może być od niego gorszy). Pozycja
+        na silniku jest wtedy przywracana.
+
+        @param engine Silnik z pozycją do przeszukania.
+        @param max_depth Głębokość ostatniej iteracji.
+        @param control Obiekt klasy SearchControl (opcjonalnie).
+
+        @return Krotka (Wybrany ruch, Ocena pozycji). Ruch
+                jest None, jeśli nie udało się sprawdzić
+                żadnego ruchu.
+        """
+
+        self._start_search(engine)
+        self._control = control
+        self._root_alpha = None
+
+        undo_depth = engine.get_undo_depth()
+        result = (None, -INFINITY)
+
+        try:
+            for depth in range(1, max_depth + 1):
+                self._best_move = None
+                self._best_score = -INFINITY
+
+                if (self._parallel is not None and
+                        len(self._root_moves) > 1):
+                    result = self._parallel_search_root(engine, depth)
+                else:
+                    result = self._search_root(engine, depth)
+                self._prev_pv = self._pv[0]
+        except SearchAborted:
+            if (self._best_move is not None):
+                result = (self._best_move, self._best_score)
+
+            # Cofamy ruchy wykonane przed przerwaniem.
+            while (engine.get_undo_depth() > undo_depth):
+                engine.unmake_move()
+        finally:
+            self._control = None
+
+        return result
+
+    def cancel(self):
+        """! Przerywa trwające przeszukiwanie.
+
+        Można wywołać z innego wątku. Bot wykonuje
+        wtedy najlepszy dotąd znaleziony ruch. Jeśli
+        przeszukiwanie jeszcze się nie zaczęło,
+        wywołanie nic nie robi (żeby przerwać ruch
+        na pewno, można podać własny obiekt
+        SearchControl metodzie make_move).
+        """
+
+        control = self._control
+        if (control is not None):
+            control.cancel()
+
+    def make_move(self, control=None):
+        """! Wykonuje ruch.
+
+        Jeśli pozycja jest w książce otwarć,
+        wykonuje ruch z książki, a jeśli armie
+        się minęły - ruch z planu wyścigu. W
+        przeciwnym razie przeszukuje drzewo gry
+        dopóki nie skończy się czas lub limit węzłów.
+
+        @param control Obiekt klasy SearchControl (domyślnie
+                       tworzony z limitów bota). Wywołując jego
+                       metodę cancel, można przerwać przeszukiwanie
+                       z innego wątku.
+
+        @return Wykonany ruch lub None, jeśli
+                gracz nie ma żadnego ruchu.
+        """
+
+        move = self._book_move()
+        if (move is None):
+            move = self._race_move()
+        if (move is None):
+            if (control is None):
+                control = SearchControl(self.time_limit, self.node_limit)
+            move, score = self._iterative_search(self._engine,
+                                                 control=control)
+
+        if (move is None):
+            if (not self._root_moves):
+                return None
+
+            # Nie zdążyliśmy nic sprawdzić.
+            move = self._root_moves[0]
+
+        self._engine.make_move(move)
+        return move_to_fields(move)
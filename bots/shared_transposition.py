@@ -0,0 +1,250 @@
+# Tablica transpozycji we współdzielonej
+# pamięci (multiprocessing.shared_memory).
+#
+# Z tej samej tablicy może korzystać wiele
+# procesów jednocześnie, np. procesy robocze
+# klasy bots.parallel.ParallelRootSearch.
+# Ma taki sam interfejs jak tablica z
+# modułu bots.transposition.
+#
+# Każdy wpis to dwie 64-bitowe liczby: dane
+# (głębokość, rodzaj, ocena, ruch, proces,
+# który zapisał wpis) i klucz XOR dane. Zapis
+# nie jest chroniony blokadą - jeśli dwa procesy
+# zapiszą to samo miejsce jednocześnie, wpis
+# nie przejdzie sprawdzenia przy odczycie i
+# zostanie potraktowany jak brak wpisu.
+#
+# Autor: Antoni Przybylik
+
+from multiprocessing import shared_memory
+
+import os
+
+# Rozmiar jednego wpisu w bajtach.
+ENTRY_SIZE = 16
+
+# Układ bitów w danych wpisu.
+_MOVE_BITS = 17   # Ruch (16 bitów) i bit obecności ruchu.
+_SCORE_BITS = 24  # Ocena przesunięta o _SCORE_OFFSET.
+_DEPTH_BITS = 7
+_BOUND_BITS = 2
+_WRITER_BITS = 14
+
+_SCORE_SHIFT = _MOVE_BITS
+_DEPTH_SHIFT = _SCORE_SHIFT + _SCORE_BITS
+_BOUND_SHIFT = _DEPTH_SHIFT + _DEPTH_BITS
+_WRITER_SHIFT = _BOUND_SHIFT + _BOUND_BITS
+
+_SCORE_OFFSET = 1 << (_SCORE_BITS - 1)
+_MAX_DEPTH = (1 << _DEPTH_BITS) - 1
+_BOUND_MASK = (1 << _BOUND_BITS) - 1
+
+_KEY_MASK = (1 << 64) - 1
+
+
+class SharedTranspositionTable:
+    """! Tablica transpozycji we współdzielonej pamięci. """
+
+    def __init__(self, size_mb=16, name=None):
+        """! Konstruktor klasy SharedTranspositionTable.
+
+        Jeśli name jest None, tworzy nowy blok
+        pamięci, w przeciwnym razie dołącza do
+        istniejącego (patrz też metoda attach).
+
+        @param size_mb Rozmiar tablicy w MB (przy tworzeniu).
+        @param name Nazwa istniejącego bloku pamięci.
+        """
+
+        if (name is None):
+            if (size_mb <= 0):
+                raise ValueError('Invalid size.')
+
+            # Liczba kubełków (po dwa wpisy)
+            # jest potęgą dwójki.
+            buckets = 1
+            while (buckets * 4 * ENTRY_SIZE <= size_mb * 2**20):
+                buckets *= 2
+
+            self._shm = shared_memory.SharedMemory(
+                    create=True, size=buckets * 2 * ENTRY_SIZE)
+            self._owner = True
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self._owner = False
+
+        self._table = self._shm.buf.cast('Q')
+        if (not self._owner):
+            buckets = len(self._table) // 4
+
+        self._mask = buckets - 1
+        self._writer = os.getpid() & ((1 << _WRITER_BITS) - 1)
+
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+        self.cross_hits = 0
+
+    @staticmethod
+    def attach(name):
+        """! Dołącza do tablicy utworzonej w innym procesie.
+
+        @param name Nazwa bloku pamięci (atrybut name tablicy).
+
+        @return Obiekt klasy SharedTranspositionTable.
+        """
+        return SharedTranspositionTable(name=name)
+
+    @property
+    def name(self):
+        """! Nazwa bloku współdzielonej pamięci. """
+        return self._shm.name
+
+    def __len__(self):
+        """! Liczba miejsc w tablicy. """
+        return len(self._table) // 2
+
+    def close(self):
+        """! Odłącza tablicę od tego procesu.
+
+        Proces, który utworzył tablicę, usuwa
+        też blok pamięci.
+        """
+
+        self._table.release()
+        self._shm.close()
+        if (self._owner):
+            self._shm.unlink()
+
+    def clear(self):
+        """! Usuwa wszystkie wpisy i zeruje liczniki. """
+
+        table = self._table
+        for i in range(len(table)):
+            table[i] = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+        self.cross_hits = 0
+
+    def _read(self, slot, key):
+        """! Odczytuje wpis, jeśli jest poprawny i pasuje do klucza.
+
+        @param slot Numer miejsca.
+        @param key Hasz pozycji.
+
+        @return Dane wpisu lub None.
+        """
+
+        data = self._table[2 * slot + 1]
+        if (data and self._table[2 * slot] ^ data == key):
+            return data
+        return None
+
+    def probe(self, key):
+        """! Szuka wpisu dla pozycji.
+
+        @param key Hasz pozycji.
+
+        @return Krotka (głębokość, rodzaj, ocena, ruch)
+                lub None, jeśli pozycji nie ma w tablicy.
+        """
+
+        key &= _KEY_MASK
+        slot = (key & self._mask) << 1
+
+        data = self._read(slot, key)
+        if (data is None):
+            data = self._read(slot + 1, key)
+
+        if (data is None):
+            table = self._table
+            if (table[2 * slot + 1] or table[2 * slot + 3]):
+                # Kubełek jest zajęty przez inne pozycje.
+                self.collisions += 1
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if (data >> _WRITER_SHIFT != self._writer):
+            self.cross_hits += 1
+
+        move = data & 0xffff if data & 0x10000 else None
+        score = ((data >> _SCORE_SHIFT) & ((1 << _SCORE_BITS) - 1)) - \
+            _SCORE_OFFSET
+        depth = (data >> _DEPTH_SHIFT) & _MAX_DEPTH
+        bound = (data >> _BOUND_SHIFT) & _BOUND_MASK
+
+        return (depth, bound, score, move)
+
+    def store(self, key, depth, bound, score, move):
+        """! Zapisuje wynik przeszukiwania pozycji.
+
+        Oceny, które nie mieszczą się w polu
+        wpisu, nie są zapisywane.
+
+        @param key Hasz pozycji.
+        @param depth Głębokość przeszukiwania.
+        @param bound Rodzaj oceny (EXACT, LOWER, UPPER).
+        @param score Ocena.
+        @param move Najlepszy znaleziony ruch (lub None).
+        """
+
+        if (not -_SCORE_OFFSET <= score < _SCORE_OFFSET):
+            return
+
+        key &= _KEY_MASK
+        slot = (key & self._mask) << 1
+        table = self._table
+
+        data = ((self._writer << _WRITER_SHIFT) |
+                (bound << _BOUND_SHIFT) |
+                (min(depth, _MAX_DEPTH) << _DEPTH_SHIFT) |
+                ((score + _SCORE_OFFSET) << _SCORE_SHIFT))
+        if (move is not None):
+            data |= 0x10000 | move
+
+        self.stores += 1
+
+        deep_data = table[2 * slot + 1]
+        deep_key = table[2 * slot] ^ deep_data
+        deep_depth = (deep_data >> _DEPTH_SHIFT) & _MAX_DEPTH
+
+        if (not deep_data or deep_key == key or depth >= deep_depth):
+            # Wpis z płytszego przeszukiwania
+            # przesuwamy na miejsce zawsze zastępowane.
+            if (deep_data and deep_key != key):
+                table[2 * slot + 3] = deep_data
+                table[2 * slot + 2] = deep_key ^ deep_data
+            table[2 * slot + 1] = data
+            table[2 * slot] = key ^ data
+        else:
+            table[2 * slot + 3] = data
+            table[2 * slot + 2] = key ^ data
+
+    def fill_rate(self):
+        """! Zwraca część zajętych miejsc w tablicy.
+
+        @return Liczba z przedziału [0, 1].
+        """
+
+        used = sum(1 for data in self._table[1::2] if data)
+        return used / len(self)
+
+    def stats(self):
+        """! Zwraca statystyki tablicy z tego procesu.
+
+        @return Słownik z licznikami.
+        """
+
+        return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'collisions': self.collisions,
+                'stores': self.stores,
+                'cross_hits': self.cross_hits,
+        }
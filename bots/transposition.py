@@ -0,0 +1,138 @@
+# Tablica transpozycji dla botów
+# przeszukujących drzewo gry.
+#
+# Tablica zapamiętuje wyniki przeszukiwania
+# pozycji (kluczem jest hasz Zobrista), żeby
+# pozycja osiągnięta różnymi kolejnościami
+# ruchów nie była przeszukiwana ponownie.
+#
+# Tablica składa się z kubełków po dwa
+# miejsca. Do pierwszego trafia wpis z
+# najgłębszego przeszukiwania, do drugiego
+# zawsze ostatnio zapisany wpis.
+#
+# Autor: Antoni Przybylik
+
+# Rodzaje ocen zapisanych w tablicy.
+EXACT = 0  # Dokładna ocena.
+LOWER = 1  # Ograniczenie od dołu (nastąpiło odcięcie).
+UPPER = 2  # Ograniczenie od góry (żaden ruch nie poprawił alfy).
+
+# Przybliżony rozmiar jednego wpisu
+# w bajtach (krotka i liczby w niej).
+ENTRY_SIZE = 128
+
+
+class TranspositionTable:
+    """! Tablica transpozycji o ograniczonym rozmiarze. """
+
+    def __init__(self, size_mb=16):
+        """! Konstruktor klasy TranspositionTable.
+
+        @param size_mb Maksymalny rozmiar tablicy w MB.
+        """
+
+        if (size_mb <= 0):
+            raise ValueError('Invalid size.')
+
+        # Liczba kubełków jest potęgą dwójki,
+        # żeby indeks liczyć maską.
+        buckets = 1
+        while (buckets * 4 * ENTRY_SIZE <= size_mb * 2**20):
+            buckets *= 2
+
+        self._mask = buckets - 1
+
+        # Wpisy (klucz, głębokość, rodzaj, ocena, ruch).
+        # Kubełek i zajmuje miejsca 2*i i 2*i + 1.
+        self._entries = [None] * (2 * buckets)
+
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def __len__(self):
+        """! Liczba miejsc w tablicy. """
+        return len(self._entries)
+
+    def clear(self):
+        """! Usuwa wszystkie wpisy i zeruje liczniki. """
+        self._entries = [None] * len(self._entries)
+
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def probe(self, key):
+        """! Szuka wpisu dla pozycji.
+
+        @param key Hasz pozycji.
+
+        @return Krotka (głębokość, rodzaj, ocena, ruch)
+                lub None, jeśli pozycji nie ma w tablicy.
+        """
+
+        slot = (key & self._mask) << 1
+        entries = self._entries
+
+        for entry in (entries[slot], entries[slot + 1]):
+            if (entry is not None and entry[0] == key):
+                self.hits += 1
+                return entry[1:]
+
+        if (entries[slot] is not None or entries[slot + 1] is not None):
+            # Kubełek jest zajęty przez inne pozycje.
+            self.collisions += 1
+        self.misses += 1
+
+        return None
+
+    def store(self, key, depth, bound, score, move):
+        """! Zapisuje wynik przeszukiwania pozycji.
+
+        @param key Hasz pozycji.
+        @param depth Głębokość przeszukiwania.
+        @param bound Rodzaj oceny (EXACT, LOWER, UPPER).
+        @param score Ocena.
+        @param move Najlepszy znaleziony ruch (lub None).
+        """
+
+        slot = (key & self._mask) << 1
+        entries = self._entries
+        entry = (key, depth, bound, score, move)
+
+        self.stores += 1
+
+        deep = entries[slot]
+        if (deep is None or deep[0] == key or depth >= deep[1]):
+            # Wpis z płytszego przeszukiwania
+            # przesuwamy na miejsce zawsze zastępowane.
+            if (deep is not None and deep[0] != key):
+                entries[slot + 1] = deep
+            entries[slot] = entry
+        else:
+            entries[slot + 1] = entry
+
+    def fill_rate(self):
+        """! Zwraca część zajętych miejsc w tablicy.
+
+        @return Liczba z przedziału [0, 1].
+        """
+
+        used = sum(1 for entry in self._entries if entry is not None)
+        return used / len(self._entries)
+
+    def stats(self):
+        """! Zwraca statystyki tablicy.
+
+        @return Słownik z licznikami.
+        """
+
+        return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'collisions': self.collisions,
+                'stores': self.stores,
+        }
@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+
+# Narzędzie budujące książkę otwarć z partii,
+# które bot rozgrywa sam ze sobą (patrz
+# bots/book.py). Zbudowaną książkę można
+# przekazać skryptowi halma-tui.py.
+#
+# Autor: Antoni Przybylik
+
+from bots.book import build_book
+from bots.book import write_book
+from bots.book import OpeningBook
+from bots.book import RECORD
+from bots.book import MAGIC
+
+from bots.minimax_bot import MinimaxBot
+from bots.agressive_minimax_bot import AgressiveMinimaxBot
+
+import argparse
+import sys
+
+BOTS = {
+        'minimax': MinimaxBot,
+        'agressive': AgressiveMinimaxBot,
+}
+
+
+def read_entries(filename):
+    """! Wczytuje rekordy istniejącej książki.
+
+    @param filename Nazwa pliku książki.
+
+    @return Słownik {(hasz pozycji, ruch): waga}.
+    """
+
+    book = OpeningBook(filename)
+    try:
+        entries = {(key, move): weight
+                   for key, move, weight in book.records()}
+    finally:
+        book.close()
+
+    return entries
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+            description='Builds an opening book from self-play games.')
+    parser.add_argument('output', help='book file')
+    parser.add_argument('--bot', choices=BOTS.keys(), default='agressive')
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--plies', type=int, default=12)
+    parser.add_argument('--time', type=float, default=5,
+                        help='seconds per move')
+    parser.add_argument('--nodes', type=int, default=None,
+                        help='node limit per move')
+    parser.add_argument('--noise', type=float, default=0.2,
+                        help='probability of playing a non-best move')
+    parser.add_argument('--width', type=int, default=4,
+                        help='number of best moves to choose from')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--append', action='store_true',
+                        help='add to an existing book')
+    args = parser.parse_args()
+
+    entries = None
+    if (args.append):
+        try:
+            entries = read_entries(args.output)
+        except (EnvironmentError, ValueError):
+            sys.exit('Cannot read opening book.')
+
+    bot_class = BOTS[args.bot]
+    entries = build_book(lambda plr, engine: bot_class(plr, engine),
+                         args.games, args.plies, args.noise, args.width,
+                         args.time, args.nodes, args.seed, entries)
+
+    write_book(args.output, entries)
+    print(f'{len(entries)} records, '
+          f'{len(MAGIC) + len(entries) * RECORD.size} bytes.')
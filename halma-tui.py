@@ -4,11 +4,22 @@ from ui.tui import HalmaTui
 from ui.tui_generic import TerminalNotSupportedError
 from ui.tui_generic import WindowTooSmallError
 
+from bots.book import OpeningBook
+
 import sys
 
 
 if __name__ == "__main__":
-    tui = HalmaTui()
+    # Opcjonalny argument: plik z książką
+    # otwarć (patrz halma-book.py).
+    book = None
+    if (len(sys.argv) > 1):
+        try:
+            book = OpeningBook(sys.argv[1])
+        except (EnvironmentError, ValueError):
+            sys.exit('Cannot read opening book.')
+
+    tui = HalmaTui(book)
 
     try:
         tui.exec()
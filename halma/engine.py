@@ -7,6 +7,29 @@
 from halma.defs import STATE
 from halma.defs import PLAYER
 
+from halma.geometry import index
+from halma.geometry import field
+from halma.geometry import BIT
+from halma.geometry import CAMP_SIZE
+from halma.geometry import BLACK_CAMP_MASK
+from halma.geometry import WHITE_CAMP_MASK
+from halma.geometry import DIST_TO_BLACK_CORNER
+from halma.geometry import DIST_TO_WHITE_CORNER
+from halma.geometry import iter_bits
+from halma.geometry import disengaged
+
+from halma.movegen import targets
+from halma.movegen import side_moves
+from halma.movegen import staged_moves
+from halma.movegen import is_legal
+
+from halma.position import Position
+
+from halma.zobrist import WHITE_KEYS
+from halma.zobrist import BLACK_KEYS
+from halma.zobrist import SIDE_KEY
+from halma.zobrist import compute_hash
+
 from random import randint
 
 
@@ -18,17 +41,309 @@ class ModeError(Exception):
 
 
 class Engine:
-    """! Reprezentuje silnik gry Halma. """
+    """! Reprezentuje silnik gry Halma.
+
+    Pozycja jest przechowywana jako dwa
+    bitboardy (po jednym dla każdego gracza),
+    patrz moduł halma.geometry.
+
+    Razem z pozycją silnik przyrostowo liczy
+    listy pól z pionkami każdego gracza oraz
+    składniki oceny pozycji: sumę odległości
+    pionków każdego gracza od celu, liczbę
+    pionków w obozie docelowym i liczbę pionków,
+    które nie wyszły jeszcze z własnego obozu.
+    """
 
-    def __init__(self):
-        """! Konstruktor klasy Engine. """
-        self._board = [[STATE.EMPTY]*16 for i in range(16)]
+    def __init__(self, debug=False):
+        """! Konstruktor klasy Engine.
+
+        @param debug Czy po każdym ruchu sprawdzać składniki
+                     oceny, licząc je od nowa (wolne).
+        """
+        self._white = 0  # Bitboard białych pionków.
+        self._black = 0  # Bitboard czarnych pionków.
+        self._hash = 0  # Hasz Zobrista pozycji.
+
+        self.debug = debug
+
+        # Listy indeksów pól z pionkami każdego
+        # gracza i numer pozycji pionka na liście
+        # dla każdego pola (patrz metoda pieces).
+        self._white_pieces = []
+        self._black_pieces = []
+        self._slot = [0] * 256
+
+        # Tablice odległości pól od celu
+        # białego i czarnego (patrz set_dist_tables).
+        self._white_table = DIST_TO_BLACK_CORNER
+        self._black_table = DIST_TO_WHITE_CORNER
+
+        # Składniki oceny pozycji.
+        self._white_dist = 0
+        self._black_dist = 0
+        self._white_target = 0
+        self._black_target = 0
+        self._white_home = 0
+        self._black_home = 0
+
+        # Ostatnio wygenerowane ruchy każdego gracza
+        # razem z pozycją, dla której są aktualne.
+        self._all_moves_cache = {}
+
+        # Stos rekordów pozwalających cofnąć
+        # ruchy wykonane metodą make_move.
+        self._undo = []
 
         self.supported_modes = ['classic', 'random']
 
         self.mode = None
         self.move = 1  # Obecny ruch.
-        self.moving_player = PLAYER.WHITE  # Teraz ruszający się gracz.
+        self._moving_player = PLAYER.WHITE  # Teraz ruszający się gracz.
+
+    @property
+    def moving_player(self):
+        """! Gracz, który ma teraz ruch. """
+        return self._moving_player
+
+    @moving_player.setter
+    def moving_player(self, plr):
+        """! Ustawia gracza, który ma ruch.
+
+        Aktualizuje hasz pozycji.
+
+        @param plr Gracz (biały/czarny).
+        """
+        if (plr != self._moving_player):
+            self._hash ^= SIDE_KEY
+        self._moving_player = plr
+
+    def get_hash(self):
+        """! Zwraca hasz Zobrista obecnej pozycji.
+
+        Hasz uwzględnia pionki na planszy
+        i gracza, który ma ruch.
+
+        @return 64-bitowy hasz pozycji.
+        """
+        return self._hash
+
+    def _rehash(self):
+        """! Liczy hasz pozycji od nowa. """
+        self._hash = compute_hash(self._white, self._black,
+                                  self._moving_player == PLAYER.BLACK)
+
+    def _compute_terms(self):
+        """! Liczy składniki oceny pozycji od nowa.
+
+        @return Krotka (suma odległości białego, suma odległości
+                czarnego, białe w obozie docelowym, czarne w obozie
+                docelowym, białe w swoim obozie, czarne w swoim
+                obozie).
+        """
+
+        white = self._white
+        black = self._black
+        white_table = self._white_table
+        black_table = self._black_table
+
+        return (sum(white_table[i] for i in iter_bits(white)),
+                sum(black_table[i] for i in iter_bits(black)),
+                (white & BLACK_CAMP_MASK).bit_count(),
+                (black & WHITE_CAMP_MASK).bit_count(),
+                (white & WHITE_CAMP_MASK).bit_count(),
+                (black & BLACK_CAMP_MASK).bit_count())
+
+    def _reset_terms(self):
+        """! Ustawia składniki oceny liczone od nowa. """
+        (self._white_dist, self._black_dist,
+         self._white_target, self._black_target,
+         self._white_home, self._black_home) = self._compute_terms()
+
+    def _reset_pieces(self):
+        """! Buduje listy pionków z bitboardów. """
+
+        self._white_pieces = list(iter_bits(self._white))
+        self._black_pieces = list(iter_bits(self._black))
+
+        slot = self._slot
+        for pieces in (self._white_pieces, self._black_pieces):
+            for k, i in enumerate(pieces):
+                slot[i] = k
+
+    def pieces(self, plr):
+        """! Zwraca pola z pionkami gracza.
+
+        Lista jest aktualizowana przy każdym ruchu,
+        więc nie trzeba szukać pionków na planszy.
+        Kolejność pól jest dowolna. Listy nie wolno
+        modyfikować.
+
+        @param plr Gracz (biały/czarny).
+
+        @return Lista indeksów pól.
+        """
+
+        if (plr == PLAYER.WHITE):
+            return self._white_pieces
+        return self._black_pieces
+
+    def camp_empty(self, plr):
+        """! Zwraca liczbę wolnych pól w obozie gracza.
+
+        Liczona ze składników oceny, bez
+        przeglądania obozu.
+
+        @param plr Gracz (biały/czarny).
+
+        @return Liczba wolnych pól.
+        """
+
+        if (plr == PLAYER.WHITE):
+            return CAMP_SIZE - self._white_home - self._black_target
+        return CAMP_SIZE - self._black_home - self._white_target
+
+    def get_winner(self):
+        """! Sprawdza, czy jest koniec gry.
+
+        Gra kończy się gdy w obozie są wszystkie
+        pola zajęte i jest tam co najmniej jeden
+        kamień przeciwnika. Liczniki pionków w
+        obozach są aktualizowane przy każdym ruchu,
+        więc sprawdzenie zajmuje stały czas.
+
+        @return Zwycięzca lub None.
+        """
+
+        # Sprawdzamy obóz Czarnego.
+        if (self._white_target and
+                self._white_target + self._black_home == CAMP_SIZE):
+            return PLAYER.WHITE
+
+        # Sprawdzamy obóz Białego.
+        if (self._black_target and
+                self._black_target + self._white_home == CAMP_SIZE):
+            return PLAYER.BLACK
+
+        return None
+
+    def is_terminal(self):
+        """! Sprawdza, czy gra się skończyła.
+
+        @return Czy któryś gracz wygrał.
+        """
+        return self.get_winner() is not None
+
+    def _get_terms(self):
+        """! Zwraca składniki oceny liczone przyrostowo.
+
+        @return Krotka w tej samej postaci co w _compute_terms.
+        """
+        return (self._white_dist, self._black_dist,
+                self._white_target, self._black_target,
+                self._white_home, self._black_home)
+
+    def _check_terms(self):
+        """! Porównuje składniki oceny z liczonymi od nowa.
+
+        Używane w trybie debug.
+        """
+        if (self._get_terms() != self._compute_terms()):
+            raise AssertionError('Evaluation terms out of sync.')
+
+        if (sorted(self._white_pieces) != list(iter_bits(self._white)) or
+                sorted(self._black_pieces) != list(iter_bits(self._black))):
+            raise AssertionError('Piece lists out of sync.')
+
+    def _move_piece(self, is_white, src, dst):
+        """! Aktualizuje listy pionków i składniki oceny po ruchu.
+
+        @param is_white Czy przestawiany pionek jest biały.
+        @param src Indeks pola, z którego pionek zdejmujemy.
+        @param dst Indeks pola, na które pionek stawiamy.
+        """
+
+        slot = self._slot
+        slot[dst] = k = slot[src]
+
+        if (is_white):
+            self._white_pieces[k] = dst
+
+            table = self._white_table
+            self._white_dist += table[dst] - table[src]
+            self._white_target += ((BLACK_CAMP_MASK >> dst & 1) -
+                                   (BLACK_CAMP_MASK >> src & 1))
+            self._white_home += ((WHITE_CAMP_MASK >> dst & 1) -
+                                 (WHITE_CAMP_MASK >> src & 1))
+        else:
+            self._black_pieces[k] = dst
+
+            table = self._black_table
+            self._black_dist += table[dst] - table[src]
+            self._black_target += ((WHITE_CAMP_MASK >> dst & 1) -
+                                   (WHITE_CAMP_MASK >> src & 1))
+            self._black_home += ((BLACK_CAMP_MASK >> dst & 1) -
+                                 (BLACK_CAMP_MASK >> src & 1))
+
+    def set_dist_tables(self, white=None, black=None):
+        """! Ustawia tablice odległości pól od celu.
+
+        Suma odległości (metoda dist_sum) jest
+        liczona według tych tablic.
+
+        @param white Odległości od celu białego
+                     (None - DIST_TO_BLACK_CORNER).
+        @param black Odległości od celu czarnego
+                     (None - DIST_TO_WHITE_CORNER).
+        """
+
+        if (white is None):
+            white = DIST_TO_BLACK_CORNER
+        if (black is None):
+            black = DIST_TO_WHITE_CORNER
+
+        if (white is self._white_table and black is self._black_table):
+            return
+
+        self._white_table = white
+        self._black_table = black
+        self._reset_terms()
+
+    def dist_sum(self, plr):
+        """! Zwraca sumę odległości pionków gracza od celu.
+
+        @param plr Gracz (biały/czarny).
+
+        @return Suma odległości (patrz set_dist_tables).
+        """
+
+        if (plr == PLAYER.WHITE):
+            return self._white_dist
+        return self._black_dist
+
+    def pieces_in_target(self, plr):
+        """! Zwraca liczbę pionków gracza w obozie przeciwnika.
+
+        @param plr Gracz (biały/czarny).
+
+        @return Liczba pionków.
+        """
+
+        if (plr == PLAYER.WHITE):
+            return self._white_target
+        return self._black_target
+
+    def stragglers(self, plr):
+        """! Zwraca liczbę pionków gracza we własnym obozie.
+
+        @param plr Gracz (biały/czarny).
+
+        @return Liczba pionków.
+        """
+
+        if (plr == PLAYER.WHITE):
+            return self._white_home
+        return self._black_home
 
     def setup(self, mode):
         """! Ustawia grę.
@@ -45,12 +360,15 @@ class Engine:
             raise ModeError(mode)
 
         self.mode = mode
+        self._undo = []
         if (mode == 'classic'):
             self._classic_mode_setup()
-            return
         if (mode == 'random'):
             self._random_mode_setup()
-            return
+
+        self._rehash()
+        self._reset_terms()
+        self._reset_pieces()
 
     def _classic_mode_setup(self):
         """! Funkcja pomocnicza metody setup.
@@ -58,15 +376,10 @@ class Engine:
         Ustawia grę w trybie klasycznym.
         """
 
-        # Ustawiamy obóz Czarnego.
-        for i in range(0, 5):
-            for j in range(0, [5, 5, 4, 3, 2][i]):
-                self._board[i][j] = STATE.BLACK
-
-        # Ustawiamy obóz Białego.
-        for i in range(0, 5):
-            for j in range(0, [5, 5, 4, 3, 2][i]):
-                self._board[15 - i][15 - j] = STATE.WHITE
+        # Czarny zajmuje swój obóz,
+        # a Biały swój.
+        self._black = BLACK_CAMP_MASK
+        self._white = WHITE_CAMP_MASK
 
     def _random_mode_setup(self):
         """! Funkcja pomocnicza metody setup.
@@ -82,10 +395,10 @@ class Engine:
                 i = randint(0, 15)
                 j = randint(0, 15)
 
-                if (self._board[i][j] == STATE.EMPTY):
+                if (not (self._white | self._black) >> index(i, j) & 1):
                     break
 
-            self._board[i][j] = STATE.BLACK
+            self._black |= 1 << index(i, j)
 
         # Ustawiamy białe pionki.
         for k in range(0, 19):
@@ -95,25 +408,37 @@ class Engine:
                 i = randint(0, 15)
                 j = randint(0, 15)
 
-                if (self._board[i][j] == STATE.EMPTY):
+                if (not (self._white | self._black) >> index(i, j) & 1):
                     break
 
-            self._board[i][j] = STATE.WHITE
+            self._white |= 1 << index(i, j)
 
-    def moves(self, y, x):
+    def moves(self, y, x, with_paths=False):
         """! Znajduje wszystkie pola na które można wykonać ruch.
 
+        Każde pole docelowe występuje w wyniku
+        dokładnie raz, niezależnie od tego iloma
+        ciągami skoków da się na nie dotrzeć.
+
         @param y Współrzędna Y pola.
         @param x Współrzędna X pola.
+        @param with_paths Czy zwrócić też drogę do każdego pola.
 
         @return Lista pól na które można wykonać ruch z danego pola.
+                Jeśli with_paths jest prawdą, lista krotek
+                (pole, droga), gdzie droga to lista kolejnych
+                pól od pola startowego do docelowego (najkrótsza
+                pod względem liczby skoków).
         """
         if (type(y) != int):
             raise TypeError('Invalid coordinates')
         if (type(x) != int):
             raise TypeError('Invalid coordinates')
 
-        return self._moves(y, x)
+        if (not self._pos_on_board(y, x)):
+            raise ValueError('No such a field.')
+
+        return self._moves(y, x, with_paths)
 
     def _pos_on_board(self, y, x):
         """! Sprawdza, czy pole jest na planszy.
@@ -129,79 +454,317 @@ class Engine:
             return False
         return True
 
-    def _pos_permitted(self, y, x, forbidden):
-        """! Sprawdza, czy pole jest na liście pól zakazanych.
+    def _moves(self, y, x, with_paths=False):
+        """! Funkcja pomocnicza metody moves.
 
         @param y Współrzędna Y pola.
         @param x Współrzędna X pola.
-        @param forbidden Lista pól zakazanych.
+        @param with_paths Czy zwrócić też drogi.
 
-        @return Czy pole jest na liście pól zakazanych.
+        @return Pola na które można się ruszyć.
         """
-        if ((y, x) in forbidden):
-            return False
-        return True
+        start = index(y, x)
 
-    def _validate_pos(self, y, x, forbidden):
-        """! Sprawdza, czy wolno się ruszyć na dane pole.
+        # Ruszający się pionek zdejmujemy
+        # z planszy, nie da się nad nim skoczyć.
+        occupied = (self._white | self._black) & ~BIT[start]
 
-        @param y Współrzędna Y pola.
-        @param x Współrzędna X pola.
-        @param visited Lista pól zakazanych.
+        steps, jumps, parent = targets(start, occupied, with_paths)
+
+        if (not with_paths):
+            return [field(i) for i in steps] + [field(i) for i in jumps]
+
+        result = [(field(i), [(y, x), field(i)]) for i in steps]
+        for i in jumps:
+            path = []
+            while (i is not None):
+                path.append(field(i))
+                i = parent[i]
+            path.reverse()
+            result.append((path[-1], path))
+
+        return result
+
+    def all_moves(self, plr):
+        """! Znajduje wszystkie ruchy gracza.
 
-        @return Czy wolno się ruszyć na dane pole.
+        Wynik jest zapamiętywany do czasu
+        zmiany pozycji.
+
+        @param plr Gracz (biały/czarny).
+
+        @return Krotka ruchów zakodowanych funkcją
+                halma.geometry.encode_move.
         """
-        if (self._pos_on_board(y, x) and
-            self._pos_permitted(y, x, forbidden)):  # noqa: E129
-            return True
-        return False
 
-    def _moves(self, y, x, visited=[]):
-        """! Funkcja pomocnicza metody moves.
+        white = self._white
+        black = self._black
 
-        @param y Współrzędna Y pola.
-        @param x Współrzędna X pola.
-        @param visited Odwiedzone pola.
+        cached = self._all_moves_cache.get(plr, None)
+        if (cached is not None and
+                cached[0] == white and cached[1] == black):
+            return cached[2]
 
-        @return Pola na które można się ruszyć.
+        if (plr == PLAYER.WHITE):
+            result = side_moves(white, white | black, self._white_pieces)
+        else:
+            result = side_moves(black, white | black, self._black_pieces)
+
+        result = tuple(result)
+        self._all_moves_cache[plr] = (white, black, result)
+        return result
+
+    def is_legal(self, move):
+        """! Sprawdza, czy gracz, który ma ruch, może go wykonać.
+
+        Nie generuje wszystkich ruchów, patrz
+        halma.movegen.is_legal.
+
+        @param move Zakodowany ruch.
+
+        @return Czy ruch jest poprawny.
         """
-        delta_y = [-1, 0, 1, 1,  1,  0, -1, -1]
-        delta_x = [ 1, 1, 1, 0, -1, -1, -1,  0]  # noqa: E201
 
-        possible = []
+        if (self._moving_player == PLAYER.WHITE):
+            mine = self._white
+        else:
+            mine = self._black
 
-        for dy, dx in zip(delta_y, delta_x):
-            if (self._validate_pos(y+dy, x+dx, visited) and
-                self._board[y+dy][x+dx] == STATE.EMPTY):    # noqa E129
+        return is_legal(move, mine, self._white | self._black)
 
-                if (len(visited) == 0):
-                    possible.append((y+dy, x+dx))
+    def staged_moves(self, first=(), order=None):
+        """! Generuje ruchy gracza, który ma ruch, etapami.
 
-            elif (self._validate_pos(y+2*dy, x+2*dx, visited) and
-                  self._board[y+2*dy][x+2*dx] == STATE.EMPTY):
+        Patrz halma.movegen.staged_moves. Bez funkcji
+        order skoki są sortowane według tablic
+        odległości silnika (patrz set_dist_tables).
+        Ruchy są liczone dla pozycji z chwili
+        wywołania, więc między kolejnymi ruchami
+        można wykonywać i cofać ruchy.
 
-                possible.append((y+2*dy, x+2*dx))
+        @param first Ruchy, które mają być pierwsze
+                     (np. z tablicy transpozycji).
+        @param order Funkcja ustalająca kolejność
+                     ruchów w etapie (opcjonalnie).
 
-                # Unikamy kopiowania tablicy.
-                # Dodajemy tylko do niej obecną
-                # pozycję, a następnie ją usuwamy.
-                visited.append((y, x))
-                possible += self._moves(y+2*dy, x+2*dx, visited)
-                visited.pop()
+        @return Generator zakodowanych ruchów.
+        """
+
+        occupied = self._white | self._black
+        if (self._moving_player == PLAYER.WHITE):
+            return staged_moves(self._white, occupied, self._white_table,
+                                first, list(self._white_pieces), order)
+        return staged_moves(self._black, occupied, self._black_table,
+                            first, list(self._black_pieces), order)
+
+    def make_move(self, move):
+        """! Wykonuje ruch.
+
+        Przestawia pionek, zmienia gracza, który ma
+        ruch (i numer ruchu) oraz aktualizuje hasz.
+        Na stos cofania trafia rekord, który pozwala
+        odwrócić ruch metodą unmake_move.
+
+        Metoda nie sprawdza, czy ruch jest zgodny
+        z zasadami gry, tylko czy pole startowe
+        jest zajęte a docelowe puste.
+
+        @param move Ruch zakodowany funkcją
+                    halma.geometry.encode_move.
+        """
+
+        src = move >> 8
+        dst = move & 255
+        src_bit = BIT[src]
+        dst_bit = BIT[dst]
+
+        if (self._white & dst_bit or self._black & dst_bit):
+            raise ValueError('Invalid move.')
+
+        self._undo.append((move, self._moving_player,
+                           self.move, self._hash))
+
+        if (self._white & src_bit):
+            self._white ^= src_bit | dst_bit
+            self._hash ^= WHITE_KEYS[src] ^ WHITE_KEYS[dst]
+            self._move_piece(True, src, dst)
+        elif (self._black & src_bit):
+            self._black ^= src_bit | dst_bit
+            self._hash ^= BLACK_KEYS[src] ^ BLACK_KEYS[dst]
+            self._move_piece(False, src, dst)
+        else:
+            self._undo.pop()
+            raise ValueError('Invalid move.')
+
+        self._hash ^= SIDE_KEY
+        if (self._moving_player == PLAYER.WHITE):
+            # Jeżeli teraz ruszał się biały, to
+            # teraz jest kolej na czarnego.
+            self._moving_player = PLAYER.BLACK
+        else:
+            # Jeżeli w danym ruchu ruszył się czarny,
+            # przechodzimy do następnego ruchu.
+            self._moving_player = PLAYER.WHITE
+            self.move += 1
+
+        if (self.debug):
+            self._check_terms()
+
+    def unmake_move(self):
+        """! Cofa ostatni ruch wykonany metodą make_move.
+
+        Zakłada, że od tego czasu pozycja nie
+        była zmieniana w inny sposób.
+
+        @return Cofnięty ruch.
+        """
+
+        move, self._moving_player, self.move, self._hash = self._undo.pop()
+
+        src = move >> 8
+        dst = move & 255
+        src_bit = BIT[src]
+        dst_bit = BIT[dst]
+
+        if (self._white & dst_bit):
+            self._white ^= src_bit | dst_bit
+            self._move_piece(True, dst, src)
+        else:
+            self._black ^= src_bit | dst_bit
+            self._move_piece(False, dst, src)
+
+        if (self.debug):
+            self._check_terms()
+
+        return move
+
+    def get_undo_depth(self):
+        """! Zwraca liczbę ruchów, które można cofnąć.
+
+        @return Wysokość stosu cofania.
+        """
+
+        return len(self._undo)
+
+    def get_position(self):
+        """! Zwraca niezmienną kopię obecnej pozycji.
+
+        @return Obiekt klasy Position.
+        """
 
-        return possible
+        return Position(self._white, self._black, self._moving_player)
+
+    def set_position(self, position):
+        """! Ustawia pozycję.
+
+        Numer ruchu i tryb gry nie są zmieniane.
+
+        @param position Obiekt klasy Position.
+        """
+
+        self._white = position.white
+        self._black = position.black
+        self._moving_player = position.moving_player
+        self._undo = []
+        self._rehash()
+        self._reset_terms()
+        self._reset_pieces()
+
+    def copy(self):
+        """! Tworzy kopię silnika z tą samą pozycją.
+
+        Stos cofania nie jest kopiowany.
+
+        @return Nowy obiekt klasy Engine.
+        """
+
+        other = Engine(self.debug)
+        other.mode = self.mode
+        other.move = self.move
+        other._moving_player = self._moving_player
+        other._white = self._white
+        other._black = self._black
+        other._hash = self._hash
+
+        other._white_table = self._white_table
+        other._black_table = self._black_table
+        (other._white_dist, other._black_dist,
+         other._white_target, other._black_target,
+         other._white_home, other._black_home) = self._get_terms()
+
+        other._white_pieces = list(self._white_pieces)
+        other._black_pieces = list(self._black_pieces)
+        other._slot = list(self._slot)
+
+        return other
 
     def get_board(self):
         """! Returns gameboard.
 
+        Plansza jest budowana z bitboardów przy
+        każdym wywołaniu. Jej modyfikacja nie
+        zmienia stanu silnika.
+
         @return Plansza.
         """
 
-        return self._board
+        board = [[STATE.EMPTY]*16 for i in range(16)]
+
+        for i in range(16):
+            white_row = (self._white >> (i << 4)) & 0xffff
+            black_row = (self._black >> (i << 4)) & 0xffff
+            if (not (white_row | black_row)):
+                continue
+
+            row = board[i]
+            for j in range(16):
+                if (white_row >> j & 1):
+                    row[j] = STATE.WHITE
+                elif (black_row >> j & 1):
+                    row[j] = STATE.BLACK
+
+        return board
+
+    # Widok planszy dla zgodności
+    # ze starszym kodem.
+    _board = property(get_board)
+
+    def get_bitboard(self, plr):
+        """! Zwraca bitboard pionków danego gracza.
+
+        @param plr Gracz (biały/czarny).
+
+        @return Bitboard.
+        """
+
+        if (plr == PLAYER.WHITE):
+            return self._white
+        return self._black
+
+    def get_occupied(self):
+        """! Zwraca bitboard zajętych pól.
+
+        @return Bitboard.
+        """
+
+        return self._white | self._black
+
+    def is_disengaged(self):
+        """! Sprawdza, czy armie się minęły.
+
+        Patrz halma.geometry.disengaged.
+
+        @return Czy gra to już dwa niezależne wyścigi.
+        """
+
+        return disengaged(self._white, self._black)
 
     def set_field(self, y, x, value):
         """! Ustawia pole w danym stanie.
 
+        Stos cofania jest czyszczony, bo zapisane
+        w nim ruchy dotyczą innej pozycji.
+
         @param y Współrzędna Y pola.
         @param x Współrzędna X pola.
         @param value Stan pola.
@@ -213,7 +776,29 @@ class Engine:
         if (value not in STATE):
             raise ValueError('Not a valid value for field.')
 
-        self._board[y][x] = value
+        i = index(y, x)
+        bit = BIT[i]
+
+        # Zdejmujemy z hasza to co
+        # stało na polu wcześniej.
+        if (self._white & bit):
+            self._hash ^= WHITE_KEYS[i]
+        if (self._black & bit):
+            self._hash ^= BLACK_KEYS[i]
+
+        self._white &= ~bit
+        self._black &= ~bit
+
+        if (value == STATE.WHITE):
+            self._white |= bit
+            self._hash ^= WHITE_KEYS[i]
+        elif (value == STATE.BLACK):
+            self._black |= bit
+            self._hash ^= BLACK_KEYS[i]
+
+        self._undo = []
+        self._reset_terms()
+        self._reset_pieces()
 
     def read_field(self, y, x):
         """! Zwraca stan danego pola.
@@ -227,12 +812,17 @@ class Engine:
         if (not self._pos_on_board(y, x)):
             raise ValueError('No such a field.')
 
-        value = self._board[y][x]
+        i = index(y, x)
 
-        if (value not in STATE):
-            raise ValueError('Corrupted data.')
+        if (self._white >> i & 1):
+            if (self._black >> i & 1):
+                raise ValueError('Corrupted data.')
+            return STATE.WHITE
+
+        if (self._black >> i & 1):
+            return STATE.BLACK
 
-        return value
+        return STATE.EMPTY
 
     def _state_to_str(self, value):
         """! Zamienia wartość typu wyliczeniowego STATE na napis.
@@ -304,7 +894,8 @@ class Engine:
         @return Słownik ze stanem klasy Engine.
         """
 
-        str_board = [[self._state_to_str(self._board[i][j])
+        board = self.get_board()
+        str_board = [[self._state_to_str(board[i][j])
                       for j in range(16)]
                      for i in range(16)]
 
@@ -346,6 +937,20 @@ class Engine:
         if (str_board is None):
             raise ValueError('Corrupted file.')
 
-        self._board = [[self._str_to_state(str_board[i][j])
-                        for j in range(16)]
-                       for i in range(16)]
+        white = 0
+        black = 0
+        for i in range(16):
+            for j in range(16):
+                value = self._str_to_state(str_board[i][j])
+
+                if (value == STATE.WHITE):
+                    white |= 1 << index(i, j)
+                elif (value == STATE.BLACK):
+                    black |= 1 << index(i, j)
+
+        self._white = white
+        self._black = black
+        self._undo = []
+        self._rehash()
+        self._reset_terms()
+        self._reset_pieces()
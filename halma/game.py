@@ -7,10 +7,12 @@
 
 from halma.defs import PLAYER
 
+from bots.generic import GameBot
 from bots.random_bot import RandomBot
 from bots.forward_bot import ForwardBot
 from bots.minimax_bot import MinimaxBot
 from bots.agressive_minimax_bot import AgressiveMinimaxBot
+from bots.mcts_bot import MctsBot
 
 from ui.tui_player import TuiPlayer
 
@@ -22,21 +24,36 @@ class Game:
 
     def __init__(self, engine, iface,
                  white_player=None,
-                 black_player=None):
+                 black_player=None,
+                 book=None):
         """! Konstruktor klasy Game.
 
         @param engine Silnik gry.
         @param iface Interfejs gry.
         @param white_player Biały gracz.
         @param black_player Czarny gracz.
+        @param book Książka otwarć dla botów (lub None).
         """
         self._engine = engine
         self._game_iface = iface
-        self._white_player = white_player
-        self._black_player = black_player
+        self._book = book
+        self._white_player = self._attach_book(white_player)
+        self._black_player = self._attach_book(black_player)
 
         self._ui = None
 
+    def _attach_book(self, player):
+        """! Przekazuje botowi książkę otwarć gry.
+
+        @param player Gracz (lub None).
+
+        @return Ten sam gracz.
+        """
+
+        if (self._book is not None and isinstance(player, GameBot)):
+            player.book = self._book
+        return player
+
     def get_player(self, which_plr):
         """! Zwracza gracza o danym kolorze.
 
@@ -57,6 +74,8 @@ class Game:
         @player Obiekt klasy Player.
         """
 
+        self._attach_book(player)
+
         if (which_plr == PLAYER.WHITE):
             self._white_player = player
         else:
@@ -85,6 +104,8 @@ class Game:
             return 'MINIMAX_BOT'
         elif (isinstance(player, AgressiveMinimaxBot)):
             return 'AGRESSIVE_MINIMAX_BOT'
+        elif (isinstance(player, MctsBot)):
+            return 'MCTS_BOT'
         else:
             return 'HUMAN'
 
@@ -103,6 +124,8 @@ class Game:
             return MinimaxBot(plr, self._engine)
         elif (string == 'AGRESSIVE_MINIMAX_BOT'):
             return AgressiveMinimaxBot(plr, self._engine)
+        elif (string == 'MCTS_BOT'):
+            return MctsBot(plr, self._engine)
         else:
             return TuiPlayer(plr, self._engine, self._game_iface, self._ui)
 
@@ -151,14 +174,12 @@ class Game:
         if (white_player_str is None):
             raise ValueError('Corrupted file.')
 
-        self._white_player = self._create_player_of_type(
-                                            white_player_str,
-                                            PLAYER.WHITE)
+        self._white_player = self._attach_book(
+                self._create_player_of_type(white_player_str, PLAYER.WHITE))
 
         black_player_str = game_data.get('black_player', None)
         if (black_player_str is None):
             raise ValueError('Corrupted file.')
 
-        self._black_player = self._create_player_of_type(
-                                            black_player_str,
-                                            PLAYER.BLACK)
+        self._black_player = self._attach_book(
+                self._create_player_of_type(black_player_str, PLAYER.BLACK))
@@ -0,0 +1,277 @@
+# Geometria planszy do gry Halma.
+#
+# Pola planszy są numerowane liczbami
+# 0-255 (indeks = 16*y + x). Zbiory pól
+# (np. pionki jednego gracza, obozy)
+# są reprezentowane jako 256-bitowe liczby
+# całkowite (bitboardy), w których bit
+# o numerze i odpowiada polu o indeksie i.
+#
+# Autor: Antoni Przybylik
+
+from halma.defs import CAMP
+
+# Rozmiar planszy.
+SIZE = 16
+
+# Kierunki ruchu (dy, dx).
+DIRECTIONS = ((-1, 1), (0, 1), (1, 1), (1, 0),
+              (1, -1), (0, -1), (-1, -1), (-1, 0))
+
+# Szerokości kolejnych rzędów obozu
+# licząc od rogu planszy.
+CAMP_ROWS = (5, 5, 4, 3, 2)
+
+# Liczba pól obozu.
+CAMP_SIZE = sum(CAMP_ROWS)
+
+
+def index(y, x):
+    """! Zamienia współrzędne pola na jego indeks.
+
+    @param y Współrzędna Y pola.
+    @param x Współrzędna X pola.
+
+    @return Indeks pola.
+    """
+    return (y << 4) | x
+
+
+def field(i):
+    """! Zamienia indeks pola na jego współrzędne.
+
+    @param i Indeks pola.
+
+    @return Krotka (y, x).
+    """
+    return (i >> 4, i & 15)
+
+
+def iter_bits(bb):
+    """! Przechodzi po indeksach pól zapalonych w bitboardzie.
+
+    @param bb Bitboard.
+
+    @return Generator indeksów pól (rosnąco).
+    """
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+def encode_move(src, dst):
+    """! Koduje ruch jako liczbę 16-bitową.
+
+    @param src Indeks pola z którego się ruszamy.
+    @param dst Indeks pola na które się ruszamy.
+
+    @return Zakodowany ruch (src*256 + dst).
+    """
+    return (src << 8) | dst
+
+
+def decode_move(move):
+    """! Dekoduje ruch zakodowany funkcją encode_move.
+
+    @param move Zakodowany ruch.
+
+    @return Krotka (src, dst) indeksów pól.
+    """
+    return (move >> 8, move & 255)
+
+
+def fields_to_move(field1, field2):
+    """! Koduje ruch podany jako para pól.
+
+    @param field1 Pole z którego się ruszamy (y, x).
+    @param field2 Pole na które się ruszamy (y, x).
+
+    @return Zakodowany ruch.
+    """
+    return (field1[0] << 12) | (field1[1] << 8) | (field2[0] << 4) | field2[1]
+
+
+def move_to_fields(move):
+    """! Zamienia zakodowany ruch na parę pól.
+
+    @param move Zakodowany ruch.
+
+    @return Krotka ((y1, x1), (y2, x2)).
+    """
+    return ((move >> 12, (move >> 8) & 15), ((move >> 4) & 15, move & 15))
+
+
+def move_to_str(move):
+    """! Zapisuje ruch w formacie XY-XY.
+
+    Współrzędne są zapisywane wielkimi
+    literami, od 'A' (0) do 'P' (15).
+
+    @param move Zakodowany ruch.
+
+    @return Zapis ruchu.
+    """
+    return (chr(65 + (move >> 12)) + chr(65 + ((move >> 8) & 15)) + '-' +
+            chr(65 + ((move >> 4) & 15)) + chr(65 + (move & 15)))
+
+
+def str_to_move(move_str):
+    """! Zamienia zapis XY-XY na zakodowany ruch.
+
+    Funkcja zakłada poprawność zapisu (małe
+    i wielkie litery od 'A' do 'P').
+
+    @param move_str Zapis ruchu.
+
+    @return Zakodowany ruch.
+    """
+    y1, x1, _, y2, x2 = move_str.upper()
+    return (((ord(y1) - 65) << 12) | ((ord(x1) - 65) << 8) |
+            ((ord(y2) - 65) << 4) | (ord(x2) - 65))
+
+
+def disengaged(white, black):
+    """! Sprawdza, czy armie się minęły.
+
+    Armie się minęły, gdy każdy biały pionek
+    leży na przekątnej mniejszej o co najmniej
+    trzy od przekątnych wszystkich czarnych
+    pionków. Wtedy żaden pionek nie sąsiaduje
+    z pionkiem przeciwnika i, dopóki gracze
+    nie cofają pionków, nie mogą już na siebie
+    wpływać - gra to dwa niezależne wyścigi.
+
+    @param white Bitboard białych pionków.
+    @param black Bitboard czarnych pionków.
+
+    @return Czy armie się minęły.
+    """
+
+    if (not white or not black):
+        return True
+
+    # Najbardziej wysunięta do tyłu
+    # przekątna białych pionków.
+    last_white = len(DIAGONAL_MASKS) - 1
+    while (not white & DIAGONAL_MASKS[last_white]):
+        last_white -= 1
+
+    # Najbardziej wysunięta do tyłu
+    # przekątna czarnych pionków.
+    last_black = 0
+    while (not black & DIAGONAL_MASKS[last_black]):
+        last_black += 1
+
+    return last_white + 3 <= last_black
+
+
+def _build_steps(i):
+    """! Buduje listę sąsiadów pola.
+
+    @param i Indeks pola.
+
+    @return Krotka indeksów pól sąsiednich.
+    """
+    y, x = field(i)
+    result = []
+    for dy, dx in DIRECTIONS:
+        if (0 <= y+dy < SIZE and 0 <= x+dx < SIZE):
+            result.append(index(y+dy, x+dx))
+
+    return tuple(result)
+
+
+def _build_jumps(i):
+    """! Buduje listę skoków z pola.
+
+    @param i Indeks pola.
+
+    @return Krotka par (pole przeskakiwane, pole lądowania).
+    """
+    y, x = field(i)
+    result = []
+    for dy, dx in DIRECTIONS:
+        if (0 <= y+2*dy < SIZE and 0 <= x+2*dx < SIZE):
+            result.append((index(y+dy, x+dx), index(y+2*dy, x+2*dx)))
+
+    return tuple(result)
+
+
+def _camp_mask(camp):
+    """! Buduje bitboard obozu.
+
+    @param camp Obóz (biały/czarny).
+
+    @return Bitboard z polami obozu.
+    """
+    mask = 0
+    for i in range(0, 5):
+        for j in range(0, CAMP_ROWS[i]):
+            if (camp == CAMP.BLACK):
+                mask |= 1 << index(i, j)
+            else:
+                mask |= 1 << index(15 - i, 15 - j)
+
+    return mask
+
+
+def _camp_dist(mask):
+    """! Buduje tablicę odległości pól od obozu.
+
+    @param mask Bitboard obozu.
+
+    @return Krotka odległości (liczba ruchów o jedno
+            pole do najbliższego pola obozu) dla
+            wszystkich pól.
+    """
+    camp = [field(i) for i in iter_bits(mask)]
+    return tuple(min(max(abs(y - cy), abs(x - cx)) for cy, cx in camp)
+                 for y, x in map(field, range(SIZE * SIZE)))
+
+
+# Bitboardy obozów.
+BLACK_CAMP_MASK = _camp_mask(CAMP.BLACK)
+WHITE_CAMP_MASK = _camp_mask(CAMP.WHITE)
+
+# Obóz, w którym leży każde pole
+# (None - pole poza obozami).
+CAMP_TABLE = tuple(CAMP.BLACK if (BLACK_CAMP_MASK >> i) & 1 else
+                   CAMP.WHITE if (WHITE_CAMP_MASK >> i) & 1 else None
+                   for i in range(SIZE * SIZE))
+
+# Odległości pól od rogów planszy (liczba ruchów
+# o jedno pole): od rogu w obozie Czarnego (cel
+# Białego) i od rogu w obozie Białego (cel Czarnego).
+DIST_TO_BLACK_CORNER = tuple(max(i >> 4, i & 15)
+                             for i in range(SIZE * SIZE))
+DIST_TO_WHITE_CORNER = tuple(max(15 - (i >> 4), 15 - (i & 15))
+                             for i in range(SIZE * SIZE))
+
+# Odległości pól od najbliższego pola obozu
+# (0 dla pól w obozie).
+DIST_TO_BLACK_CAMP = _camp_dist(BLACK_CAMP_MASK)
+DIST_TO_WHITE_CAMP = _camp_dist(WHITE_CAMP_MASK)
+
+# Bitboardy przekątnych: DIAGONAL_MASKS[k]
+# zawiera pola, dla których y + x = k. Biały
+# idzie w stronę przekątnej 0, a Czarny w
+# stronę przekątnej 2*SIZE - 2.
+DIAGONAL_MASKS = tuple(
+        sum(1 << index(y, k - y)
+            for y in range(max(0, k - SIZE + 1), min(k, SIZE - 1) + 1))
+        for k in range(2 * SIZE - 1))
+
+# Bitboard z wszystkimi polami planszy.
+FULL_MASK = (1 << (SIZE * SIZE)) - 1
+
+# Bitboardy pojedynczych pól.
+BIT = tuple(1 << i for i in range(SIZE * SIZE))
+
+# Dla każdego pola: sąsiednie pola na planszy.
+STEPS = tuple(_build_steps(i) for i in range(SIZE * SIZE))
+
+# Dla każdego pola: pary (pole przeskakiwane,
+# pole lądowania) dla skoków mieszczących
+# się na planszy.
+JUMPS = tuple(_build_jumps(i) for i in range(SIZE * SIZE))
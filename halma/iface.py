@@ -11,9 +11,11 @@
 #
 # Autor: Antoni Przybylik
 
-from halma.defs import STATE
-from halma.defs import PLAYER
-from halma.defs import CAMP
+from halma.geometry import index
+from halma.geometry import fields_to_move
+from halma.geometry import move_to_fields
+from halma.geometry import str_to_move
+from halma.geometry import CAMP_TABLE
 
 
 class GameInterface:
@@ -107,24 +109,12 @@ class GameInterface:
         @return Czy można wykonać ruch.
         """
 
-        # Najpierw należy sprawdzić, czy na polu
-        # z którego chcemy się ruszyć stoi kamień
-        # gracza, który ma teraz swój ruch.
-        if (self._engine.moving_player == PLAYER.WHITE):
-            field_state = STATE.WHITE
-        else:
-            field_state = STATE.BLACK
-
-        board = self._engine.get_board()
-        if (board[field1[0]][field1[1]] != field_state):
-            return False
-
-        # Teraz należy sprawdzić, czy z danego pola
-        # da się wykonać ruch tam gdzie chcemy.
-        if (field2 not in self._engine.moves(*field1)):
-            return False
-
-        return True
+        # Silnik sprawdza, czy na polu z którego
+        # chcemy się ruszyć stoi kamień gracza,
+        # który ma teraz swój ruch, a potem szuka
+        # pola docelowego wśród ruchów z tego pola,
+        # przerywając po jego znalezieniu.
+        return self._engine.is_legal(fields_to_move(field1, field2))
 
     def _parse_move(self, move_str):
         """! Zamienia zapis ruchu na krotkę pól.
@@ -135,24 +125,7 @@ class GameInterface:
 
         @return Krotka pól.
         """
-
-        y1 = ord(move_str[0]) - ord('a')
-        if (y1 < 0):
-            y1 += ord('a') - ord('A')
-
-        x1 = ord(move_str[1]) - ord('a')
-        if (x1 < 0):
-            x1 += ord('a') - ord('A')
-
-        y2 = ord(move_str[3]) - ord('a')
-        if (y2 < 0):
-            y2 += ord('a') - ord('A')
-
-        x2 = ord(move_str[4]) - ord('a')
-        if (x2 < 0):
-            x2 += ord('a') - ord('A')
-
-        return ((y1, x1), (y2, x2))
+        return move_to_fields(str_to_move(move_str))
 
     def _apply_move(self, field1, field2):
         """! Wykonuje ruch.
@@ -161,19 +134,7 @@ class GameInterface:
         @param field2 Pole na które chcemy się ruszyć.
         """
 
-        on_field1 = self._engine.read_field(*field1)
-        self._engine.set_field(*field1, STATE.EMPTY)
-        self._engine.set_field(*field2, on_field1)
-
-        if (self._engine.moving_player == PLAYER.WHITE):
-            # Jeżeli teraz ruszał się biały, to
-            # teraz jest kolej na czarnego.
-            self._engine.moving_player = PLAYER.BLACK
-        else:
-            # Jeżeli w danym ruchu ruszył się czarny,
-            # przechodzimy do następnego ruchu.
-            self._engine.moving_player = PLAYER.WHITE
-            self._engine.move += 1
+        self._engine.make_move(fields_to_move(field1, field2))
 
     def move(self, move_str):
         """! Funkcja wykonująca ruch.
@@ -203,17 +164,17 @@ class GameInterface:
         @return W jakim obozie znajduje się pole.
         """
 
-        # Sprawdzamy, czy jest w obozie Czarnego.
-        if (x in range(0, 5) and
-                y in range(0, [5, 5, 4, 3, 2][x])):
-            return CAMP.BLACK
+        return CAMP_TABLE[index(y, x)]
 
-        # Sprawdzamy, czy jest w obozie Białego.
-        if (x in range(11, 16) and
-                15-y in range(0, [5, 5, 4, 3, 2][15-x])):
-            return CAMP.WHITE
+    def is_disengaged(self):
+        """! Sprawdza, czy armie się minęły.
 
-        return None
+        Od tej chwili gracze nie mogą już na
+        siebie wpływać (jeśli nie cofają pionków).
+
+        @return Czy gra to już dwa niezależne wyścigi.
+        """
+        return self._engine.is_disengaged()
 
     def get_winner(self):
         """! Sprawdza, czy jest koniec gry.
@@ -224,43 +185,13 @@ class GameInterface:
         @return Zwycięzca.
         """
 
-        board = self._engine.get_board()
-
         # Gra kończy się gdy w obozie
         # są wszystkie pola zajęte i
         # jest tam co najmniej jeden
-        # kamień przeciwnika.
-        all_full = True
-        enemy_in = False
-
-        # Sprawdzamy obóz Czarnego.
-        for i in range(0, 5):
-            for j in range(0, [5, 5, 4, 3, 2][i]):
-                if (board[i][j] == STATE.EMPTY):
-                    all_full = False
-
-                if (board[i][j] == STATE.WHITE):
-                    enemy_in = True
-
-        if (all_full and enemy_in):
-            return PLAYER.WHITE
-
-        all_full = True
-        enemy_in = False
-
-        # Sprawdzamy obóz Białego.
-        for i in range(0, 5):
-            for j in range(0, [5, 5, 4, 3, 2][i]):
-                if (board[15 - i][15 - j] == STATE.EMPTY):
-                    all_full = False
-
-                if (board[15 - i][15 - j] == STATE.BLACK):
-                    enemy_in = True
-
-        if (all_full and enemy_in):
-            return PLAYER.BLACK
-
-        return None
+        # kamień przeciwnika. Silnik
+        # liczy pionki w obozach przy
+        # każdym ruchu.
+        return self._engine.get_winner()
 
     def dump_game_state(self):
         """! Zapisuje stan gry w słowniku.
@@ -0,0 +1,285 @@
+# Generator ruchów niezależny od klasy Engine.
+#
+# Funkcje w tym module nie mają stanu:
+# dostają pozycję (obiekt klasy Position
+# albo bitboardy) i zwracają ruchy dla tej
+# pozycji. Mogą więc być wywoływane
+# równolegle dla wielu pozycji.
+#
+# Autor: Antoni Przybylik
+
+from halma.geometry import BIT
+from halma.geometry import STEPS
+from halma.geometry import JUMPS
+from halma.geometry import iter_bits
+from halma.geometry import SIZE
+
+
+def targets(start, occupied, with_paths=False):
+    """! Znajduje indeksy pól, na które można się ruszyć.
+
+    Skoki są przeszukiwane wszerz, a odwiedzone
+    pola są zapamiętywane w bitboardzie. Sąsiedzi
+    i skoki są brane z tablic modułu halma.geometry.
+
+    @param start Indeks pola startowego.
+    @param occupied Bitboard zajętych pól (bez pola startowego).
+    @param with_paths Czy zapamiętać poprzedników pól.
+
+    @return Krotka (ruchy o jedno pole, skoki, poprzednicy).
+            Poprzednicy to słownik (lub None jeśli with_paths
+            jest fałszem).
+    """
+    steps = [n for n in STEPS[start] if not occupied & BIT[n]]
+
+    # Kolejka przeszukiwania wszerz. Pola
+    # dodane w trakcie iteracji też zostaną
+    # odwiedzone.
+    queue = [start]
+    blocked = occupied | BIT[start]
+    parent = {start: None} if with_paths else None
+
+    for current in queue:
+        for over, landing in JUMPS[current]:
+            if (occupied & BIT[over] and
+                    not blocked & BIT[landing]):
+                blocked |= BIT[landing]
+                queue.append(landing)
+
+                if (with_paths):
+                    parent[landing] = current
+
+    # Skoki zmieniają współrzędne o liczby
+    # parzyste, więc nie pokrywają się z
+    # ruchami o jedno pole.
+    return (steps, queue[1:], parent)
+
+
+def iter_targets(start, occupied):
+    """! Przechodzi po polach, na które można się ruszyć.
+
+    Działa jak targets, ale pola są zwracane
+    w miarę ich znajdowania (najpierw ruchy
+    o jedno pole, potem skoki w kolejności
+    przeszukiwania wszerz), więc można przerwać,
+    gdy znajdziemy szukane pole.
+
+    @param start Indeks pola startowego.
+    @param occupied Bitboard zajętych pól (bez pola startowego).
+
+    @return Generator indeksów pól.
+    """
+    for n in STEPS[start]:
+        if (not occupied & BIT[n]):
+            yield n
+
+    queue = [start]
+    blocked = occupied | BIT[start]
+
+    for current in queue:
+        for over, landing in JUMPS[current]:
+            if (occupied & BIT[over] and
+                    not blocked & BIT[landing]):
+                blocked |= BIT[landing]
+                queue.append(landing)
+                yield landing
+
+
+def is_legal(move, mine, occupied):
+    """! Sprawdza, czy ruch jest zgodny z zasadami gry.
+
+    Ruchy o jedno pole są sprawdzane od razu,
+    a skoki przeszukiwaniem przerywanym po
+    znalezieniu pola docelowego.
+
+    @param move Zakodowany ruch.
+    @param mine Bitboard pionków ruszającego się gracza.
+    @param occupied Bitboard wszystkich zajętych pól.
+
+    @return Czy ruch jest poprawny.
+    """
+    src = move >> 8
+    dst = move & 255
+
+    if (not mine & BIT[src] or occupied & BIT[dst]):
+        return False
+
+    if (dst in STEPS[src]):
+        return True
+
+    # Skok zmienia obie współrzędne o liczby
+    # parzyste, inne pola można od razu odrzucić.
+    if ((src ^ dst) & 0x11):
+        return False
+
+    for i in iter_targets(src, occupied & ~BIT[src]):
+        if (i == dst):
+            return True
+
+    return False
+
+
+def staged_moves(mine, occupied, dist, first=(), pieces=None,
+                 order=None):
+    """! Generuje ruchy etapami, od najbardziej obiecujących.
+
+    Najpierw ruchy z listy first (np. z tablicy
+    transpozycji), o ile są poprawne, potem skoki
+    posortowane od najdłuższych w stronę celu, a
+    na końcu ruchy o jedno pole. Każdy etap jest
+    liczony dopiero, gdy poprzedni się skończy,
+    więc po odcięciu w alfa-beta nie płacimy
+    za resztę ruchów.
+
+    @param mine Bitboard pionków ruszającego się gracza.
+    @param occupied Bitboard wszystkich zajętych pól.
+    @param dist Tablica odległości pól od celu gracza
+                (np. halma.geometry.DIST_TO_BLACK_CORNER).
+    @param first Ruchy, które mają być pierwsze.
+    @param pieces Lista indeksów pól z pionkami gracza
+                  (opcjonalnie, patrz side_moves).
+    @param order Funkcja ustalająca kolejność ruchów w
+                 etapie (dostaje listę, zwraca listę). Jeśli
+                 nie jest podana, skoki są sortowane według
+                 dist, a ruchy o jedno pole nie są sortowane.
+
+    @return Generator zakodowanych ruchów.
+    """
+    done = set()
+    for move in first:
+        if (move not in done and is_legal(move, mine, occupied)):
+            done.add(move)
+            yield move
+
+    if (pieces is None):
+        pieces = list(iter_bits(mine))
+
+    jumps = []
+    for start in pieces:
+        base = start << 8
+        _, landings, _ = targets(start, occupied & ~BIT[start])
+        jumps += [base | i for i in landings]
+
+    if (order is None):
+        jumps.sort(key=lambda m: dist[m & 255] - dist[m >> 8])
+    else:
+        jumps = order(jumps)
+    for move in jumps:
+        if (move not in done):
+            yield move
+
+    if (order is None):
+        for start in pieces:
+            base = start << 8
+            for n in STEPS[start]:
+                if (not occupied & BIT[n] and base | n not in done):
+                    yield base | n
+        return
+
+    steps = []
+    for start in pieces:
+        base = start << 8
+        steps += [base | n for n in STEPS[start] if not occupied & BIT[n]]
+
+    for move in order(steps):
+        if (move not in done):
+            yield move
+
+
+def side_moves(mine, occupied, pieces=None):
+    """! Znajduje wszystkie ruchy pionków z bitboardu.
+
+    @param mine Bitboard pionków ruszającego się gracza.
+    @param occupied Bitboard wszystkich zajętych pól.
+    @param pieces Lista indeksów pól z pionkami gracza (np.
+                  Engine.pieces). Jeśli jest podana, pola
+                  nie są wyciągane z bitboardu.
+
+    @return Lista ruchów zakodowanych funkcją
+            halma.geometry.encode_move.
+    """
+    if (pieces is None):
+        pieces = iter_bits(mine)
+
+    result = []
+    for start in pieces:
+        steps, jumps, _ = targets(start, occupied & ~BIT[start])
+        base = start << 8
+        result += [base | i for i in steps]
+        result += [base | i for i in jumps]
+
+    return result
+
+
+def generate_moves(position, plr=None):
+    """! Znajduje wszystkie ruchy w danej pozycji.
+
+    @param position Obiekt klasy Position.
+    @param plr Gracz (domyślnie ten, który ma ruch).
+
+    @return Lista ruchów zakodowanych funkcją
+            halma.geometry.encode_move.
+    """
+    if (plr is None):
+        plr = position.moving_player
+
+    return side_moves(position.get_bitboard(plr),
+                      position.get_occupied())
+
+
+def jump_distances(camp_mask, occupied, fallback):
+    """! Liczy odległości pól od obozu z uwzględnieniem skoków.
+
+    Odległość pola to najmniejsza liczba ruchów
+    (ciąg skoków to jeden ruch), po których pionek
+    stojący na tym polu wejdzie do obozu, jeśli
+    pozostałe pionki stoją w miejscu. Ruchy są
+    odwracalne, więc odległości liczymy jednym
+    przeszukiwaniem wszerz od pól obozu. Pionek
+    nie może przeskakiwać sam przez siebie, czego
+    to przeszukiwanie nie uwzględnia, więc wynik
+    jest przybliżony.
+
+    @param camp_mask Bitboard obozu.
+    @param occupied Bitboard zajętych pól.
+    @param fallback Tablica odległości dla pól, z których
+                    nie da się dojść do obozu (np.
+                    halma.geometry.DIST_TO_BLACK_CAMP).
+
+    @return Lista odległości dla wszystkich pól.
+    """
+    dist = [None] * (SIZE * SIZE)
+
+    queue = list(iter_bits(camp_mask))
+    for i in queue:
+        dist[i] = 0
+
+    for current in queue:
+        # Na zajęte pole nie można wejść, więc
+        # nie prowadzą do niego żadne ruchy.
+        if (occupied & BIT[current]):
+            continue
+
+        d = dist[current] + 1
+
+        for n in STEPS[current]:
+            if (dist[n] is None):
+                dist[n] = d
+                queue.append(n)
+
+        # Ciągi skoków kończące się na polu current
+        # przechodzimy od końca. Pola pośrednie muszą
+        # być wolne, pole startowe może być zajęte.
+        chain = [current]
+        visited = BIT[current]
+        for c in chain:
+            for over, landing in JUMPS[c]:
+                if (occupied & BIT[over] and not visited & BIT[landing]):
+                    visited |= BIT[landing]
+                    if (dist[landing] is None):
+                        dist[landing] = d
+                        queue.append(landing)
+                    if (not occupied & BIT[landing]):
+                        chain.append(landing)
+
+    return [fallback[i] if d is None else d for i, d in enumerate(dist)]
@@ -0,0 +1,89 @@
+# Niezmienna reprezentacja pozycji w grze
+# Halma. W odróżnieniu od klasy Engine nie
+# ma stanu, który zmienia się w trakcie
+# gry, więc można ją swobodnie przekazywać
+# między wątkami i procesami.
+#
+# Autor: Antoni Przybylik
+
+from halma.defs import PLAYER
+
+from halma.geometry import BIT
+
+from halma.zobrist import compute_hash
+
+from collections import namedtuple
+
+
+class Position(namedtuple('Position', ['white', 'black', 'moving_player'])):
+    """! Pozycja: bitboardy obu graczy i gracz, który ma ruch. """
+
+    __slots__ = ()
+
+    def get_bitboard(self, plr):
+        """! Zwraca bitboard pionków danego gracza.
+
+        @param plr Gracz (biały/czarny).
+
+        @return Bitboard.
+        """
+        if (plr == PLAYER.WHITE):
+            return self.white
+        return self.black
+
+    def get_occupied(self):
+        """! Zwraca bitboard zajętych pól.
+
+        @return Bitboard.
+        """
+        return self.white | self.black
+
+    def get_hash(self):
+        """! Liczy hasz Zobrista pozycji.
+
+        @return 64-bitowy hasz pozycji.
+        """
+        return compute_hash(self.white, self.black,
+                            self.moving_player == PLAYER.BLACK)
+
+    def to_bytes(self):
+        """! Zapisuje pozycję w zwartej postaci binarnej.
+
+        @return 65 bajtów: bitboard białych, bitboard
+                czarnych i gracz, który ma ruch.
+        """
+        return (self.white.to_bytes(32, 'little') +
+                self.black.to_bytes(32, 'little') +
+                bytes([self.moving_player.value]))
+
+    @staticmethod
+    def from_bytes(data):
+        """! Odczytuje pozycję zapisaną metodą to_bytes.
+
+        @param data Bajty z pozycją.
+
+        @return Obiekt klasy Position.
+        """
+        if (len(data) != 65):
+            raise ValueError('Corrupted data.')
+
+        return Position(int.from_bytes(data[0:32], 'little'),
+                        int.from_bytes(data[32:64], 'little'),
+                        PLAYER(data[64]))
+
+    def play(self, move):
+        """! Zwraca pozycję po wykonaniu ruchu.
+
+        Tak jak Engine.make_move nie sprawdza,
+        czy ruch jest zgodny z zasadami gry.
+
+        @param move Ruch zakodowany funkcją
+                    halma.geometry.encode_move.
+
+        @return Nowa pozycja.
+        """
+        swap = BIT[move >> 8] | BIT[move & 255]
+
+        if (self.moving_player == PLAYER.WHITE):
+            return Position(self.white ^ swap, self.black, PLAYER.BLACK)
+        return Position(self.white, self.black ^ swap, PLAYER.WHITE)
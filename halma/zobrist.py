@@ -0,0 +1,45 @@
+# Klucze Zobrista do haszowania pozycji.
+#
+# Hasz pozycji to XOR kluczy wszystkich
+# pionków na planszy (osobne klucze dla
+# białych i czarnych pionków na każdym polu)
+# oraz klucza SIDE_KEY, jeśli ruch ma Czarny.
+# Dzięki temu hasz można aktualizować po
+# każdej zmianie pola w czasie stałym.
+#
+# Autor: Antoni Przybylik
+
+from halma.geometry import SIZE
+from halma.geometry import iter_bits
+
+import random
+
+# Ziarno jest stałe, żeby hasze były
+# takie same we wszystkich procesach
+# i między uruchomieniami programu.
+_rng = random.Random(0x4a1a)
+
+WHITE_KEYS = tuple(_rng.getrandbits(64) for i in range(SIZE * SIZE))
+BLACK_KEYS = tuple(_rng.getrandbits(64) for i in range(SIZE * SIZE))
+SIDE_KEY = _rng.getrandbits(64)
+
+del _rng
+
+
+def compute_hash(white, black, black_to_move):
+    """! Liczy hasz pozycji od zera.
+
+    @param white Bitboard białych pionków.
+    @param black Bitboard czarnych pionków.
+    @param black_to_move Czy ruch ma Czarny.
+
+    @return 64-bitowy hasz pozycji.
+    """
+    h = SIDE_KEY if black_to_move else 0
+
+    for i in iter_bits(white):
+        h ^= WHITE_KEYS[i]
+    for i in iter_bits(black):
+        h ^= BLACK_KEYS[i]
+
+    return h
@@ -7,26 +7,75 @@ from halma.engine import Engine
 
 from halma.defs import PLAYER
 
-import copy
 
-
-# Metody _move_on_board, _reverse_move_on_board.
+# Metoda _minimax.
 #
-# Pierwsza przemieszcza pionek na planszy, druga
-# cofa ruch.
+# Przeszukuje drzewo gry wykonując
+# i cofając ruchy na silniku.
 
 
-def test_move_reverse():
+def test_minimax_restores():
     engine = Engine()
     engine.setup('classic')
 
-    board1 = copy.deepcopy(engine._board)
-    board2 = copy.deepcopy(engine._board)
+    board = engine.get_board()
+    h = engine.get_hash()
+
+    bot = AgressiveMinimaxBot(PLAYER.WHITE, engine)
+    bot._minimax(engine, 2)
+
+    assert str(engine.get_board()) == str(board)
+    assert engine.get_hash() == h
+    assert engine.moving_player == PLAYER.WHITE
+
+
+# Metoda _search.
+#
+# Przeszukuje drzewo gry algorytmem
+# alfa-beta. Ocena ma być taka sama
+# jak dla zwykłego algorytmu MiniMax.
+# Spośród równie dobrych ruchów może
+# zostać wybrany inny (zależy to od
+# kolejności sprawdzania ruchów).
+
+
+def test_alphabeta1():
+    engine = Engine()
+    engine.setup('classic')
 
     bot = AgressiveMinimaxBot(PLAYER.WHITE, engine)
 
-    my_move = [(2, 2), (3, 3)]
-    bot._move_on_board(board1, *my_move)
-    bot._reverse_move_on_board(board1, *my_move)
+    bot.nodes = 0
+    expected = bot._minimax(engine, 2)
+    minimax_nodes = bot.nodes
+
+    move, score = bot._search(engine, 2)
+    assert score == expected[1]
+
+    engine.make_move(move)
+    assert -bot._minimax(engine, 1)[1] == score
+    engine.unmake_move()
+
+    assert bot.nodes < minimax_nodes
+
+
+def test_alphabeta2():
+    from tests.rc import engine_state1 as state
+
+    engine = Engine()
+    engine.load_state(state)
+
+    bot = AgressiveMinimaxBot(PLAYER.BLACK, engine)
+
+    bot.nodes = 0
+    expected = bot._minimax(engine, 2)
+    minimax_nodes = bot.nodes
+
+    move, score = bot._search(engine, 2)
+    assert score == expected[1]
+
+    engine.make_move(move)
+    assert -bot._minimax(engine, 1)[1] == score
+    engine.unmake_move()
 
-    assert str(board1) == str(board2)
+    assert bot.nodes < minimax_nodes
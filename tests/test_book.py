@@ -0,0 +1,89 @@
+# Testy książki otwarć z pliku bots/book.py
+#
+# Autor: Antoni Przybylik
+
+from bots.book import build_book
+from bots.book import write_book
+from bots.book import OpeningBook
+from bots.book import MAX_WEIGHT
+
+from bots.agressive_minimax_bot import AgressiveMinimaxBot
+from halma.engine import Engine
+from halma.iface import GameInterface
+from halma.game import Game
+
+from halma.defs import PLAYER
+
+from pytest import raises
+
+
+# Zapis i odczyt książki.
+#
+# Rekordy są posortowane, a pozycje
+# wyszukiwane binarnie.
+
+
+def test_write_read(tmp_path):
+    filename = str(tmp_path / 'test.book')
+    write_book(filename, {(5, 1): 3, (2, 7): 1, (5, 2): 4,
+                          (9, 3): MAX_WEIGHT + 10, (2**64 - 1, 4): 1})
+
+    book = OpeningBook(filename)
+    try:
+        assert len(book) == 5
+        assert [r[0] for r in book.records()] == [2, 5, 5, 9, 2**64 - 1]
+
+        assert book.moves(5) == [(1, 3), (2, 4)]
+        assert book.moves(9) == [(3, MAX_WEIGHT)]
+        assert book.moves(2**64 - 1) == [(4, 1)]
+        assert book.moves(1) == []
+        assert book.moves(6) == []
+
+        assert book.best_move(5) == 2
+        assert book.best_move(3) is None
+    finally:
+        book.close()
+
+
+def test_corrupted(tmp_path):
+    filename = str(tmp_path / 'broken.book')
+    with open(filename, 'wb') as fp:
+        fp.write(b'aalmakota')
+
+    with raises(ValueError):
+        OpeningBook(filename)
+
+
+# Budowanie książki i ruchy z książki.
+#
+# Bot z książką wykonuje ruch z książki
+# bez przeszukiwania.
+
+
+def test_book_move(tmp_path):
+    filename = str(tmp_path / 'classic.book')
+
+    entries = build_book(lambda plr, e: AgressiveMinimaxBot(plr, e),
+                         games=1, plies=2, node_limit=500, seed=1)
+    assert len(entries) == 2
+    write_book(filename, entries)
+
+    engine = Engine()
+    engine.setup('classic')
+    book = OpeningBook(filename)
+    try:
+        expected = book.best_move(engine.get_hash())
+        assert expected in engine.all_moves(PLAYER.WHITE)
+
+        game = Game(engine, GameInterface(engine), book=book)
+        game.set_player(PLAYER.WHITE,
+                        AgressiveMinimaxBot(PLAYER.WHITE, engine))
+
+        bot = game.get_player(PLAYER.WHITE)
+        assert bot.book is book
+
+        bot.make_move()
+        assert bot.nodes == 0
+        assert engine.unmake_move() == expected
+    finally:
+        book.close()
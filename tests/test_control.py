@@ -0,0 +1,110 @@
+# Testy kontroli przeszukiwania
+# z pliku bots/control.py
+#
+# Autor: Antoni Przybylik
+
+from bots.control import SearchControl
+from bots.minimax_bot import MinimaxBot
+from halma.engine import Engine
+
+from halma.defs import PLAYER
+
+from pytest import raises
+
+import threading
+import time
+
+
+# Metoda should_stop.
+
+
+def test_should_stop():
+    control = SearchControl(node_limit=100)
+    assert not control.should_stop(99)
+    assert control.should_stop(100)
+
+    control = SearchControl(time_limit=0)
+    assert control.should_stop(0)
+
+    control = SearchControl()
+    assert not control.should_stop(10**9)
+    control.cancel()
+    assert control.cancelled()
+    assert control.should_stop(0)
+
+    with raises(ValueError):
+        SearchControl(check_every=0)
+
+
+# Przeszukiwanie z limitem węzłów
+# jest powtarzalne i nie zmienia
+# pozycji na silniku.
+
+
+def test_node_limit():
+    from tests.rc import engine_state2 as state
+
+    results = []
+    for i in range(2):
+        engine = Engine()
+        engine.load_state(state)
+        h = engine.get_hash()
+
+        bot = MinimaxBot(PLAYER.WHITE, engine)
+        control = SearchControl(node_limit=3000, check_every=64)
+        results.append(bot._iterative_search(engine, control=control))
+
+        assert bot.nodes < 3000 + 64
+        assert engine.get_hash() == h
+        assert engine.get_undo_depth() == 0
+
+    assert results[0] == results[1]
+    assert results[0][0] is not None
+
+
+def test_make_move_node_limit():
+    engine = Engine()
+    engine.setup('classic')
+
+    bot = MinimaxBot(PLAYER.WHITE, engine, time_limit=None, node_limit=500)
+    move = bot.make_move()
+
+    assert engine.moving_player == PLAYER.BLACK
+    assert engine.get_undo_depth() == 1
+    assert move is not None
+
+
+def test_make_move_cancel():
+    engine = Engine()
+    engine.setup('classic')
+
+    # Bez limitów przeszukiwanie kończy
+    # się dopiero po przerwaniu z innego
+    # wątku.
+    bot = MinimaxBot(PLAYER.WHITE, engine, time_limit=None)
+    control = SearchControl()
+    timer = threading.Timer(0.2, control.cancel)
+    timer.start()
+
+    move = bot.make_move(control)
+    timer.join()
+
+    assert move is not None
+    assert engine.get_undo_depth() == 1
+
+
+def test_bot_cancel():
+    engine = Engine()
+    engine.setup('classic')
+
+    bot = MinimaxBot(PLAYER.WHITE, engine, time_limit=None)
+    thread = threading.Thread(target=bot.make_move)
+    thread.start()
+
+    while (bot._control is None):
+        time.sleep(0.01)
+    bot.cancel()
+
+    thread.join(10)
+    assert not thread.is_alive()
+    assert engine.get_undo_depth() == 1
@@ -7,6 +7,14 @@ from halma.engine import Engine
 from halma.iface import GameInterface
 
 from halma.defs import STATE
+from halma.defs import PLAYER
+
+from halma.geometry import index
+from halma.geometry import encode_move
+from halma.geometry import BLACK_CAMP_MASK
+from halma.geometry import WHITE_CAMP_MASK
+
+from halma.zobrist import compute_hash
 
 from pytest import raises
 
@@ -32,6 +40,54 @@ def test_set_read2():
     assert engine.read_field(0, 0) == STATE.WHITE
 
 
+def test_set_read3():
+    engine = Engine()
+
+    engine.set_field(5, 5, STATE.WHITE)
+    engine.set_field(5, 5, STATE.BLACK)
+    assert engine.read_field(5, 5) == STATE.BLACK
+
+    engine.set_field(5, 5, STATE.EMPTY)
+    assert engine.read_field(5, 5) == STATE.EMPTY
+    assert engine.get_occupied() == 0
+
+
+# Metody get_bitboard, get_board.
+#
+# Bitboardy graczy są podstawową
+# reprezentacją pozycji, plansza
+# jest z nich budowana.
+
+
+def test_bitboard1():
+    engine = Engine()
+    engine.setup('classic')
+
+    assert engine.get_bitboard(PLAYER.WHITE) == WHITE_CAMP_MASK
+    assert engine.get_bitboard(PLAYER.BLACK) == BLACK_CAMP_MASK
+
+
+def test_bitboard2():
+    engine = Engine()
+    engine.setup('random')
+
+    board = engine.get_board()
+    white = engine.get_bitboard(PLAYER.WHITE)
+    black = engine.get_bitboard(PLAYER.BLACK)
+
+    assert bin(white).count('1') == 19
+    assert bin(black).count('1') == 19
+
+    for i in range(16):
+        for j in range(16):
+            if ((white >> index(i, j)) & 1):
+                assert board[i][j] == STATE.WHITE
+            elif ((black >> index(i, j)) & 1):
+                assert board[i][j] == STATE.BLACK
+            else:
+                assert board[i][j] == STATE.EMPTY
+
+
 # Metody dump_state i load_state.
 #
 # Za ich pomocą można zapisać stan
@@ -120,3 +176,290 @@ def test_moves3():
     assert len(possible_moves) == len(possible_moves3)
     for pos in possible_moves:
         assert pos in possible_moves3
+
+
+def test_moves_unique():
+    engine = Engine()
+    game_iface = GameInterface(engine)
+    game_iface.setup('classic')
+
+    # W pozycji początkowej na wiele pól
+    # da się doskoczyć kilkoma drogami.
+    for i in range(5):
+        for j in range(5):
+            possible_moves = engine.moves(i, j)
+            assert len(possible_moves) == len(set(possible_moves))
+
+
+def test_moves_paths():
+    engine = Engine()
+
+    engine.set_field(8, 8, STATE.WHITE)
+    engine.set_field(8, 9, STATE.BLACK)
+    engine.set_field(8, 11, STATE.BLACK)
+    engine.set_field(9, 12, STATE.BLACK)
+
+    paths = dict(engine.moves(8, 8, with_paths=True))
+
+    assert paths[(8, 12)] == [(8, 8), (8, 10), (8, 12)]
+    assert paths[(10, 12)] == [(8, 8), (8, 10), (8, 12), (10, 12)]
+    assert paths[(7, 7)] == [(8, 8), (7, 7)]
+    assert sorted(paths) == sorted(engine.moves(8, 8))
+
+
+# Metoda all_moves.
+#
+# Zwraca wszystkie ruchy gracza
+# zakodowane jako liczby.
+
+
+def test_all_moves1():
+    engine = Engine()
+    engine.setup('classic')
+
+    expected = set()
+    for i in range(16):
+        for j in range(16):
+            if (engine.read_field(i, j) == STATE.BLACK):
+                for pos in engine.moves(i, j):
+                    expected.add(encode_move(index(i, j), index(*pos)))
+
+    all_moves = engine.all_moves(PLAYER.BLACK)
+    assert len(all_moves) == len(expected)
+    assert set(all_moves) == expected
+
+
+def test_all_moves2():
+    engine = Engine()
+    engine.setup('classic')
+
+    all_moves = engine.all_moves(PLAYER.WHITE)
+    assert engine.all_moves(PLAYER.WHITE) is all_moves
+
+    # Po zmianie pozycji ruchy są liczone od nowa.
+    engine.set_field(11, 13, STATE.WHITE)
+    assert encode_move(index(11, 13), index(10, 13)) in \
+        engine.all_moves(PLAYER.WHITE)
+    assert encode_move(index(11, 13), index(10, 13)) not in all_moves
+
+
+# Metoda get_hash.
+#
+# Hasz Zobrista jest aktualizowany
+# przy każdej zmianie pozycji.
+
+
+def test_hash1():
+    engine1 = Engine()
+    engine1.setup('classic')
+
+    engine2 = Engine()
+    engine2.setup('classic')
+
+    assert engine1.get_hash() == engine2.get_hash()
+
+    # Dwie zamiany w różnej kolejności
+    # dają tę samą pozycję.
+    engine1.set_field(8, 8, STATE.WHITE)
+    engine1.set_field(0, 0, STATE.EMPTY)
+
+    engine2.set_field(0, 0, STATE.EMPTY)
+    engine2.set_field(8, 8, STATE.WHITE)
+
+    assert engine1.get_hash() == engine2.get_hash()
+    assert engine1.get_hash() == compute_hash(
+            engine1.get_bitboard(PLAYER.WHITE),
+            engine1.get_bitboard(PLAYER.BLACK),
+            False)
+
+
+def test_hash2():
+    engine = Engine()
+    engine.setup('classic')
+    h = engine.get_hash()
+
+    engine.moving_player = PLAYER.BLACK
+    assert engine.get_hash() != h
+
+    engine.moving_player = PLAYER.WHITE
+    assert engine.get_hash() == h
+
+
+def test_hash3():
+    from tests.rc import engine_state1 as state
+
+    engine = Engine()
+    engine.load_state(state)
+
+    assert engine.get_hash() == compute_hash(
+            engine.get_bitboard(PLAYER.WHITE),
+            engine.get_bitboard(PLAYER.BLACK),
+            True)
+
+
+# Metody make_move, unmake_move.
+#
+# Pierwsza wykonuje ruch, druga
+# go cofa.
+
+
+def test_make_unmake1():
+    engine = Engine()
+    engine.setup('classic')
+
+    engine.make_move(encode_move(index(11, 15), index(11, 13)))
+
+    assert engine.read_field(11, 15) == STATE.EMPTY
+    assert engine.read_field(11, 13) == STATE.WHITE
+    assert engine.moving_player == PLAYER.BLACK
+    assert engine.get_hash() == compute_hash(
+            engine.get_bitboard(PLAYER.WHITE),
+            engine.get_bitboard(PLAYER.BLACK),
+            True)
+
+    engine.make_move(encode_move(index(4, 0), index(5, 0)))
+    assert engine.moving_player == PLAYER.WHITE
+    assert engine.move == 2
+
+
+def test_make_unmake2():
+    engine = Engine()
+    engine.setup('classic')
+
+    state = engine.dump_state()
+    h = engine.get_hash()
+
+    for move in engine.all_moves(PLAYER.WHITE):
+        engine.make_move(move)
+        for reply in engine.all_moves(PLAYER.BLACK):
+            engine.make_move(reply)
+            engine.unmake_move()
+        engine.unmake_move()
+
+    assert str(engine.dump_state()) == str(state)
+    assert engine.get_hash() == h
+
+
+def test_make_unmake3():
+    engine = Engine()
+    engine.setup('classic')
+
+    with raises(ValueError):
+        engine.make_move(encode_move(index(8, 8), index(8, 9)))
+
+    with raises(ValueError):
+        engine.make_move(encode_move(index(15, 15), index(15, 14)))
+
+
+def test_make_unmake4():
+    engine = Engine()
+    engine.setup('classic')
+
+    # Po zmianie pola nie można cofnąć
+    # ruchu wykonanego w innej pozycji.
+    engine.make_move(encode_move(index(11, 15), index(11, 13)))
+    engine.set_field(11, 13, STATE.EMPTY)
+    assert engine.get_undo_depth() == 0
+
+    with raises(IndexError):
+        engine.unmake_move()
+
+    assert engine.read_field(11, 15) == STATE.EMPTY
+    assert engine.get_hash() == compute_hash(
+            engine.get_bitboard(PLAYER.WHITE),
+            engine.get_bitboard(PLAYER.BLACK),
+            True)
+
+
+# Składniki oceny pozycji.
+#
+# Są aktualizowane przyrostowo, a w trybie
+# debug sprawdzane po każdym ruchu.
+
+
+def test_terms1():
+    engine = Engine()
+    engine.setup('classic')
+
+    assert engine.stragglers(PLAYER.WHITE) == 19
+    assert engine.stragglers(PLAYER.BLACK) == 19
+    assert engine.pieces_in_target(PLAYER.WHITE) == 0
+    assert engine.pieces_in_target(PLAYER.BLACK) == 0
+    assert engine.dist_sum(PLAYER.WHITE) == engine.dist_sum(PLAYER.BLACK)
+
+
+def test_terms2():
+    engine = Engine(debug=True)
+    engine.setup('classic')
+
+    terms = engine._get_terms()
+
+    # Tryb debug porównuje składniki
+    # z liczonymi od nowa.
+    for move in engine.all_moves(PLAYER.WHITE):
+        engine.make_move(move)
+        for reply in engine.all_moves(PLAYER.BLACK):
+            engine.make_move(reply)
+            engine.unmake_move()
+        engine.unmake_move()
+
+    assert engine._get_terms() == terms
+
+    engine.make_move(encode_move(index(11, 15), index(11, 13)))
+    assert engine.stragglers(PLAYER.WHITE) == 18
+    assert engine.copy()._get_terms() == engine._compute_terms()
+
+
+def test_terms3():
+    engine = Engine(debug=True)
+    engine.set_field(0, 0, STATE.WHITE)
+    engine.set_field(15, 15, STATE.BLACK)
+
+    assert engine.pieces_in_target(PLAYER.WHITE) == 1
+    assert engine.pieces_in_target(PLAYER.BLACK) == 1
+    assert engine.dist_sum(PLAYER.WHITE) == 0
+
+    engine.set_dist_tables([1] * 256, [2] * 256)
+    assert engine.dist_sum(PLAYER.WHITE) == 1
+    assert engine.dist_sum(PLAYER.BLACK) == 2
+
+    # Składniki niezgodne z pozycją.
+    engine._white_dist += 1
+    with raises(AssertionError):
+        engine.make_move(encode_move(index(0, 0), index(1, 1)))
+
+
+# Metoda pieces.
+#
+# Listy pionków są aktualizowane
+# przy każdej zmianie pozycji.
+
+
+def test_pieces1():
+    engine = Engine()
+    engine.setup('classic')
+
+    assert sorted(engine.pieces(PLAYER.WHITE)) == sorted(
+            i for i in range(256) if WHITE_CAMP_MASK >> i & 1)
+    assert sorted(engine.pieces(PLAYER.BLACK)) == sorted(
+            i for i in range(256) if BLACK_CAMP_MASK >> i & 1)
+
+
+def test_pieces2():
+    engine = Engine(debug=True)
+    engine.setup('classic')
+
+    pieces = list(engine.pieces(PLAYER.WHITE))
+
+    engine.make_move(encode_move(index(11, 15), index(11, 13)))
+    assert index(11, 13) in engine.pieces(PLAYER.WHITE)
+    assert index(11, 15) not in engine.pieces(PLAYER.WHITE)
+    assert len(engine.pieces(PLAYER.WHITE)) == 19
+
+    engine.unmake_move()
+    assert engine.pieces(PLAYER.WHITE) == pieces
+
+    engine.set_field(11, 15, STATE.EMPTY)
+    engine.set_field(8, 8, STATE.BLACK)
+    assert len(engine.pieces(PLAYER.WHITE)) == 18
+    assert index(8, 8) in engine.pieces(PLAYER.BLACK)
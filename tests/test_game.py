@@ -40,6 +40,7 @@ def test_save_load1():
     assert i.current_move() == i2.current_move()
     assert i.moving_player() == i2.moving_player()
     assert str(e._board) == str(e2._board)
+    assert e.get_hash() == e2.get_hash()
 
 
 def test_save_load2():
@@ -0,0 +1,154 @@
+# Testy jednostkowe dla modułu
+# halma/geometry.py
+#
+# Autor: Antoni Przybylik
+
+from halma.defs import CAMP
+
+from halma.geometry import index
+from halma.geometry import field
+from halma.geometry import iter_bits
+from halma.geometry import encode_move
+from halma.geometry import fields_to_move
+from halma.geometry import move_to_fields
+from halma.geometry import move_to_str
+from halma.geometry import str_to_move
+from halma.geometry import BLACK_CAMP_MASK
+from halma.geometry import WHITE_CAMP_MASK
+from halma.geometry import CAMP_SIZE
+from halma.geometry import CAMP_TABLE
+from halma.geometry import STEPS
+from halma.geometry import JUMPS
+from halma.geometry import DIAGONAL_MASKS
+from halma.geometry import disengaged
+from halma.geometry import DIST_TO_BLACK_CORNER
+from halma.geometry import DIST_TO_WHITE_CORNER
+from halma.geometry import DIST_TO_BLACK_CAMP
+from halma.geometry import DIST_TO_WHITE_CAMP
+
+
+# Funkcje index, field.
+#
+# Zamieniają współrzędne pola
+# na indeks i z powrotem.
+
+
+def test_index_field():
+    for y in range(16):
+        for x in range(16):
+            assert field(index(y, x)) == (y, x)
+
+
+# Funkcja iter_bits.
+#
+# Przechodzi po zapalonych bitach.
+
+
+def test_iter_bits():
+    bb = (1 << 0) | (1 << 17) | (1 << 255)
+    assert list(iter_bits(bb)) == [0, 17, 255]
+
+
+# Zapis ruchów.
+#
+# Zamiana ruchu zakodowanego jako liczba
+# na parę pól i zapis XY-XY i z powrotem.
+
+
+def test_move_conversion():
+    move = encode_move(index(1, 2), index(15, 0))
+
+    assert move_to_fields(move) == ((1, 2), (15, 0))
+    assert fields_to_move((1, 2), (15, 0)) == move
+    assert move_to_str(move) == 'BC-PA'
+    assert str_to_move('BC-PA') == move
+    assert str_to_move('bc-pa') == move
+
+    for move in range(1 << 16):
+        assert fields_to_move(*move_to_fields(move)) == move
+        assert str_to_move(move_to_str(move)) == move
+
+
+# Bitboardy obozów.
+
+
+def test_camp_masks():
+    assert bin(BLACK_CAMP_MASK).count('1') == 19
+    assert bin(WHITE_CAMP_MASK).count('1') == 19
+    assert BLACK_CAMP_MASK & WHITE_CAMP_MASK == 0
+    assert (BLACK_CAMP_MASK >> index(1, 4)) & 1
+    assert not (BLACK_CAMP_MASK >> index(1, 5)) & 1
+    assert (WHITE_CAMP_MASK >> index(14, 14)) & 1
+
+
+def test_camp_table():
+    assert len(CAMP_TABLE) == 256
+    assert CAMP_TABLE.count(CAMP.BLACK) == CAMP_SIZE
+    assert CAMP_TABLE.count(CAMP.WHITE) == CAMP_SIZE
+    assert CAMP_TABLE[index(4, 1)] == CAMP.BLACK
+    assert CAMP_TABLE[index(4, 2)] is None
+    assert CAMP_TABLE[index(15, 15)] == CAMP.WHITE
+
+
+# Tablice STEPS, JUMPS.
+#
+# Sąsiedzi i skoki dla każdego pola.
+
+
+def test_steps():
+    assert sorted(STEPS[index(0, 0)]) == sorted([index(0, 1),
+                                                index(1, 0),
+                                                index(1, 1)])
+    assert len(STEPS[index(8, 8)]) == 8
+    assert len(STEPS[index(0, 8)]) == 5
+
+
+def test_jumps():
+    assert sorted(JUMPS[index(0, 0)]) == sorted([(index(0, 1), index(0, 2)),
+                                                (index(1, 0), index(2, 0)),
+                                                (index(1, 1), index(2, 2))])
+    assert len(JUMPS[index(8, 8)]) == 8
+    assert len(JUMPS[index(14, 8)]) == 5
+    assert len(JUMPS[index(15, 15)]) == 3
+
+
+# Przekątne i funkcja disengaged.
+#
+# Sprawdza, czy armie się minęły.
+
+
+def test_diagonal_masks():
+    assert len(DIAGONAL_MASKS) == 31
+    assert sum(bin(m).count('1') for m in DIAGONAL_MASKS) == 256
+    assert DIAGONAL_MASKS[0] == 1 << index(0, 0)
+    assert DIAGONAL_MASKS[15] >> index(15, 0) & 1
+
+
+def test_disengaged():
+    assert not disengaged(WHITE_CAMP_MASK, BLACK_CAMP_MASK)
+    assert disengaged(BLACK_CAMP_MASK, WHITE_CAMP_MASK)
+
+    # Przekątne 7 i 10 - pionki nie sąsiadują.
+    assert disengaged(1 << index(3, 4), 1 << index(5, 5))
+
+    # Przekątne 8 i 10 - pionki sąsiadują.
+    assert not disengaged(1 << index(4, 4), 1 << index(5, 5))
+
+
+# Tablice odległości pól.
+
+
+def test_dist_tables():
+    assert DIST_TO_BLACK_CORNER[index(0, 0)] == 0
+    assert DIST_TO_BLACK_CORNER[index(3, 7)] == 7
+    assert DIST_TO_WHITE_CORNER[index(3, 7)] == 12
+
+    for i in range(256):
+        inside = bool(BLACK_CAMP_MASK >> i & 1)
+        assert (DIST_TO_BLACK_CAMP[i] == 0) == inside
+        y, x = field(i)
+        assert DIST_TO_WHITE_CAMP[index(15 - y, 15 - x)] == \
+            DIST_TO_BLACK_CAMP[i]
+
+    assert DIST_TO_BLACK_CAMP[index(0, 6)] == 2
+    assert DIST_TO_BLACK_CAMP[index(5, 5)] == 3
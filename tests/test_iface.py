@@ -11,6 +11,9 @@ from halma.defs import STATE
 from halma.defs import CAMP
 from halma.defs import PLAYER
 
+from halma.geometry import index
+from halma.geometry import encode_move
+
 # Metoda in_camp.
 #
 # Ta funkcja mówi, czy
@@ -218,3 +221,23 @@ def test_winner5():
     engine.set_field(2, 2, STATE.EMPTY)
 
     assert game_iface.get_winner() is None
+
+
+def test_winner6():
+    engine = Engine()
+    game_iface = GameInterface(engine)
+    game_iface.setup('classic')
+
+    # Zwycięzca zmienia się przy
+    # wykonywaniu i cofaniu ruchów.
+    engine.set_field(4, 1, STATE.EMPTY)
+    engine.set_field(5, 2, STATE.WHITE)
+    assert game_iface.get_winner() is None
+    assert engine.camp_empty(PLAYER.BLACK) == 1
+
+    engine.make_move(encode_move(index(5, 2), index(4, 1)))
+    assert game_iface.get_winner() == PLAYER.WHITE
+    assert engine.camp_empty(PLAYER.BLACK) == 0
+
+    engine.unmake_move()
+    assert game_iface.get_winner() is None
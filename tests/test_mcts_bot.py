@@ -0,0 +1,149 @@
+# Testy bota MctsBot.
+#
+# Autor: Antoni Przybylik
+
+from pytest import raises
+
+from bots.mcts_bot import MctsBot
+from halma.engine import Engine
+from halma.position import Position
+
+from halma.defs import PLAYER
+from halma.defs import STATE
+
+from halma.geometry import index
+from halma.geometry import encode_move
+from halma.geometry import BLACK_CAMP_MASK
+
+
+# Konstruktor.
+#
+# Bot musi mieć jakiś limit przeszukiwania.
+
+
+def test_no_limit():
+    engine = Engine()
+    engine.setup('classic')
+
+    with raises(ValueError):
+        MctsBot(PLAYER.WHITE, engine, playouts=None, time_limit=None)
+
+
+# Metoda _rollout_move.
+#
+# Zachłanna strategia rozgrywek.
+
+
+def test_rollout_move_forward():
+    engine = Engine()
+    engine.set_position(Position(1 << index(8, 8), 0, PLAYER.WHITE))
+
+    bot = MctsBot(PLAYER.WHITE, engine, epsilon=0)
+    move = bot._rollout_move(PLAYER.WHITE, engine.get_bitboard(PLAYER.WHITE),
+                             0)
+    assert move == encode_move(index(8, 8), index(7, 7))
+
+
+def test_rollout_move_camp():
+    engine = Engine()
+    engine.setup('classic')
+
+    # Pionek w obozie przeciwnika nie
+    # powinien się ruszać.
+    white = BLACK_CAMP_MASK & -BLACK_CAMP_MASK
+    black = 1 << index(15, 15)
+
+    bot = MctsBot(PLAYER.WHITE, engine, epsilon=0)
+    assert bot._move_quality(encode_move(index(0, 0), index(1, 1)),
+                             PLAYER.WHITE) < 0
+    assert bot._rollout_move(PLAYER.WHITE, white, black) is not None
+
+
+# Metoda make_move.
+#
+# Bot wykonuje poprawny ruch, przestrzega
+# limitu rozgrywek i zachowuje drzewo.
+
+
+def test_make_move():
+    engine = Engine()
+    engine.setup('classic')
+
+    legal = engine.all_moves(PLAYER.WHITE)
+
+    bot = MctsBot(PLAYER.WHITE, engine, playouts=50, seed=1)
+    field1, field2 = bot.make_move()
+
+    assert encode_move(index(*field1), index(*field2)) in legal
+    assert engine.read_field(*field2) == STATE.WHITE
+    assert engine.moving_player == PLAYER.BLACK
+
+    stats = bot.search_stats()
+    assert stats['playouts'] == 50
+    assert stats['playouts_per_second'] > 0
+
+
+def test_tree_reuse():
+    engine = Engine()
+    engine.setup('classic')
+
+    bot = MctsBot(PLAYER.WHITE, engine, playouts=100, seed=1)
+    enemy = MctsBot(PLAYER.BLACK, engine, playouts=20, seed=2)
+
+    bot.make_move()
+    enemy.make_move()
+    bot.make_move()
+
+    # Odpowiedź przeciwnika była już w drzewie
+    # (bot rozwija ruchy najlepsze według
+    # strategii rozgrywek jako pierwsze).
+    assert bot.search_stats()['reused_visits'] > 0
+
+
+def test_tree_limit():
+    engine = Engine()
+    engine.setup('classic')
+
+    bot = MctsBot(PLAYER.WHITE, engine, playouts=100, seed=1)
+    enemy = MctsBot(PLAYER.BLACK, engine, playouts=20, seed=2)
+    assert bot.max_tree_visits == 400
+
+    # Za duże drzewo jest budowane od nowa.
+    bot.max_tree_visits = 0
+    bot.make_move()
+    enemy.make_move()
+    bot.make_move()
+
+    assert bot.search_stats()['reused_visits'] == 0
+
+
+def test_no_moves():
+    from bots.minimax_bot import MinimaxBot
+    from bots.forward_bot import ForwardBot
+    from bots.random_bot import RandomBot
+
+    engine = Engine()
+    black = 0
+    for y, x in ((0, 1), (0, 2), (1, 0), (1, 1), (2, 0), (2, 2)):
+        black |= 1 << index(y, x)
+    engine.set_position(Position(1 << index(0, 0), black, PLAYER.WHITE))
+
+    # Bez ruchów każdy bot zwraca None
+    # i nie zmienia pozycji.
+    for bot_class in (MctsBot, MinimaxBot, ForwardBot, RandomBot):
+        bot = bot_class(PLAYER.WHITE, engine)
+        assert bot.make_move() is None
+        assert engine.get_undo_depth() == 0
+
+
+def test_single_move():
+    engine = Engine()
+    black = 0
+    for y, x in ((0, 1), (0, 2), (1, 0), (2, 0)):
+        black |= 1 << index(y, x)
+    engine.set_position(Position(1 << index(0, 0), black, PLAYER.WHITE))
+
+    # Jedyny ruch nie wymaga przeszukiwania.
+    bot = MctsBot(PLAYER.WHITE, engine, playouts=1000)
+    assert bot.make_move() == ((0, 0), (1, 1))
+    assert bot.search_stats()['playouts'] == 1
@@ -3,12 +3,18 @@
 # Autor: Antoni Przybylik
 
 from bots.minimax_bot import MinimaxBot
+from bots.search import SearchBot
+from bots.search import INFINITY
+from bots.search import WIN_SCORE
 from halma.engine import Engine
 
 from halma.defs import PLAYER
 from halma.defs import STATE
 
-import copy
+from halma.geometry import index
+from halma.geometry import encode_move
+from halma.geometry import STEPS
+
 
 # Metoda _state_quality.
 #
@@ -20,7 +26,7 @@ def test_state_quality1():
     engine.setup('classic')
 
     bot = MinimaxBot(PLAYER.WHITE, engine)
-    assert bot._state_quality(engine._board) == 0
+    assert bot._state_quality(engine) == 0
 
 
 def test_state_quality2():
@@ -29,7 +35,7 @@ def test_state_quality2():
     engine.set_field(1, 1, STATE.WHITE)
 
     bot = MinimaxBot(PLAYER.WHITE, engine)
-    assert bot._state_quality(engine._board) == 15
+    assert bot._state_quality(engine) == 15
 
 
 def test_state_quality3():
@@ -38,26 +44,224 @@ def test_state_quality3():
     engine.set_field(8, 8, STATE.WHITE)
 
     bot = MinimaxBot(PLAYER.WHITE, engine)
-    assert bot._state_quality(engine._board) == 8
+    assert bot._state_quality(engine) == 8
+
+
+# Domyślna ocena SearchBot jest
+# taka sama jak ocena MinimaxBot.
+
+
+def test_default_evaluate():
+    from tests.rc import engine_state2 as state
+
+    engine = Engine()
+    engine.load_state(state)
+
+    bot = MinimaxBot(PLAYER.WHITE, engine)
+    base = SearchBot(PLAYER.WHITE, engine)
+    for move in engine.all_moves(PLAYER.WHITE):
+        engine.make_move(move)
+        assert base._evaluate(engine) == bot._evaluate(engine)
+        engine.unmake_move()
+    assert base._evaluate(engine) == bot._evaluate(engine)
+
+
+# Metoda _minimax.
+#
+# Przeszukuje drzewo gry wykonując
+# i cofając ruchy na silniku.
+
+
+def test_minimax_restores():
+    engine = Engine()
+    engine.setup('classic')
+
+    board = engine.get_board()
+    h = engine.get_hash()
+
+    bot = MinimaxBot(PLAYER.WHITE, engine)
+    bot._minimax(engine, 2)
+
+    assert str(engine.get_board()) == str(board)
+    assert engine.get_hash() == h
+    assert engine.moving_player == PLAYER.WHITE
+
+
+# Metoda _search.
+#
+# Przeszukuje drzewo gry algorytmem
+# alfa-beta. Ocena ma być taka sama
+# jak dla zwykłego algorytmu MiniMax.
+# Spośród równie dobrych ruchów może
+# zostać wybrany inny (zależy to od
+# kolejności sprawdzania ruchów).
+
+
+def test_alphabeta1():
+    engine = Engine()
+    engine.setup('classic')
+
+    bot = MinimaxBot(PLAYER.WHITE, engine)
+
+    bot.nodes = 0
+    expected = bot._minimax(engine, 2)
+    minimax_nodes = bot.nodes
+
+    move, score = bot._search(engine, 2)
+    assert score == expected[1]
+
+    engine.make_move(move)
+    assert -bot._minimax(engine, 1)[1] == score
+    engine.unmake_move()
+
+    assert bot.nodes < minimax_nodes
+
+
+def test_alphabeta2():
+    from tests.rc import engine_state1 as state
+
+    engine = Engine()
+    engine.load_state(state)
+
+    bot = MinimaxBot(PLAYER.BLACK, engine)
+
+    bot.nodes = 0
+    expected = bot._minimax(engine, 2)
+    minimax_nodes = bot.nodes
+
+    move, score = bot._search(engine, 2)
+    assert score == expected[1]
+
+    engine.make_move(move)
+    assert -bot._minimax(engine, 1)[1] == score
+    engine.unmake_move()
+
+    assert bot.nodes < minimax_nodes
+
+
+# Metoda _iterative_search.
+#
+# Pogłębianie iteracyjne korzystające
+# z wyników poprzednich iteracji.
+
+
+def test_iterative_search():
+    from tests.rc import engine_state2 as state
+
+    engine = Engine()
+    engine.load_state(state)
+
+    bot = MinimaxBot(PLAYER.WHITE, engine)
+    expected = bot._search(engine, 2)
+
+    assert bot._iterative_search(engine, 2) == expected
+    assert bot._pv[0][0] == expected[0]
+    assert bot._root_moves[0] == expected[0]
+
+
+# Porządkowanie ruchów.
+#
+# Ruchy-zabójcy i tablica historii
+# mają być wypełniane przy odcięciach.
+
+
+def test_move_ordering():
+    from tests.rc import engine_state2 as state
+
+    engine = Engine()
+    engine.load_state(state)
+
+    bot = MinimaxBot(PLAYER.WHITE, engine)
+    bot._search(engine, 3)
+
+    stats = bot.search_stats()
+    assert stats['cutoffs'] > 0
+    assert stats['nodes'] == bot.nodes
+    assert 0 < stats['first_cutoff_rate'] <= 1
+    assert 0 < stats['killer_cutoff_rate'] <= 1
+
+    assert bot._killers[1][0] is not None
+    assert any(bot._history)
+
+
+def test_staged_order():
+    engine = Engine()
+    engine.setup('classic')
+
+    engine.make_move(encode_move(index(11, 15), index(10, 14)))
+    engine.make_move(encode_move(index(4, 0), index(5, 1)))
+
+    bot = MinimaxBot(PLAYER.WHITE, engine)
+    tt_move = encode_move(index(11, 14), index(9, 14))
+    killer = encode_move(index(15, 11), index(15, 10))
+    bot._store_cutoff(killer, 1, 2)
+
+    moves = list(bot._staged_moves(engine, 2, [tt_move]))
+    assert sorted(moves) == sorted(engine.all_moves(PLAYER.WHITE))
+    assert moves[0] == tt_move
+
+    # Ruch-zabójca o jedno pole jest pierwszy
+    # wśród ruchów o jedno pole, ale po skokach.
+    n_jumps = sum((m & 255) not in STEPS[m >> 8] for m in moves)
+    assert moves[n_jumps] == killer
+
+
+def test_progress():
+    engine = Engine()
+    engine.setup('classic')
+
+    bot = MinimaxBot(PLAYER.WHITE, engine)
+    move = encode_move(index(11, 15), index(9, 13))
+    assert bot._progress(move, PLAYER.WHITE) == 4
+    assert bot._progress(move, PLAYER.BLACK) == -4
+
+
+# Ocena z uwzględnieniem skoków.
+#
+# Tablice odległości są liczone w korzeniu,
+# a wynik alfa-beta ma się zgadzać z MiniMax.
+
+
+def test_jump_aware():
+    from tests.rc import engine_state2 as state
+
+    engine = Engine()
+    engine.load_state(state)
+
+    bot = MinimaxBot(PLAYER.WHITE, engine, jump_aware=True)
+    quality = bot._state_quality(engine)
+
+    bot._set_dist_tables(engine)
+    assert bot._state_quality(engine) != quality
+
+    bot.nodes = 0
+    expected = bot._minimax(engine, 2)
+
+    move, score = bot._search(engine, 2)
+    assert score == expected[1]
 
 
-# Metody _move_on_board, _reverse_move_on_board.
+# Koniec gry.
 #
-# Pierwsza przemieszcza pionek na planszy, druga
-# cofa ruch.
+# Wygrana jest oceniana wyżej niż
+# każda inna pozycja.
 
 
-def test_move_reverse():
+def test_win():
     engine = Engine()
     engine.setup('classic')
 
-    board1 = copy.deepcopy(engine._board)
-    board2 = copy.deepcopy(engine._board)
+    engine.set_field(4, 1, STATE.EMPTY)
+    engine.set_field(5, 2, STATE.WHITE)
 
     bot = MinimaxBot(PLAYER.WHITE, engine)
+    move, score = bot._search(engine, 2)
 
-    my_move = [(2, 2), (3, 3)]
-    bot._move_on_board(board1, *my_move)
-    bot._reverse_move_on_board(board1, *my_move)
+    assert move == encode_move(index(5, 2), index(4, 1))
+    assert score == WIN_SCORE + 1
+    assert bot._minimax(engine, 2)[1] == score
 
-    assert str(board1) == str(board2)
+    # Po wygranej nie ma już czego szukać.
+    engine.make_move(move)
+    assert bot._alphabeta(engine, 2, -INFINITY, INFINITY) == \
+        (None, -WIN_SCORE - 2)
@@ -0,0 +1,195 @@
+# Testy jednostkowe dla modułów
+# halma/movegen.py i halma/position.py
+#
+# Autor: Antoni Przybylik
+
+from halma.engine import Engine
+
+from halma.defs import PLAYER
+
+from halma.geometry import index
+from halma.geometry import encode_move
+from halma.geometry import BIT
+from halma.geometry import STEPS
+from halma.geometry import BLACK_CAMP_MASK
+from halma.geometry import DIST_TO_BLACK_CAMP
+
+from halma.movegen import generate_moves
+from halma.movegen import jump_distances
+from halma.movegen import targets
+from halma.movegen import iter_targets
+from halma.movegen import is_legal
+
+from halma.position import Position
+
+
+# Funkcja generate_moves.
+#
+# Generuje ruchy dla pozycji
+# bez korzystania z silnika.
+
+
+def test_generate_moves1():
+    engine = Engine()
+    engine.setup('random')
+
+    position = engine.get_position()
+
+    assert sorted(generate_moves(position)) == \
+        sorted(engine.all_moves(PLAYER.WHITE))
+    assert sorted(generate_moves(position, PLAYER.BLACK)) == \
+        sorted(engine.all_moves(PLAYER.BLACK))
+
+
+def test_generate_moves2():
+    engine = Engine()
+    engine.setup('classic')
+
+    root = engine.get_position()
+
+    # Pozycje potomne nie zmieniają silnika.
+    for move in generate_moves(root):
+        child = root.play(move)
+        assert child.moving_player == PLAYER.BLACK
+
+        engine.make_move(move)
+        assert child == engine.get_position()
+        assert child.get_hash() == engine.get_hash()
+        assert sorted(generate_moves(child)) == \
+            sorted(engine.all_moves(PLAYER.BLACK))
+        engine.unmake_move()
+
+    assert engine.get_position() == root
+
+
+# Metody get_position, set_position.
+
+
+def test_set_position():
+    engine1 = Engine()
+    engine1.setup('classic')
+    engine1.make_move(encode_move(index(11, 15), index(11, 13)))
+
+    engine2 = Engine()
+    engine2.set_position(engine1.get_position())
+
+    assert engine2.get_hash() == engine1.get_hash()
+    assert engine2.get_board() == engine1.get_board()
+
+
+# Metody to_bytes, from_bytes.
+
+
+def test_position_bytes():
+    engine = Engine()
+    engine.setup('random')
+    engine.moving_player = PLAYER.BLACK
+
+    position = engine.get_position()
+    data = position.to_bytes()
+
+    assert len(data) == 65
+    assert Position.from_bytes(data) == position
+
+
+# Funkcja jump_distances.
+#
+# Dla pustych pól odległość ma być taka
+# sama jak najkrótsza droga pionka, który
+# rusza się sam, gdy inne stoją w miejscu.
+
+
+def forward_distance(start, camp, occupied):
+    """! Liczy odległość przeszukiwaniem od pola startowego. """
+
+    dist = {start: 0}
+    queue = [start]
+    for current in queue:
+        if (camp & BIT[current]):
+            return dist[current]
+        steps, jumps, _ = targets(current, occupied)
+        for n in steps + jumps:
+            if (n not in dist):
+                dist[n] = dist[current] + 1
+                queue.append(n)
+
+    return None
+
+
+def test_jump_distances1():
+    dist = jump_distances(BLACK_CAMP_MASK, 0, DIST_TO_BLACK_CAMP)
+    assert dist == list(DIST_TO_BLACK_CAMP)
+
+    # Dwa skoki po przekątnej to jeden ruch.
+    occupied = BIT[index(6, 6)] | BIT[index(4, 4)]
+    dist = jump_distances(BLACK_CAMP_MASK, occupied, DIST_TO_BLACK_CAMP)
+    assert DIST_TO_BLACK_CAMP[index(7, 7)] == 5
+    assert dist[index(7, 7)] == 2
+
+
+def test_jump_distances2():
+    from tests.rc import engine_state2 as state
+
+    engine = Engine()
+    engine.load_state(state)
+    occupied = engine.get_occupied()
+
+    dist = jump_distances(BLACK_CAMP_MASK, occupied, DIST_TO_BLACK_CAMP)
+    for i in range(256):
+        if (not occupied & BIT[i]):
+            expected = forward_distance(i, BLACK_CAMP_MASK, occupied)
+            if (expected is None):
+                expected = DIST_TO_BLACK_CAMP[i]
+            assert dist[i] == expected
+
+
+# Funkcje iter_targets, is_legal i metoda
+# Engine.staged_moves.
+#
+# Generują ruchy leniwie, żeby można było
+# przerwać po znalezieniu szukanego ruchu.
+
+
+def test_iter_targets():
+    engine = Engine()
+    engine.setup('random')
+
+    occupied = engine.get_occupied()
+    for start in range(256):
+        others = occupied & ~BIT[start]
+        steps, jumps, _ = targets(start, others)
+        assert list(iter_targets(start, others)) == steps + jumps
+
+
+def test_is_legal():
+    engine = Engine()
+    engine.setup('random')
+
+    mine = engine.get_bitboard(PLAYER.WHITE)
+    occupied = engine.get_occupied()
+    legal = set(engine.all_moves(PLAYER.WHITE))
+
+    for move in range(1 << 16):
+        assert is_legal(move, mine, occupied) == (move in legal)
+
+
+def test_staged_moves():
+    engine = Engine()
+    engine.setup('classic')
+
+    engine.make_move(encode_move(index(11, 15), index(10, 14)))
+    engine.make_move(encode_move(index(4, 0), index(5, 1)))
+
+    tt_move = encode_move(index(11, 14), index(9, 14))
+    bad_move = encode_move(index(0, 0), index(7, 7))
+    moves = list(engine.staged_moves((tt_move, bad_move, tt_move)))
+
+    # Każdy ruch występuje dokładnie raz,
+    # a ruch z tablicy jest pierwszy.
+    assert sorted(moves) == sorted(engine.all_moves(PLAYER.WHITE))
+    assert moves[0] == tt_move
+
+    # Skoki przed ruchami o jedno pole.
+    kinds = [(m & 255) in STEPS[m >> 8] for m in moves[1:]]
+    assert kinds == sorted(kinds)
+    assert not kinds[0] and kinds[-1]
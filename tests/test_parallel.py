@@ -0,0 +1,226 @@
+# Testy równoległego przeszukiwania
+# z pliku bots/parallel.py
+#
+# Autor: Antoni Przybylik
+
+from bots.parallel import ParallelRootSearch
+from bots.minimax_bot import MinimaxBot
+from bots.control import SearchControl
+from bots.search import INFINITY
+from halma.engine import Engine
+
+from halma.defs import PLAYER
+
+from pytest import raises
+
+import threading
+import time
+
+
+# Przeszukiwanie w wielu procesach
+# ma dawać tę samą ocenę co w jednym.
+
+
+def test_parallel_search():
+    from tests.rc import engine_state2 as state
+
+    engine = Engine()
+    engine.load_state(state)
+
+    bot = MinimaxBot(PLAYER.WHITE, engine)
+    expected = bot._iterative_search(engine, 2)
+
+    parallel = ParallelRootSearch(MinimaxBot, workers=2)
+    try:
+        bot = MinimaxBot(PLAYER.WHITE, engine, parallel=parallel)
+        result = bot._iterative_search(engine, 2)
+    finally:
+        parallel.close()
+
+    assert result[1] == expected[1]
+    assert engine.get_undo_depth() == 0
+    assert len(parallel.worker_nodes) > 0
+    assert sum(parallel.worker_nodes.values()) < bot.nodes
+
+
+def test_workers():
+    with raises(ValueError):
+        ParallelRootSearch(MinimaxBot, workers=0)
+
+
+def test_parallel_jump_aware():
+    from tests.rc import engine_state2 as state
+
+    engine = Engine()
+    engine.load_state(state)
+
+    bot = MinimaxBot(PLAYER.WHITE, engine, jump_aware=True)
+    expected = bot._iterative_search(engine, 2)
+
+    parallel = ParallelRootSearch(MinimaxBot, workers=2, jump_aware=True)
+    try:
+        bot = MinimaxBot(PLAYER.WHITE, engine, parallel=parallel,
+                         jump_aware=True)
+        result = bot._iterative_search(engine, 2)
+    finally:
+        parallel.close()
+
+    assert result[1] == expected[1]
+
+
+# Procesy są uruchamiane w konstruktorze.
+
+
+def test_warm_up():
+    parallel = ParallelRootSearch(MinimaxBot, workers=2)
+    try:
+        assert len(parallel._pool._processes) == 2
+    finally:
+        parallel.close()
+
+
+# Limit czasu i przerwanie.
+#
+# Limit czasu dotyczy wszystkich zadań
+# razem, niezależnie od liczby procesów.
+
+
+def test_time_limit():
+    from tests.rc import engine_state2 as state
+
+    engine = Engine()
+    engine.load_state(state)
+
+    parallel = ParallelRootSearch(MinimaxBot, workers=1)
+    try:
+        bot = MinimaxBot(PLAYER.WHITE, engine, parallel=parallel,
+                         time_limit=0.5)
+        start = time.time()
+        move = bot.make_move()
+        elapsed = time.time() - start
+    finally:
+        parallel.close()
+
+    assert move is not None
+    assert elapsed < 1.5
+
+
+def test_node_limit():
+    from tests.rc import engine_state2 as state
+
+    engine = Engine()
+    engine.load_state(state)
+
+    parallel = ParallelRootSearch(MinimaxBot, workers=2)
+    try:
+        bot = MinimaxBot(PLAYER.WHITE, engine, parallel=parallel,
+                         time_limit=None, node_limit=2000)
+        move = bot.make_move()
+    finally:
+        parallel.close()
+
+    # Limit dotyczy węzłów wszystkich procesów.
+    assert move is not None
+    assert bot.nodes <= 2000
+
+
+def test_cancel():
+    from tests.rc import engine_state2 as state
+
+    engine = Engine()
+    engine.load_state(state)
+
+    parallel = ParallelRootSearch(MinimaxBot, workers=1)
+    try:
+        bot = MinimaxBot(PLAYER.WHITE, engine, parallel=parallel,
+                         time_limit=None)
+        control = SearchControl()
+        timer = threading.Timer(0.3, control.cancel)
+        timer.start()
+
+        start = time.time()
+        move = bot.make_move(control)
+        elapsed = time.time() - start
+        timer.join()
+    finally:
+        parallel.close()
+
+    assert move is not None
+    assert elapsed < 1.5
+
+
+# Wspólna alfa.
+#
+# Alfa korzenia podniesiona w trakcie
+# przeszukiwania zawęża okno, ale oceny
+# większe od niej są nadal dokładne.
+
+
+def test_root_alpha():
+    from tests.rc import engine_state2 as state
+
+    engine = Engine()
+    engine.load_state(state)
+
+    bot = MinimaxBot(PLAYER.WHITE, engine)
+    move = engine.all_moves(PLAYER.WHITE)[0]
+    engine.make_move(move)
+
+    value = -bot._minimax(engine, 2)[1]
+
+    bot._root_alpha = value - 1
+    assert -bot._alphabeta(engine, 2, -INFINITY, INFINITY, 1)[1] == value
+
+    bot._root_alpha = value + 5
+    assert -bot._alphabeta(engine, 2, -INFINITY, INFINITY, 1)[1] <= \
+        value + 5
+
+
+# Łączenie wyników procesów.
+#
+# Ocena nie większa od alfy zadania to tylko
+# ograniczenie, więc nie może wygrać z
+# dokładną oceną, a większa od najlepszej
+# oceny wymaga ponownego przeszukania.
+
+
+class _FakeParallel:
+    """! Zwraca ustalone wyniki zamiast przeszukiwać. """
+
+    def __init__(self, results):
+        self.results = results
+
+    def search(self, position, moves, depth, alpha,
+               time_limit=None, node_limit=None, control=None, nodes=0):
+        return [(move, ) + self.results[move] for move in moves]
+
+
+def test_merge_bounds():
+    from tests.rc import engine_state2 as state
+
+    engine = Engine()
+    engine.load_state(state)
+
+    bot = MinimaxBot(PLAYER.WHITE, engine)
+    bot._start_search(engine)
+    moves = list(bot._root_moves)
+
+    # Pozostałe ruchy są bardzo słabe.
+    low = -INFINITY // 2
+    bot._parallel = _FakeParallel({})
+    for m in moves[1:]:
+        bot._parallel.results[m] = (low, [m], 0, low)
+
+    # Ograniczenie równe dokładnej ocenie, przed nią.
+    bot._parallel.results[moves[1]] = (10**5, [moves[1]], 0, 10**5)
+    bot._parallel.results[moves[2]] = (10**5, [moves[2]], 0, 0)
+
+    # Ograniczenie większe od najlepszej oceny.
+    bot._parallel.results[moves[3]] = (10**6, [moves[3]], 0, 10**6)
+
+    move, score = bot._parallel_search_root(engine, 1)
+
+    assert (move, score) == (moves[2], 10**5)
+    assert bot._pv[0] == [moves[2]]
+    assert bot._root_moves[0] == moves[2]
+    assert engine.get_undo_depth() == 0
@@ -0,0 +1,116 @@
+# Testy równoległego przeszukiwania Monte
+# Carlo z pliku bots/parallel_mcts.py
+#
+# Autor: Antoni Przybylik
+
+from bots.parallel_mcts import ParallelMcts
+from bots.mcts_bot import MctsBot
+from bots.control import SearchControl
+from halma.engine import Engine
+
+from halma.defs import PLAYER
+
+from pytest import raises
+
+import threading
+import time
+
+
+# Przeszukiwanie w wielu procesach.
+#
+# Statystyki korzenia wszystkich procesów
+# są łączone przed wyborem ruchu.
+
+
+def test_parallel_search():
+    engine = Engine()
+    engine.setup('classic')
+
+    legal = engine.all_moves(PLAYER.WHITE)
+
+    parallel = ParallelMcts(MctsBot, workers=2)
+    try:
+        bot = MctsBot(PLAYER.WHITE, engine, playouts=40, parallel=parallel)
+        move = bot.search()
+
+        results = parallel.search(engine.get_position(), list(legal),
+                                  playouts=30)
+    finally:
+        parallel.close()
+
+    assert move in legal
+    assert bot.search_stats()['playouts'] == 40
+    assert engine.get_undo_depth() == 0
+
+    assert [r[0] for r in results] == list(legal)
+    assert sum(r[1] for r in results) == 30
+    assert all(0 <= r[2] <= r[1] for r in results)
+
+    # Wirtualne porażki są zdejmowane
+    # po zakończeniu rozgrywek.
+    assert not any(parallel._virtual[:len(legal)])
+    assert sum(parallel.worker_playouts.values()) == 70
+
+
+def test_limits():
+    engine = Engine()
+    engine.setup('classic')
+
+    with raises(ValueError):
+        ParallelMcts(MctsBot, workers=0)
+
+    parallel = ParallelMcts(MctsBot, workers=1)
+    try:
+        with raises(ValueError):
+            parallel.search(engine.get_position(), [0], None, None)
+    finally:
+        parallel.close()
+
+
+# Limit czasu i przerwanie.
+#
+# Procesy dostają wspólny termin zakończenia,
+# a przerwanie w procesie głównym zatrzymuje
+# rozgrywki we wszystkich procesach.
+
+
+def test_time_limit():
+    engine = Engine()
+    engine.setup('classic')
+
+    parallel = ParallelMcts(MctsBot, workers=1)
+    try:
+        bot = MctsBot(PLAYER.WHITE, engine, playouts=None, time_limit=0.5,
+                      parallel=parallel)
+        start = time.time()
+        move = bot.search()
+        elapsed = time.time() - start
+    finally:
+        parallel.close()
+
+    assert move is not None
+    assert elapsed < 1.5
+
+
+def test_cancel():
+    engine = Engine()
+    engine.setup('classic')
+
+    parallel = ParallelMcts(MctsBot, workers=2)
+    try:
+        bot = MctsBot(PLAYER.WHITE, engine, playouts=None, time_limit=60,
+                      parallel=parallel)
+        control = SearchControl()
+        timer = threading.Timer(0.3, control.cancel)
+        timer.start()
+
+        start = time.time()
+        move = bot.search(control)
+        elapsed = time.time() - start
+        timer.join()
+    finally:
+        parallel.close()
+
+    assert move is not None
+    assert elapsed < 1.5
+    assert not any(parallel._virtual[:len(engine.all_moves(PLAYER.WHITE))])
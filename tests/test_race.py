@@ -0,0 +1,108 @@
+# Testy rozwiązywania wyścigu
+# z pliku bots/race.py
+#
+# Autor: Antoni Przybylik
+
+from bots.race import RaceSolver
+from bots.agressive_minimax_bot import AgressiveMinimaxBot
+from halma.engine import Engine
+from halma.iface import GameInterface
+from halma.position import Position
+
+from halma.defs import PLAYER
+
+from halma.geometry import index
+from halma.geometry import field
+from halma.geometry import iter_bits
+from halma.geometry import BLACK_CAMP_MASK
+from halma.geometry import WHITE_CAMP_MASK
+
+
+def shift(mask, d):
+    """! Przesuwa pionki o d pól po przekątnej. """
+
+    result = 0
+    for i in iter_bits(mask):
+        y, x = field(i)
+        result |= 1 << index(y + d, x + d)
+    return result
+
+
+def play(mine, plan):
+    """! Wykonuje plan na bitboardzie. """
+
+    for move in plan:
+        mine ^= (1 << (move >> 8)) | (1 << (move & 255))
+    return mine
+
+
+# Metody is_disengaged klas
+# Engine i GameInterface.
+
+
+def test_is_disengaged():
+    engine = Engine()
+    iface = GameInterface(engine)
+
+    engine.setup('classic')
+    assert not iface.is_disengaged()
+
+    engine.set_position(Position(shift(WHITE_CAMP_MASK, -10),
+                                 shift(BLACK_CAMP_MASK, 10),
+                                 PLAYER.WHITE))
+    assert iface.is_disengaged()
+
+
+# Metoda solve.
+#
+# Blisko końca plan jest najkrótszy,
+# dalej plan ma doprowadzić do wygranej.
+
+
+def test_solve_exact():
+    white = BLACK_CAMP_MASK ^ (1 << index(4, 1)) ^ (1 << index(5, 2))
+
+    solver = RaceSolver(PLAYER.WHITE)
+    plan = solver.solve(white, WHITE_CAMP_MASK)
+
+    assert solver.optimal
+    assert len(plan) == 1
+    assert play(white, plan) == BLACK_CAMP_MASK
+
+
+def test_solve_race():
+    black = shift(BLACK_CAMP_MASK, 10)
+
+    solver = RaceSolver(PLAYER.BLACK)
+    plan = solver.solve(black, shift(WHITE_CAMP_MASK, -10))
+
+    assert play(black, plan) == WHITE_CAMP_MASK
+    assert len(plan) < 40
+
+
+def test_solve_done():
+    solver = RaceSolver(PLAYER.WHITE)
+    assert solver.solve(BLACK_CAMP_MASK, WHITE_CAMP_MASK) == []
+
+
+# Boty po minięciu się armii wykonują
+# ruchy z planu bez przeszukiwania.
+
+
+def test_bot_race_move():
+    engine = Engine()
+    engine.set_position(Position(shift(WHITE_CAMP_MASK, -10),
+                                 shift(BLACK_CAMP_MASK, 10),
+                                 PLAYER.WHITE))
+
+    bot = AgressiveMinimaxBot(PLAYER.WHITE, engine)
+    bot.make_move()
+    assert bot.nodes == 0
+    assert len(bot._race_plan) > 0
+
+    # Przeciwnik wykonuje ruch, plan
+    # pozostaje aktualny.
+    engine.make_move(engine.all_moves(PLAYER.BLACK)[0])
+    plan = list(bot._race_plan)
+    field1, field2 = bot.make_move()
+    assert (index(*field1) << 8 | index(*field2)) == plan[0]
@@ -0,0 +1,85 @@
+# Testy tablicy transpozycji we współdzielonej
+# pamięci z pliku bots/shared_transposition.py
+#
+# Autor: Antoni Przybylik
+
+from bots.shared_transposition import SharedTranspositionTable
+from bots.transposition import EXACT
+from bots.transposition import LOWER
+from bots.transposition import UPPER
+
+from bots.parallel import ParallelRootSearch
+from bots.minimax_bot import MinimaxBot
+from halma.engine import Engine
+
+from halma.defs import PLAYER
+
+from functools import partial
+
+
+# Metody probe, store.
+
+
+def test_store_probe():
+    tt = SharedTranspositionTable(1)
+    try:
+        key = 0xfedcba9876543210
+
+        assert tt.probe(key) is None
+        tt.store(key, 3, LOWER, -17, 258)
+        assert tt.probe(key) == (3, LOWER, -17, 258)
+
+        tt.store(key, 5, UPPER, 40, None)
+        assert tt.probe(key) == (5, UPPER, 40, None)
+
+        assert tt.hits == 2
+        assert tt.misses == 1
+        assert tt.cross_hits == 0
+        assert 0 < tt.fill_rate() < 1
+    finally:
+        tt.close()
+
+
+def test_attach():
+    tt = SharedTranspositionTable(1)
+    try:
+        other = SharedTranspositionTable.attach(tt.name)
+        assert len(other) == len(tt)
+
+        tt.store(12345, 2, EXACT, 7, 1)
+        assert other.probe(12345) == (2, EXACT, 7, 1)
+
+        # Uszkodzony wpis nie przechodzi sprawdzenia.
+        slot = (12345 & tt._mask) << 1
+        tt._table[2 * slot] ^= 1
+        assert other.probe(12345) is None
+
+        other.close()
+    finally:
+        tt.close()
+
+
+# Procesy robocze korzystają ze wspólnej tablicy.
+
+
+def test_parallel_shared():
+    from tests.rc import engine_state2 as state
+
+    engine = Engine()
+    engine.load_state(state)
+
+    tt = SharedTranspositionTable(4)
+    parallel = ParallelRootSearch(
+            MinimaxBot, workers=2,
+            tt_factory=partial(SharedTranspositionTable.attach, tt.name))
+    try:
+        bot = MinimaxBot(PLAYER.WHITE, engine, tt, parallel=parallel)
+        bot._iterative_search(engine, 3)
+
+        assert tt.fill_rate() > 0
+        assert len(parallel.worker_tt_stats) > 0
+        assert sum(stats['cross_hits'] for stats in
+                   parallel.worker_tt_stats.values()) > 0
+    finally:
+        parallel.close()
+        tt.close()
@@ -0,0 +1,105 @@
+# Testy tablicy transpozycji z pliku
+# bots/transposition.py
+#
+# Autor: Antoni Przybylik
+
+from bots.transposition import TranspositionTable
+from bots.transposition import EXACT
+from bots.transposition import LOWER
+from bots.transposition import ENTRY_SIZE
+
+from bots.minimax_bot import MinimaxBot
+from halma.engine import Engine
+
+from halma.defs import PLAYER
+
+from pytest import raises
+
+
+# Metody probe, store.
+
+
+def test_store_probe():
+    tt = TranspositionTable(1)
+
+    assert tt.probe(12345) is None
+    tt.store(12345, 3, EXACT, 17, 258)
+    assert tt.probe(12345) == (3, EXACT, 17, 258)
+
+    assert tt.hits == 1
+    assert tt.misses == 1
+
+
+def test_replacement():
+    tt = TranspositionTable(1)
+    buckets = len(tt) // 2
+
+    # Trzy klucze trafiające do tego samego kubełka.
+    key1 = 5
+    key2 = 5 + buckets
+    key3 = 5 + 2 * buckets
+
+    tt.store(key1, 4, EXACT, 1, None)
+    tt.store(key2, 1, LOWER, 2, None)
+    tt.store(key3, 2, LOWER, 3, None)
+
+    # Najgłębszy wpis zostaje, a płytsze
+    # wypierają się nawzajem.
+    assert tt.probe(key1) == (4, EXACT, 1, None)
+    assert tt.probe(key2) is None
+    assert tt.probe(key3) == (2, LOWER, 3, None)
+    assert tt.collisions == 1
+
+
+def test_size():
+    tt = TranspositionTable(1)
+    assert len(tt) * ENTRY_SIZE <= 2**20
+
+    with raises(ValueError):
+        TranspositionTable(0)
+
+
+# Przeszukiwanie z tablicą transpozycji
+# ma dawać tę samą ocenę co bez niej.
+
+
+def test_search_with_tt():
+    from tests.rc import engine_state2 as state
+
+    engine = Engine()
+    engine.load_state(state)
+
+    bot = MinimaxBot(PLAYER.WHITE, engine)
+    expected = bot._search(engine, 2)
+    plain_nodes = bot.nodes
+
+    tt = TranspositionTable(4)
+    bot = MinimaxBot(PLAYER.WHITE, engine, tt)
+    bot._search(engine, 1)
+    assert bot._search(engine, 2)[1] == expected[1]
+    # Ruchy posortowane według postępu dają tu
+    # już minimalne drzewo, więc płytsza iteracja
+    # nie może go zmniejszyć.
+    assert bot.nodes <= plain_nodes
+    assert tt.hits > 0
+
+
+# Wpis z równie głębokiego przeszukiwania
+# pozwala pominąć przeszukiwanie korzenia.
+
+
+def test_tt_cutoff():
+    from tests.rc import engine_state2 as state
+
+    engine = Engine()
+    engine.load_state(state)
+
+    bot = MinimaxBot(PLAYER.WHITE, engine)
+    expected = bot._search(engine, 2)
+    plain_nodes = bot.nodes
+
+    tt = TranspositionTable(4)
+    bot = MinimaxBot(PLAYER.WHITE, engine, tt)
+    bot._search(engine, 2)
+    assert bot._search(engine, 2)[1] == expected[1]
+    assert bot.nodes < plain_nodes
@@ -7,6 +7,8 @@ from halma.defs import PLAYER
 
 from halma.engine import Engine
 from halma.iface import GameInterface
+from halma.geometry import fields_to_move
+from halma.geometry import move_to_str
 from halma.game import Game
 
 from bots.generic import GameBot
@@ -14,6 +16,7 @@ from bots.random_bot import RandomBot
 from bots.forward_bot import ForwardBot
 from bots.minimax_bot import MinimaxBot
 from bots.agressive_minimax_bot import AgressiveMinimaxBot
+from bots.mcts_bot import MctsBot
 
 from ui.tui_generic import TuiEngine
 from ui.tui_player import TuiPlayer
@@ -26,21 +29,21 @@ import curses
 class HalmaTui:
     """! Reprezentuje interfejs graficzny. """
 
-    def __init__(self):
-        """! Konstruktor klasy HalmaTui. """
+    def __init__(self, book=None):
+        """! Konstruktor klasy HalmaTui.
+
+        @param book Książka otwarć dla botów (lub None).
+        """
         self._engine = Engine()
         self._game_iface = GameInterface(self._engine)
 
-        self._game = Game(self._engine, self._game_iface)
+        self._game = Game(self._engine, self._game_iface, book=book)
 
         self._tui = None
         self._moves_bar = ' '*35
 
     def _format_move(self, move):
-        return f' {chr(ord("A")+move[0][0])}' + \
-               f'{chr(ord("A")+move[0][1])}-' + \
-               f'{chr(ord("A")+move[1][0])}' + \
-               f'{chr(ord("A")+move[1][1])}'
+        return ' ' + move_to_str(fields_to_move(*move))
 
     def _mainloop(self):
         """! Główna pętla gry. """
@@ -190,13 +193,14 @@ class HalmaTui:
                                       ' 2. Forward bot.\n'
                                       ' 3. Minimax bot.\n'
                                       ' 4. Agressive Minimax bot.\n'
-                                      ' 5. Human.', 15, 54)
+                                      ' 5. MCTS bot.\n'
+                                      ' 6. Human.', 16, 54)
 
         while True:
             if (choice_str is not None):
                 choice_str = choice_str.rstrip()
                 if (len(choice_str) == 1 and
-                        ord(choice_str) in range(ord('1'), ord('6'))):
+                        ord(choice_str) in range(ord('1'), ord('7'))):
                     break
 
             choice_str = self._tui.dialog('Invalid!\n'
@@ -205,7 +209,8 @@ class HalmaTui:
                                           ' 2. Forward bot.\n'
                                           ' 3. Minimax bot.\n'
                                           ' 4. Agressive Minimax bot.\n'
-                                          ' 5. Human.', 17, 54)
+                                          ' 5. MCTS bot.\n'
+                                          ' 6. Human.', 18, 54)
 
         if (choice_str == '1'):
             self._game.set_player(PLAYER.WHITE,
@@ -223,6 +228,10 @@ class HalmaTui:
             self._game.set_player(PLAYER.WHITE,
                                   AgressiveMinimaxBot(PLAYER.WHITE,
                                                       self._engine))
+        elif (choice_str == '5'):
+            self._game.set_player(PLAYER.WHITE,
+                                  MctsBot(PLAYER.WHITE,
+                                          self._engine))
         else:
             self._game.set_player(PLAYER.WHITE,
                                   TuiPlayer(PLAYER.WHITE,
@@ -235,13 +244,14 @@ class HalmaTui:
                                       ' 2. Forward bot.\n'
                                       ' 3. Minimax bot.\n'
                                       ' 4. Agressive Minimax bot.\n'
-                                      ' 5. Human.', 15, 54)
+                                      ' 5. MCTS bot.\n'
+                                      ' 6. Human.', 16, 54)
 
         while True:
             if (choice_str is not None):
                 choice_str = choice_str.rstrip()
                 if (len(choice_str) == 1 and
-                        ord(choice_str) in range(ord('1'), ord('6'))):
+                        ord(choice_str) in range(ord('1'), ord('7'))):
                     break
 
             choice_str = self._tui.dialog('Invalid!\n'
@@ -250,7 +260,8 @@ class HalmaTui:
                                           ' 2. Forward bot.\n'
                                           ' 3. Minimax bot.\n'
                                           ' 4. Agressive Minimax bot.\n'
-                                          ' 5. Human.', 17, 54)
+                                          ' 5. MCTS bot.\n'
+                                          ' 6. Human.', 18, 54)
 
         if (choice_str == '1'):
             self._game.set_player(PLAYER.BLACK,
@@ -268,6 +279,10 @@ class HalmaTui:
             self._game.set_player(PLAYER.BLACK,
                                   AgressiveMinimaxBot(PLAYER.BLACK,
                                                       self._engine))
+        elif (choice_str == '5'):
+            self._game.set_player(PLAYER.BLACK,
+                                  MctsBot(PLAYER.BLACK,
+                                          self._engine))
         else:
             self._game.set_player(PLAYER.BLACK,
                                   TuiPlayer(PLAYER.BLACK,
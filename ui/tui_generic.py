@@ -358,6 +358,11 @@ class TuiEngine:
         # Nad szachownicą rysujemy wiersz z podpisami pól.
         self._print_label_row(left_gap_str)
 
+        # Każde pole zajmuje 4x2 znaki, więc
+        # obozy sprawdzamy raz dla każdego pola.
+        camp_fields = [[is_in_camp(i, j) is not None for j in range(16)]
+                       for i in range(16)]
+
         # Rysujemy pola rozmiaru 4x2.
         #
         # ri, rj oznaczają współrzędne
@@ -400,12 +405,12 @@ class TuiEngine:
                     attr_key += 'WHITE'
 
                 if ((i+j) % 2 == 0):
-                    if (is_in_camp(i, j) is not None):
+                    if (camp_fields[i][j]):
                         attr_key += 'CYAN'
                     else:
                         attr_key += 'WHITE'
                 else:
-                    if (is_in_camp(i, j) is not None):
+                    if (camp_fields[i][j]):
                         attr_key += 'NAVY'
                     else:
                         attr_key += 'BLACK'